@@ -0,0 +1,95 @@
+"""
+Gerador de árvores sintéticas de .robot para os benchmarks.
+
+O conteúdo imita as suítes reais (Settings, Test Cases, Keywords) com os blocos
+'# Feature' comentados no fim; uma parte dos arquivos não tem nenhum feature.
+A geração é determinística para a mesma semente.
+"""
+import os
+import random
+
+WORDS = (
+    "usuário login senha pagamento carrinho produto valida erro sucesso compra cliente "
+    "pedido checkout cartão boleto entrega frete cadastro endereço cupom desconto estoque "
+    "relatório perfil sessão token permissão busca filtro"
+).split()
+
+STEP_KEYWORDS = ("Given", "When", "Then", "And")
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _robot_body(rng, name):
+    lines = [
+        "*** Settings ***",
+        f"Documentation     Suíte {name}",
+        "Library           SeleniumLibrary",
+        "Resource          ../resources/common.robot",
+        "",
+        "*** Test Cases ***",
+    ]
+    for case in range(rng.randint(2, 6)):
+        lines.append(f"{_sentence(rng, 3).capitalize()} {case}")
+        for _ in range(rng.randint(3, 8)):
+            lines.append(f"    Log    {_sentence(rng, 5)}")
+        lines.append("")
+    lines.append("*** Keywords ***")
+    for keyword in range(rng.randint(1, 3)):
+        lines.append(f"Keyword {keyword} {_sentence(rng, 2)}")
+        lines.append(f"    [Arguments]    ${{{rng.choice(WORDS)}}}")
+        lines.append(f"    Click Element    id={rng.choice(WORDS)}")
+        lines.append("")
+    return lines
+
+
+def _feature_block(rng, scenarios, steps):
+    lines = [f"# Feature: {_sentence(rng, 3).capitalize()}", f"#   {_sentence(rng, 8)}"]
+    for _ in range(scenarios):
+        lines.append("#")
+        lines.append(f"#   Scenario: {_sentence(rng, 4).capitalize()}")
+        for step in range(steps):
+            keyword = STEP_KEYWORDS[min(step, len(STEP_KEYWORDS) - 1)]
+            lines.append(f"#       {keyword} {_sentence(rng, 6)}")
+    return lines
+
+
+def _folder_for(index, depth, fanout):
+    parts = []
+    for _ in range(depth):
+        parts.append(f"pasta_{index % fanout:02d}")
+        index //= fanout
+    return os.path.join(*parts) if parts else ""
+
+
+def generate_corpus(root, files=1000, depth=3, fanout=4, features_per_file=2,
+                    scenarios_per_feature=3, steps_per_scenario=4, empty_ratio=0.3, seed=0):
+    """
+    Cria `files` arquivos .robot em `root`, espalhados em até `depth` níveis de pastas
+    (`fanout` subpastas por nível). Uma fração `empty_ratio` dos arquivos não tem
+    blocos de Feature.
+
+    Retorna um resumo com arquivos, bytes, features e cenários gerados.
+    """
+    rng = random.Random(seed)
+    summary = {"files": 0, "bytes": 0, "features": 0, "scenarios": 0}
+    for index in range(files):
+        folder = os.path.join(root, _folder_for(index, depth, fanout))
+        os.makedirs(folder, exist_ok=True)
+        name = f"suite_{index:06d}"
+
+        lines = _robot_body(rng, name)
+        if rng.random() >= empty_ratio:
+            for _ in range(features_per_file):
+                lines.append("")
+                lines.extend(_feature_block(rng, scenarios_per_feature, steps_per_scenario))
+            summary["features"] += features_per_file
+            summary["scenarios"] += features_per_file * scenarios_per_feature
+
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        with open(os.path.join(folder, name + ".robot"), "wb") as f:
+            f.write(data)
+        summary["files"] += 1
+        summary["bytes"] += len(data)
+    return summary
@@ -0,0 +1,52 @@
+"""
+Mede o tempo de abertura da interface: processo novo até o loop de eventos ficar livre
+com a janela exibida (interpretador + imports + construção da janela).
+
+    python -m bench.startup [--runs 7] [--display]
+
+Sem --display usa a plataforma "offscreen" do Qt (não precisa de tela).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def measure(runs=7, display=False):
+    """Retorna (tempos totais em ms, tempos de main() até ficar livre em ms)."""
+    env = dict(os.environ)
+    if not display:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    totals, windows = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, MAIN, "--startup-time"], env=env, cwd=os.path.dirname(MAIN),
+            capture_output=True, text=True, check=True,
+        ).stdout
+        totals.append((time.perf_counter() - start) * 1000)
+        for line in out.splitlines():
+            if line.startswith("startup_ms="):
+                windows.append(float(line.partition("=")[2]))
+    return totals, windows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.startup", description="Tempo de abertura da interface.")
+    parser.add_argument("--runs", type=int, default=7, help="execuções (vale a mediana)")
+    parser.add_argument("--display", action="store_true", help="usa a tela de verdade em vez de offscreen")
+    args = parser.parse_args(argv)
+
+    totals, windows = measure(args.runs, args.display)
+    print(f"abertura total: mediana {statistics.median(totals):.0f} ms (mín. {min(totals):.0f} ms)")
+    if windows:
+        print(f"  main() até o loop livre: mediana {statistics.median(windows):.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Benchmarks do pipeline: varredura da árvore, parse_robot_file, aplicação de
+projeto/tags e gravação do .feature, em várias escalas de corpus sintético.
+
+    python -m bench [--scales small,medium] [--save-baseline] [--compare]
+
+Cada medida é o melhor de `repeat` execuções; o pico de memória vem de uma
+execução extra sob tracemalloc (que não entra no tempo). Os resultados podem ser
+gravados como baseline e comparados depois para detectar regressões.
+
+A baseline (bench/baseline.json) é local, fora do git: tempos só se comparam na
+mesma máquina. Grave-a com --save-baseline antes da mudança e compare depois.
+Etapas de poucos milissegundos oscilam mais que a tolerância relativa, então
+só conta como regressão uma piora de pelo menos --min-delta-ms.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench.corpus import generate_corpus
+from core.parser import parse_robot_file
+from core.render import RenderCache, apply_project_and_tags, write_features
+from core.walker import iter_robot_files
+
+SCALES = {
+    "small": 200,
+    "medium": 2_000,
+    "large": 20_000,
+}
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PROJECT_KEY = "@PROJ"
+TAGS = "@bench @regressao"
+
+
+def _measure(func, repeat):
+    """(melhor tempo em segundos, pico de memória em KB, resultado da última execução)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak // 1024, result
+
+
+def run_scale(root, files, repeat=3, **corpus_options):
+    """Gera o corpus em `root` e mede cada etapa. Retorna {etapa: medidas}."""
+    corpus = generate_corpus(root, files=files, **corpus_options)
+    results = {}
+
+    def record(name, seconds, peak_kb, amount, unit):
+        results[name] = {
+            "seconds": round(seconds, 6),
+            "throughput": round(amount / seconds, 1) if seconds else None,
+            "unit": unit,
+            "peak_kb": peak_kb,
+        }
+
+    seconds, peak, paths = _measure(lambda: list(iter_robot_files(root, recursive=True)), repeat)
+    record("scan", seconds, peak, len(paths), "arquivos/s")
+
+    def parse_all():
+        return [feature for path in paths for feature in parse_robot_file(path)[0]]
+
+    seconds, peak, features = _measure(parse_all, repeat)
+    record("parse_robot_file", seconds, peak, corpus["bytes"] / 1_048_576, "MB/s")
+
+    seconds, peak, _ = _measure(lambda: apply_project_and_tags(features, PROJECT_KEY, TAGS), repeat)
+    record("apply_project_and_tags", seconds, peak, len(features), "features/s")
+
+    # Caminho do preview: RenderCache já aquecido (projeto/tags iguais)
+    cache = RenderCache()
+    cache.render_all(features, PROJECT_KEY, TAGS)
+    seconds, peak, _ = _measure(lambda: cache.render_all(features, PROJECT_KEY, TAGS), repeat)
+    record("render_cache_hit", seconds, peak, len(features), "features/s")
+
+    output = os.path.join(root, "combined.feature")
+    seconds, peak, _ = _measure(lambda: write_features(output, features, PROJECT_KEY, TAGS), repeat)
+    record("write_features", seconds, peak, os.path.getsize(output) / 1_048_576, "MB/s")
+
+    return {"corpus": corpus, "results": results}
+
+
+def compare(current, baseline, tolerance, min_delta=0.005):
+    """
+    Lista de (escala, etapa, segundos na baseline, segundos agora) mais lentos que o
+    tolerado: acima de (1 + tolerance) × baseline e com piora de pelo menos
+    min_delta segundos (o ruído de etapas curtas passa fácil dos 25%).
+    """
+    regressions = []
+    for scale, data in current.items():
+        base_scale = baseline.get(scale)
+        if not base_scale:
+            continue
+        for name, measure in data["results"].items():
+            base = base_scale["results"].get(name)
+            if (base and measure["seconds"] > base["seconds"] * (1 + tolerance)
+                    and measure["seconds"] - base["seconds"] >= min_delta):
+                regressions.append((scale, name, base["seconds"], measure["seconds"]))
+    return regressions
+
+
+def _print_table(scale, data, baseline):
+    corpus = data["corpus"]
+    print(f"\n[{scale}] {corpus['files']} arquivos, {corpus['bytes'] / 1_048_576:.1f} MB, "
+          f"{corpus['features']} features, {corpus['scenarios']} cenários")
+    print(f"  {'etapa':<24}{'tempo (ms)':>12}{'vazão':>28}{'pico (KB)':>12}{'vs baseline':>14}")
+    for name, measure in data["results"].items():
+        delta = ""
+        base = baseline.get(scale, {}).get("results", {}).get(name)
+        if base and base["seconds"]:
+            delta = f"{(measure['seconds'] / base['seconds'] - 1) * 100:+.0f}%"
+        throughput = f"{measure['throughput']:,.1f} {measure['unit']}" if measure["throughput"] else "-"
+        print(f"  {name:<24}{measure['seconds'] * 1000:>12.1f}{throughput:>28}"
+              f"{measure['peak_kb']:>12,}{delta:>14}")
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmarks do extrator de features.")
+    parser.add_argument("--scales", default="small,medium",
+                        help=f"escalas separadas por vírgula ({', '.join(SCALES)}) ou nº de arquivos")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções por medida (vale a melhor)")
+    parser.add_argument("--depth", type=int, default=3, help="níveis de pastas do corpus")
+    parser.add_argument("--features", type=int, default=2, help="features por arquivo")
+    parser.add_argument("--scenarios", type=int, default=3, help="cenários por feature")
+    parser.add_argument("--empty-ratio", type=float, default=0.3,
+                        help="fração de arquivos sem nenhum feature")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="arquivo JSON da baseline")
+    parser.add_argument("--save-baseline", "--save", dest="save", action="store_true",
+                        help="grava os resultados como baseline desta máquina")
+    parser.add_argument("--compare", action="store_true",
+                        help="sai com código 1 se alguma etapa ficar mais lenta que a tolerância")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="piora aceita em relação à baseline (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="piora absoluta mínima para contar como regressão (padrão: 5 ms)")
+    parser.add_argument("--json", action="store_true", help="imprime os resultados em JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("scales", {})
+    except (OSError, ValueError):
+        baseline = {}
+
+    current = {}
+    for scale in filter(None, (s.strip() for s in args.scales.split(","))):
+        files = SCALES[scale] if scale in SCALES else int(scale)
+        with tempfile.TemporaryDirectory(prefix="bench_robot_") as root:
+            current[scale] = run_scale(
+                root, files, repeat=args.repeat, depth=args.depth, features_per_file=args.features,
+                scenarios_per_feature=args.scenarios, empty_ratio=args.empty_ratio,
+            )
+        if not args.json:
+            _print_table(scale, current[scale], baseline)
+
+    if args.json:
+        print(json.dumps(current, ensure_ascii=False, indent=2))
+
+    if args.save:
+        data = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "scales": {**baseline, **current},
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"\nBaseline gravada em {args.baseline}", file=sys.stderr)
+
+    if args.compare:
+        if not baseline:
+            print(f"[WARN] Sem baseline em {args.baseline}: rode antes com --save-baseline nesta máquina.",
+                  file=sys.stderr)
+        regressions = compare(current, baseline, args.tolerance, args.min_delta_ms / 1000)
+        for scale, name, before, now in regressions:
+            print(f"[REGRESSÃO] {scale}/{name}: {before * 1000:.1f} ms → {now * 1000:.1f} ms", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
@@ -0,0 +1,196 @@
+"""
+Leitura de suítes .robot direto de artefatos .zip e .tar (.gz, .bz2, .xz), sem
+extrair nada para o disco.
+
+Um arquivo dentro do artefato é identificado por "artefato.zip!/pasta/suite.robot"
+(o mesmo formato das URLs jar:...!/...): é esse caminho que aparece na lista de
+arquivos, no cache e na origem dos features.
+
+- iter_archive_robot_files: lista os .robot do artefato (sem ler o conteúdo no zip)
+- iter_archive_data: lê os .robot numa única passada, na ordem do artefato; é o
+  caminho da varredura, já que um .tar.gz não tem acesso aleatório
+- read_bytes: conteúdo de um caminho qualquer (arquivo comum ou membro), usado
+  por parse_robot_file e pelo cache
+"""
+import os
+import threading
+
+MEMBER_SEPARATOR = "!/"
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+_MAX_OPEN_ZIPS = 8
+_zips = {}  # artefato -> (mtime_ns, tamanho, ZipFile) dos zips abertos recentemente
+_zips_lock = threading.Lock()
+
+
+def is_archive(path):
+    """True se `path` é um artefato (pelo nome) que existe como arquivo."""
+    return bool(path) and path.lower().endswith(ARCHIVE_SUFFIXES) and os.path.isfile(path)
+
+
+def member_path(archive, member):
+    return f"{archive}{MEMBER_SEPARATOR}{member}"
+
+
+def split_member(path):
+    """(artefato, membro) para "artefato.zip!/membro"; (path, None) para um arquivo comum."""
+    archive, separator, member = path.partition(MEMBER_SEPARATOR)
+    if separator and member and archive.lower().endswith(ARCHIVE_SUFFIXES):
+        return archive, member
+    return path, None
+
+
+def source_folder(path):
+    """Pasta onde gravar saídas: a própria pasta, ou a pasta onde está o artefato."""
+    if is_archive(path):
+        return os.path.dirname(os.path.abspath(path))
+    return path
+
+
+def source_stat(path):
+    """os.stat do arquivo, ou do artefato que contém o membro (muda junto com ele)."""
+    return os.stat(split_member(path)[0])
+
+
+def _is_zip(archive):
+    return archive.lower().endswith(".zip")
+
+
+def _open_zip(archive):
+    import zipfile
+
+    st = os.stat(archive)
+    with _zips_lock:
+        cached = _zips.get(archive)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        handle = zipfile.ZipFile(archive)
+        if cached is not None:
+            cached[2].close()
+        elif len(_zips) >= _MAX_OPEN_ZIPS:
+            _zips.pop(next(iter(_zips)))[2].close()
+        _zips[archive] = (st.st_mtime_ns, st.st_size, handle)
+        return handle
+
+
+def read_bytes(path):
+    """
+    Conteúdo de um .robot comum ou de um membro de artefato. Num .tar comprimido,
+    ler um membro avulso descomprime o artefato até ele (a varredura usa
+    iter_archive_data, que lê tudo numa passada).
+    """
+    archive, member = split_member(path)
+    if member is None:
+        with open(path, "rb") as f:
+            return f.read()
+    if _is_zip(archive):
+        try:
+            return _open_zip(archive).read(member)
+        except KeyError:
+            raise FileNotFoundError(f"{member} não existe em {archive}") from None
+
+    import tarfile
+
+    # Em fluxo: para no membro pedido, sem carregar a lista inteira
+    with tarfile.open(archive, "r|*") as tar:
+        for info in tar:
+            if info.name == member and info.isfile():
+                return tar.extractfile(info).read()
+    raise FileNotFoundError(f"{member} não existe em {archive}")
+
+
+def _member_filter(recursive, ignore):
+    """Função nome -> aceito? (só .robot, subpastas e padrões de ignore)."""
+    from core.walker import IgnoreRules
+
+    rules = IgnoreRules().extended(ignore)
+    decided = {}  # pasta -> ignorada?
+
+    def folder_ignored(folder):
+        if folder not in decided:
+            parent = folder.rpartition("/")[0]
+            decided[folder] = (bool(parent) and folder_ignored(parent)) or rules.ignored(folder, True)
+        return decided[folder]
+
+    def accept(name):
+        if not name.lower().endswith(".robot"):
+            return None
+        folder = name.rpartition("/")[0]
+        if folder and not recursive:
+            return None
+        if (folder and folder_ignored(folder)) or rules.ignored(name, False):
+            return False
+        return True
+
+    return accept
+
+
+def _clean(name):
+    # Nome para filtrar/contar; o caminho exibido mantém o nome gravado no artefato
+    name = name.lstrip("/")
+    return name[2:] if name.startswith("./") else name
+
+
+def _count(counts, seen_folders, name, accepted):
+    folder = name.rpartition("/")[0]
+    if folder not in seen_folders:
+        seen_folders.add(folder)
+        counts["folders"] += 1
+    counts["files" if accepted else "skipped"] += 1
+
+
+def _iter_members(archive, recursive, counts, ignore, read):
+    """(nome gravado do membro, bytes ou None) dos .robot aceitos, na ordem do artefato."""
+    from core.walker import DEFAULT_IGNORES
+
+    if counts is None:
+        counts = {}
+    for key in ("folders", "files", "skipped"):
+        counts.setdefault(key, 0)
+    accept = _member_filter(recursive, DEFAULT_IGNORES if ignore is None else ignore)
+    seen_folders = set()
+
+    if _is_zip(archive):
+        handle = _open_zip(archive)
+        for info in handle.infolist():
+            if info.is_dir():
+                continue
+            name = _clean(info.filename)
+            accepted = accept(name)
+            if accepted is None:
+                continue
+            _count(counts, seen_folders, name, accepted)
+            if accepted:
+                yield info.filename, handle.read(info) if read else None
+        return
+
+    import tarfile
+
+    # "r|*": leitura em fluxo, sem voltar no arquivo (nem guardar a lista de membros)
+    with tarfile.open(archive, "r|*") as tar:
+        for info in tar:
+            if not info.isfile():
+                continue
+            name = _clean(info.name)
+            accepted = accept(name)
+            if accepted is None:
+                continue
+            _count(counts, seen_folders, name, accepted)
+            if accepted:
+                yield info.name, tar.extractfile(info).read() if read else None
+
+
+def iter_archive_robot_files(archive, recursive=True, counts=None, ignore=None):
+    """
+    Caminhos "artefato!/membro" dos .robot do artefato, na ordem em que estão nele.
+    `counts` e `ignore` funcionam como em core.walker.iter_robot_files (os
+    .gitignore de dentro do artefato não são lidos).
+    """
+    for name, _ in _iter_members(archive, recursive, counts, ignore, read=False):
+        yield member_path(archive, name)
+
+
+def iter_archive_data(archive, recursive=True, counts=None, ignore=None):
+    """(caminho "artefato!/membro", bytes) de cada .robot, lidos numa única passada."""
+    for name, data in _iter_members(archive, recursive, counts, ignore, read=True):
+        yield member_path(archive, name), data
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+from core.archives import read_bytes, source_stat
+from core.model import Feature
+from core.parser import iter_parse_many, parse_robot_file
+
+# Incrementar quando o formato serializado dos features mudar (invalida o cache em disco)
+CACHE_FORMAT = 2
+
+
+class ParseCache:
+    """
+    Cache dos resultados de parse_robot_file.
+
+    Fica em memória durante a sessão (LRU limitado a max_entries) e, se db_path for
+    informado, é persistido num SQLite para sobreviver entre execuções.
+    A chave é o caminho; a entrada só vale se o "fingerprint" (mtime + tamanho) bater.
+    Para membros de artefato (.zip/.tar), o fingerprint é o do próprio artefato.
+    Com hash_content=True, um arquivo com mtime diferente mas mesmo conteúdo
+    (ex.: checkout, touch) também é aproveitado.
+    """
+
+    def __init__(self, db_path=None, max_entries=100_000, hash_content=False):
+        self.max_entries = max_entries
+        self.hash_content = hash_content
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()  # caminho -> (mtime_ns, tamanho, digest, features, stats)
+        self._pending = {}            # entradas ainda não gravadas em disco
+        self._touched = set()         # caminhos usados desde o último flush (para o LRU em disco)
+        self._lock = threading.Lock()
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            if self._db.execute("PRAGMA user_version").fetchone()[0] != CACHE_FORMAT:
+                self._db.execute("DROP TABLE IF EXISTS entries")
+                self._db.execute(f"PRAGMA user_version = {CACHE_FORMAT}")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT,"
+                " data TEXT, last_used REAL)"
+            )
+
+    @staticmethod
+    def _digest(path):
+        return hashlib.blake2b(read_bytes(path), digest_size=16).hexdigest()
+
+    def _load(self, path):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT mtime_ns, size, digest, data FROM entries WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        mtime_ns, size, digest, data = row
+        features, stats = json.loads(data)
+        features = [Feature.from_data(feature, path) for feature in features]
+        return mtime_ns, size, digest, features, stats
+
+    def _remember(self, path, entry):
+        self._memory[path] = entry
+        self._memory.move_to_end(path)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, path):
+        """
+        Retorna (features, stats) se houver entrada válida para o arquivo, senão None.
+        """
+        try:
+            st = source_stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(path) or self._load(path)
+            if entry is not None:
+                mtime_ns, size, digest, features, stats = entry
+                valid = (mtime_ns, size) == (st.st_mtime_ns, st.st_size)
+
+                if not valid and self.hash_content and digest and size == st.st_size:
+                    valid = digest == self._digest(path)
+                    if valid:
+                        entry = (st.st_mtime_ns, size, digest, features, stats)
+                        self._pending[path] = entry
+
+                if valid:
+                    self._remember(path, entry)
+                    self._touched.add(path)
+                    self.hits += 1
+                    return features, stats
+
+            self.misses += 1
+            return None
+
+    def store(self, path, features, stats):
+        try:
+            st = source_stat(path)
+        except OSError:
+            return
+        digest = self._digest(path) if self.hash_content else None
+        entry = (st.st_mtime_ns, st.st_size, digest, features, stats)
+        with self._lock:
+            self._remember(path, entry)
+            self._pending[path] = entry
+            self._touched.add(path)
+
+    def discard(self, path):
+        with self._lock:
+            self._memory.pop(path, None)
+            self._pending.pop(path, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries WHERE path = ?", (path,))
+
+    def parse(self, path):
+        """
+        Equivalente a parse_robot_file, passando pelo cache.
+        """
+        cached = self.lookup(path)
+        if cached is not None:
+            return cached
+        features, stats = parse_robot_file(path)
+        self.store(path, features, stats)
+        return features, stats
+
+    def flush(self):
+        """
+        Grava em disco as entradas novas e aplica o limite de tamanho (LRU por last_used).
+        """
+        if self._db is None:
+            return
+        with self._lock:
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (path, mtime_ns, size, digest, data, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (path, mtime_ns, size, digest,
+                     json.dumps([[f.to_data() for f in features], stats]), now)
+                    for path, (mtime_ns, size, digest, features, stats) in self._pending.items()
+                ],
+            )
+            self._db.executemany(
+                "UPDATE entries SET last_used = ? WHERE path = ?",
+                [(now, path) for path in self._touched if path not in self._pending],
+            )
+            self._db.execute(
+                "DELETE FROM entries WHERE path NOT IN"
+                " (SELECT path FROM entries ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+            self._pending.clear()
+            self._touched.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_END = object()
+
+
+def iter_parse_cached(paths, cache, ordered=False, **kwargs):
+    """
+    Igual a core.parser.iter_parse_many, mas só manda para o pool os arquivos que
+    não estão no cache.
+
+    Um acerto sai assim que o fingerprint confere, sem esperar o walker nem o pool:
+    as faltas são parseadas por iter_parse_many numa thread à parte e os resultados
+    entram na saída à medida que ficam prontos. Com ordered=True a saída segue a
+    ordem de entrada (um acerto só espera as faltas que vieram antes dele); senão
+    sai na ordem em que fica pronta.
+    """
+    requests = queue.Queue()   # faltas para o pool; None encerra
+    done = queue.Queue()       # resultados do pool (ou a exceção); _END no fim
+    stop = threading.Event()
+    worker = None
+    pending = 0                # faltas enviadas ainda sem resultado
+    order = deque()            # ordered: [resultado ou None] na ordem de entrada
+    waiting = deque()          # ordered: posições das faltas, na ordem de envio
+
+    def misses():
+        while not stop.is_set():
+            path = requests.get()
+            if path is None:
+                return
+            yield path
+
+    def parse_misses():
+        results = iter_parse_many(misses(), **kwargs)
+        try:
+            for result in results:
+                done.put(result)
+                if stop.is_set():
+                    break
+        except BaseException as e:
+            done.put(e)
+        finally:
+            results.close()  # encerra o pool sem esperar lotes pendentes
+            done.put(_END)
+
+    def collect(block):
+        nonlocal pending
+        while pending:
+            try:
+                result = done.get(block=block)
+            except queue.Empty:
+                return
+            if isinstance(result, BaseException):
+                raise result
+            if result is _END:
+                raise RuntimeError("o pool de parsing terminou antes de todos os arquivos")
+            pending -= 1
+            path, features, stats, error = result
+            if error is None:
+                cache.store(path, features, stats)
+            if ordered:
+                waiting.popleft()[0] = result
+                while order and order[0][0] is not None:
+                    yield order.popleft()[0]
+            else:
+                yield result
+            block = False  # depois do primeiro, só o que já estiver pronto
+
+    try:
+        for path in paths:
+            cached = cache.lookup(path)
+            if cached is None:
+                if worker is None:
+                    worker = threading.Thread(target=parse_misses, name="parse-cache-misses", daemon=True)
+                    worker.start()
+                requests.put(path)
+                pending += 1
+                if ordered:
+                    slot = [None]
+                    order.append(slot)
+                    waiting.append(slot)
+            elif ordered and order:
+                order.append([(path, *cached, None)])
+            else:
+                yield path, *cached, None
+            yield from collect(block=False)
+
+        requests.put(None)
+        while pending:
+            yield from collect(block=True)
+    finally:
+        # Gerador fechado antes do fim (ex.: varredura cancelada): solta a thread do pool
+        stop.set()
+        requests.put(None)
@@ -0,0 +1,237 @@
+"""
+Linha de comando sem Qt: varre uma pasta, extrai os Features e grava o combined.feature.
+
+    python -m core PASTA [-r] [-p @PROJ] [-t "@tag1 @tag2"] [-o saida.feature]
+    python -m core PASTA --split arquivo|tamanho [-o pasta_de_saida]
+    python -m core artefato.zip|artefato.tar.gz -r ...   (lê os .robot sem extrair)
+    python -m core PASTA -r --since origin/main   (só os features alterados, via git local)
+
+Imprime uma linha JSON com o resumo no stdout e sai com um código útil em pipelines.
+Mantenha os imports deste módulo leves: ele não pode depender de PySide6.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from core.archives import is_archive, source_folder
+from core.duplicates import DEFAULT_THRESHOLD, collapse, find_duplicates
+from core.parser import iter_parse_archive, iter_parse_many
+from core.render import write_features
+from core.shards import DEFAULT_SHARD_BYTES, iter_per_file, iter_sized, write_shards
+from core.timing import TRACER, span
+from core.walker import DEFAULT_IGNORES, iter_robot_files
+
+EXIT_OK = 0
+EXIT_NO_FEATURES = 1    # nada para gravar (no modo delta, "nada mudou" é EXIT_OK)
+EXIT_USAGE = 2          # argumentos/pasta inválidos (mesmo código do argparse)
+EXIT_PARSE_ERRORS = 3   # arquivo gravado, mas algum .robot falhou
+EXIT_WRITE_ERROR = 4
+
+SPLIT_FOLDER = "features"  # pasta de saída padrão com --split
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description="Extrai os blocos '# Feature' de arquivos .robot para um .feature.",
+    )
+    parser.add_argument("folder", help="pasta com os arquivos .robot, ou artefato .zip/.tar(.gz)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="incluir subpastas")
+    parser.add_argument("-p", "--project", default="", help="chave do projeto (ex.: @PROJ)")
+    parser.add_argument("-t", "--tags", default="", help='tags dos cenários (ex.: "@tag1 @tag2")')
+    parser.add_argument("-o", "--output",
+                        help="arquivo de saída (padrão: PASTA/combined.feature); com --split, a pasta "
+                             "de saída (padrão: PASTA/features)")
+    parser.add_argument("--split", choices=("arquivo", "tamanho"),
+                        help="vários .feature: um por .robot ou partes de tamanho limitado; "
+                             "só as partes que mudaram são regravadas")
+    parser.add_argument("--shard-kb", type=int, default=DEFAULT_SHARD_BYTES // 1024, metavar="KB",
+                        help="tamanho máximo de cada parte com --split tamanho (padrão: %(default)s)")
+    parser.add_argument("--since", metavar="REF",
+                        help="modo delta: só os .robot alterados desde o merge-base com REF (git local) "
+                             "e, deles, só os features novos/alterados; saída padrão: PASTA/combined_delta.feature")
+    parser.add_argument("--no-merge-base", action="store_true",
+                        help="com --since, compara direto com REF em vez do merge-base")
+    parser.add_argument("--collapse-duplicates", action="store_true",
+                        help="grava só a primeira cópia de features/cenários duplicados")
+    parser.add_argument("--near-duplicates", type=float, nargs="?", const=DEFAULT_THRESHOLD, metavar="LIMIAR",
+                        help="com --collapse-duplicates, junta também cenários quase iguais "
+                             "(semelhança mínima, padrão: %(const)s)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="processos de parsing (padrão: nº de núcleos)")
+    parser.add_argument("--ignore", action="append", default=[], metavar="PADRÃO",
+                        help="padrão estilo .gitignore a ignorar (pode repetir)")
+    parser.add_argument("--no-gitignore", action="store_true",
+                        help="não ler os arquivos .gitignore das pastas")
+    parser.add_argument("--walk-workers", type=int, default=1, metavar="N",
+                        help="threads para listar pastas em paralelo (sistemas de arquivos de rede)")
+    parser.add_argument("--cache", metavar="ARQUIVO",
+                        help="cache de parsing em disco (SQLite) reaproveitado entre execuções")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help="mede as fases e grava um trace (formato do chrome://tracing)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="não listar erros no stderr")
+    return parser
+
+
+def _delta_message(args, summary, message):
+    summary["delta"]["message"] = message
+    if not args.quiet:
+        print(f"[INFO] {message}", file=sys.stderr)
+
+
+def run(args):
+    summary = {"folder": args.folder, "output": None, "folders": 0, "files": 0,
+               "robot_files": 0, "features": 0, "scenarios": 0, "errors": 0}
+
+    archive = is_archive(args.folder)
+    if not archive and not os.path.isdir(args.folder):
+        summary["error"] = f"pasta não encontrada: {args.folder}"
+        return EXIT_USAGE, summary
+
+    counts = {"folders": 0, "files": 0, "skipped": 0}
+    # Saídas padrão ficam na pasta (ou ao lado do artefato)
+    output_folder = source_folder(args.folder)
+    paths = iter_robot_files(
+        args.folder, args.recursive, counts,
+        ignore=DEFAULT_IGNORES + tuple(args.ignore),
+        use_gitignore=not args.no_gitignore,
+        workers=args.walk_workers,
+    )
+    paths = TRACER.timed_iter(paths, "listagem")
+
+    cache = None
+    delta = None
+    if args.since:
+        from core.git_delta import GitError, changed_robot_files
+        if archive:
+            summary["error"] = "--since não se aplica a artefatos"
+            return EXIT_USAGE, summary
+        try:
+            delta = changed_robot_files(args.folder, args.since, args.recursive, not args.no_merge_base)
+        except GitError as e:
+            summary["error"] = f"git: {e}"
+            return EXIT_USAGE, summary
+        summary["delta"] = {"base": delta.base, "changed_files": len(delta.changed),
+                            "deleted_files": len(delta.deleted)}
+        if not delta.changed and not delta.deleted:
+            # Nada mudou desde a base: resultado normal (ex.: CI sem alterações), não falha
+            _delta_message(args, summary, f"nenhum .robot alterado desde {args.since}")
+            return EXIT_OK, summary
+        counts["files"] = len(delta.changed)
+        results = iter_parse_many(delta.changed, workers=args.workers)
+    elif archive:
+        # Uma passada pelo artefato, sem extrair (acesso aleatório num .tar.gz custaria caro)
+        results = iter_parse_archive(args.folder, args.recursive, counts, DEFAULT_IGNORES + tuple(args.ignore))
+    elif args.cache:
+        from core.cache import ParseCache, iter_parse_cached
+        cache = ParseCache(args.cache)
+        # Na ordem da listagem: o combined.feature não pode depender do que estava no cache
+        results = iter_parse_cached(paths, cache, ordered=True, workers=args.workers)
+    else:
+        results = iter_parse_many(paths, workers=args.workers)
+    # "parsing" inclui a listagem: o parser puxa os caminhos do walker sob demanda
+    results = TRACER.timed_iter(results, "parsing")
+
+    def iter_all_features():
+        # Consome os resultados do parser à medida que chegam; nada é acumulado
+        for path, features, stats, error in results:
+            summary["robot_files"] += 1
+            if error:
+                summary["errors"] += 1
+                if not args.quiet:
+                    print(f"[ERRO] Falha ao parsear {path}: {error}", file=sys.stderr)
+                continue
+            summary["features"] += stats["features"]
+            summary["scenarios"] += stats["scenarios"]
+            yield from features
+
+    features = iter_all_features()
+    if delta is not None:
+        from core.git_delta import affected_features, base_contents
+        parsed = list(results)
+        # Arquivos apagados entram como "sem features": todos os da base contam como removidos
+        gone = [(os.path.join(delta.root, *path.split("/")), [], None, None) for path in delta.deleted]
+        try:
+            old_contents = base_contents(delta, [path for path, _, _, error in parsed + gone if not error])
+        except GitError as e:
+            summary["error"] = f"git: {e}"
+            return EXIT_USAGE, summary
+        changed, removed = affected_features(parsed + gone, old_contents)
+        summary["delta"].update(features_changed=len(changed), features_removed=removed)
+        # Contagens do resumo continuam cobrindo os arquivos alterados inteiros
+        results = iter(parsed)
+        keep = {id(f) for f in changed}
+        features = (f for f in iter_all_features() if id(f) in keep)
+    if args.collapse_duplicates:
+        # Agrupar exige todos os features em memória (sem colapso, a gravação é em streaming)
+        features = list(features)
+        near = args.near_duplicates is not None
+        clusters = find_duplicates(features, near=near, threshold=args.near_duplicates or DEFAULT_THRESHOLD)
+        collapsed = collapse(features, clusters)
+        summary["duplicates"] = {
+            "clusters": len(clusters),
+            "features_removed": len(features) - len(collapsed),
+            "scenarios_removed": sum(f.scenario_count for f in features) - sum(f.scenario_count for f in collapsed),
+        }
+        features = collapsed
+
+    if args.split:
+        output_path = args.output or os.path.join(output_folder, SPLIT_FOLDER)
+        if args.split == "arquivo":
+            shards = iter_per_file(features, args.folder, args.project, args.tags)
+        else:
+            shards = iter_sized(features, args.project, args.tags, max_bytes=args.shard_kb * 1024)
+    else:
+        default_name = "combined_delta.feature" if delta is not None else "combined.feature"
+        output_path = args.output or os.path.join(output_folder, default_name)
+    try:
+        with span("gravação"):
+            if args.split:
+                result = write_shards(output_path, shards)
+                summary["shards"] = {"written": len(result.written), "unchanged": len(result.unchanged),
+                                     "removed": len(result.removed)}
+                written = result.total
+            else:
+                written = write_features(output_path, features, args.project, args.tags)
+    except OSError as e:
+        summary["error"] = f"falha ao salvar arquivo: {e}"
+        return EXIT_WRITE_ERROR, summary
+    finally:
+        summary["folders"] = counts["folders"]
+        summary["files"] = counts["files"]
+        summary["skipped"] = counts["skipped"]
+        if cache is not None:
+            cache.close()
+            summary["cache_hits"] = cache.hits
+            summary["cache_misses"] = cache.misses
+
+    if not written:
+        if delta is not None and not summary["errors"]:
+            _delta_message(args, summary, "nenhum feature novo ou alterado nos .robot modificados")
+            return EXIT_OK, summary
+        return EXIT_NO_FEATURES, summary
+    summary["output"] = output_path
+
+    return (EXIT_PARSE_ERRORS if summary["errors"] else EXIT_OK), summary
+
+
+def main(argv=None):
+    started = time.perf_counter()
+    args = build_arg_parser().parse_args(argv)
+    TRACER.enable(bool(args.trace))
+    code, summary = run(args)
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    if args.trace:
+        summary["timings_ms"] = {
+            name: round(seconds * 1000, 1) for name, (_, seconds) in TRACER.summary().items()
+        }
+        try:
+            TRACER.export_chrome(args.trace)
+            summary["trace"] = args.trace
+        except OSError as e:
+            summary["trace_error"] = str(e)
+    summary["exit_code"] = code
+    print(json.dumps(summary, ensure_ascii=False))
+    return code
@@ -0,0 +1,234 @@
+"""
+Detecção de features e cenários duplicados (copiados entre arquivos .robot).
+
+- exatos: mesmo hash normalizado de core.hashing (espaços e linhas em branco não contam)
+- quase iguais (opcional): MinHash sobre trigramas de palavras dos passos, com LSH
+  por bandas para achar candidatos sem comparar todos os pares
+
+O MinHash usa uma única função de hash por trigrama (one permutation hashing): o
+hash escolhe o compartimento e o valor compete pelo mínimo dele; compartimentos
+vazios copiam o vizinho. Custa O(trigramas) por cenário em vez de O(trigramas ×
+permutações), o que mantém 100 mil cenários na casa dos segundos em Python puro.
+"""
+import re
+from operator import eq
+
+from core.hashing import feature_hash, scenario_hash
+from core.model import Feature
+
+SIGNATURE_SIZE = 64
+BANDS = 16                      # 16 bandas de 4 linhas: candidato a partir de ~50% de semelhança
+ROWS = SIGNATURE_SIZE // BANDS
+DEFAULT_THRESHOLD = 0.8
+SHINGLE = 3                     # palavras por trigrama
+SMALL_BUCKET = 32
+_MASK = (1 << 64) - 1
+_WORD = re.compile(r"\w+")
+
+
+class Member:
+    """Um feature (scenario None) ou um cenário que faz parte de um grupo de duplicados."""
+    __slots__ = ("feature", "scenario")
+
+    def __init__(self, feature, scenario=None):
+        self.feature = feature
+        self.scenario = scenario
+
+    @property
+    def source(self):
+        return self.feature.source
+
+    @property
+    def line(self):
+        return self.scenario.line if self.scenario is not None else self.feature.line
+
+    @property
+    def title(self):
+        return (self.scenario or self.feature).title.strip()
+
+    def __repr__(self):
+        return f"Member({self.title!r}, {self.source}:{self.line})"
+
+
+class DuplicateCluster:
+    """Grupo de duplicados; o primeiro membro (ordem da varredura) é o que fica ao colapsar."""
+    __slots__ = ("kind", "members", "similarity")
+
+    def __init__(self, kind, members, similarity=1.0):
+        self.kind = kind              # "feature", "scenario" ou "near"
+        self.members = members
+        self.similarity = similarity  # menor semelhança estimada entre os membros (1.0 = exato)
+
+    @property
+    def exact(self):
+        return self.kind != "near"
+
+    @property
+    def sources(self):
+        return sorted({m.source for m in self.members if m.source})
+
+    def __len__(self):
+        return len(self.members)
+
+    def __repr__(self):
+        return f"DuplicateCluster({self.kind}, {len(self.members)} membros, {self.similarity:.2f})"
+
+
+def _group_exact(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_exact(features):
+    """
+    Grupos de features idênticos e de cenários idênticos. Cenários dentro de um
+    feature que já é duplicado inteiro não são listados de novo.
+    """
+    clusters = []
+    duplicated = set()
+    for group in _group_exact(features, feature_hash):
+        clusters.append(DuplicateCluster("feature", [Member(f) for f in group]))
+        duplicated.update(id(f) for f in group[1:])
+
+    members = (Member(f, s) for f in features if id(f) not in duplicated for s in f.scenarios)
+    for group in _group_exact(members, lambda m: scenario_hash(m.scenario)):
+        clusters.append(DuplicateCluster("scenario", group))
+    return clusters
+
+
+def _shingles(scenario):
+    # Só minúsculas: acentos diferentes já tornam os passos diferentes o bastante
+    words = _WORD.findall("\n".join(scenario.steps).lower())
+    if len(words) < SHINGLE:
+        return {hash(tuple(words))} if words else set()
+    return {hash(tuple(words[i:i + SHINGLE])) for i in range(len(words) - SHINGLE + 1)}
+
+
+def signature(shingles):
+    """Assinatura MinHash (tupla de SIGNATURE_SIZE inteiros) de um conjunto de hashes."""
+    bins = [None] * SIGNATURE_SIZE
+    for value in shingles:
+        # Mistura o hash do Python (que é quase a identidade para inteiros pequenos)
+        value = (value * 0x9E3779B97F4A7C15) & _MASK
+        slot = value % SIGNATURE_SIZE
+        current = bins[slot]
+        if current is None or value < current:
+            bins[slot] = value
+    if None in bins:
+        # Densificação: compartimento vazio herda o próximo preenchido (circular)
+        following = next((value for value in bins if value is not None), None)
+        if following is None:
+            return None
+        for i in range(SIGNATURE_SIZE - 1, -1, -1):
+            if bins[i] is None:
+                bins[i] = following
+            else:
+                following = bins[i]
+    return tuple(bins)
+
+
+def similarity(a, b):
+    """Jaccard estimado pela fração de posições iguais das assinaturas."""
+    return sum(map(eq, a, b)) / SIGNATURE_SIZE
+
+
+def find_near(features, threshold=DEFAULT_THRESHOLD, exclude=()):
+    """
+    Grupos de cenários com passos parecidos (Jaccard estimado >= threshold).
+
+    `exclude` são ids de cenários a ignorar (ex.: cópias exatas já reportadas). Os
+    pares candidatos saem dos baldes do LSH e são confirmados pela assinatura; os
+    grupos são as componentes conexas desses pares.
+    """
+    members, signatures = [], []
+    for feature in features:
+        for scenario in feature.scenarios:
+            if id(scenario) in exclude:
+                continue
+            sig = signature(_shingles(scenario))
+            if sig is not None:
+                members.append(Member(feature, scenario))
+                signatures.append(sig)
+
+    parent = list(range(len(members)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    scores = {}
+    checked = set()  # o mesmo par costuma cair junto em várias bandas
+    for band in range(BANDS):
+        # Linhas salteadas (band, band+16, ...): em cenários curtos os compartimentos
+        # vizinhos são cópias da densificação, e uma banda contígua teria um só valor
+        buckets = {}
+        for i, sig in enumerate(signatures):
+            buckets.setdefault(sig[band::BANDS], []).append(i)
+        for bucket in buckets.values():
+            if len(bucket) < 2:
+                continue
+            # Baldes pequenos: todos os pares; grandes (muitas cópias): contra o primeiro
+            pairs = (
+                ((bucket[i], other) for i in range(len(bucket)) for other in bucket[i + 1:])
+                if len(bucket) <= SMALL_BUCKET else ((bucket[0], other) for other in bucket[1:])
+            )
+            for first, other in pairs:
+                a, b = find(first), find(other)
+                if a == b or (first, other) in checked:
+                    continue
+                checked.add((first, other))
+                score = similarity(signatures[first], signatures[other])
+                if score >= threshold:
+                    root = min(a, b)
+                    parent[max(a, b)] = root
+                    scores[root] = min(scores.get(a, 1.0), scores.get(b, 1.0), score)
+
+    groups = {}
+    for i in range(len(members)):
+        groups.setdefault(find(i), []).append(i)
+    return [
+        DuplicateCluster("near", [members[i] for i in group], scores.get(root, 1.0))
+        for root, group in groups.items() if len(group) > 1
+    ]
+
+
+def find_duplicates(features, near=False, threshold=DEFAULT_THRESHOLD):
+    """Exatos e, com near=True, também os quase iguais (sem repetir os exatos)."""
+    clusters = find_exact(features)
+    if near:
+        exclude = {id(m.scenario) for c in clusters if c.kind == "scenario" for m in c.members[1:]}
+        exclude.update(id(s) for c in clusters if c.kind == "feature" for m in c.members[1:]
+                       for s in m.feature.scenarios)
+        clusters.extend(find_near(features, threshold, exclude))
+    return clusters
+
+
+def collapse(features, clusters):
+    """
+    Versão de `features` (mesma ordem) sem as cópias: de cada grupo fica só o
+    primeiro membro. Features que ficam sem nenhum cenário somem; os objetos
+    originais não são alterados.
+    """
+    drop_features, drop_scenarios = set(), set()
+    for cluster in clusters:
+        for member in cluster.members[1:]:
+            if member.scenario is None:
+                drop_features.add(id(member.feature))
+            else:
+                drop_scenarios.add(id(member.scenario))
+
+    result = []
+    for feature in features:
+        if id(feature) in drop_features:
+            continue
+        if not any(id(s) in drop_scenarios for s in feature.scenarios):
+            result.append(feature)
+            continue
+        scenarios = [s for s in feature.scenarios if id(s) not in drop_scenarios]
+        if scenarios:
+            result.append(Feature(feature.title, feature.line, feature.description, scenarios, feature.source))
+    return result
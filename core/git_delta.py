@@ -0,0 +1,159 @@
+"""
+Modo delta: só os features afetados pela mudança atual, segundo o git local.
+
+1. changed_robot_files pergunta ao git quais .robot mudaram desde `ref` (por
+   padrão desde o merge-base com ele, como num merge request), incluindo
+   alterações ainda não commitadas e arquivos novos não rastreados
+2. só esses arquivos são parseados
+3. affected_features compara com a versão do arquivo na base (git cat-file, tudo
+   num único processo) e mantém só os features novos ou alterados
+
+Nada aqui acessa a rede: diff, merge-base e cat-file leem só o repositório local.
+"""
+import os
+import subprocess
+
+from core.hashing import feature_hash
+from core.parser import iter_features_from_bytes
+
+
+class GitError(Exception):
+    pass
+
+
+class Delta:
+    __slots__ = ("root", "base", "changed", "deleted")
+
+    def __init__(self, root, base, changed, deleted):
+        self.root = root          # raiz do repositório
+        self.base = base          # commit usado como base (sha)
+        self.changed = changed    # caminhos absolutos dos .robot novos/alterados
+        self.deleted = deleted    # caminhos (relativos à raiz) dos .robot removidos
+
+    def relative(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def __repr__(self):
+        return f"Delta(base={self.base[:10]}, changed={len(self.changed)}, deleted={len(self.deleted)})"
+
+
+def _git(cwd, *args, data=None):
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0", GIT_OPTIONAL_LOCKS="0")
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, input=data, capture_output=True, env=env, check=False,
+        )
+    except FileNotFoundError:
+        raise GitError("git não encontrado no PATH") from None
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip() or f"git {args[0]} falhou"
+        raise GitError(message)
+    return result.stdout
+
+
+def repo_root(folder):
+    return _git(folder, "rev-parse", "--show-toplevel").decode("utf-8").strip()
+
+
+def resolve_base(folder, ref, merge_base=True):
+    """sha da base: merge-base(ref, HEAD) ou o próprio ref."""
+    if merge_base:
+        return _git(folder, "merge-base", ref, "HEAD").decode("utf-8").strip()
+    return _git(folder, "rev-parse", "--verify", f"{ref}^{{commit}}").decode("utf-8").strip()
+
+
+def _split_z(output):
+    return [item for item in output.decode("utf-8", "surrogateescape").split("\0") if item]
+
+
+def changed_robot_files(folder, ref, recursive=True, merge_base=True, untracked=True):
+    """
+    .robot de `folder` que mudaram entre a base e a árvore de trabalho atual.
+    Renomeações contam como remoção + arquivo novo. Retorna um Delta.
+    """
+    folder = os.path.abspath(folder)
+    root = repo_root(folder)
+    base = resolve_base(folder, ref, merge_base)
+
+    # Caminhos relativos à raiz; pathspec "." = só dentro de `folder`
+    entries = _split_z(_git(folder, "diff", "--name-status", "-z", "--no-renames", base, "--", "."))
+    status_paths = list(zip(entries[0::2], entries[1::2]))
+    if untracked:
+        others = _git(folder, "ls-files", "--others", "--exclude-standard", "--full-name", "-z", "--", ".")
+        status_paths += [("A", path) for path in _split_z(others)]
+
+    # A raiz vem do git já resolvida; `folder` pode ter links ou outra grafia (Windows)
+    own_folder = os.path.normcase(os.path.realpath(folder))
+    changed, deleted = [], []
+    for status, path in status_paths:
+        if not path.lower().endswith(".robot"):
+            continue
+        absolute = os.path.join(root, *path.split("/"))
+        if not recursive and os.path.normcase(os.path.realpath(os.path.dirname(absolute))) != own_folder:
+            continue
+        if status.startswith("D"):
+            deleted.append(path)
+        else:
+            changed.append(absolute)
+    return Delta(root, base, sorted(set(changed)), sorted(set(deleted)))
+
+
+def base_contents(delta, paths):
+    """
+    {caminho: bytes na base, ou None se não existia} para os caminhos absolutos
+    dados, lidos com um único `git cat-file --batch`.
+    """
+    if not paths:
+        return {}
+    relative = [delta.relative(path) for path in paths]
+    request = "".join(f"{delta.base}:{path}\n" for path in relative).encode("utf-8", "surrogateescape")
+    output = _git(delta.root, "cat-file", "--batch", data=request)
+
+    contents = {}
+    pos = 0
+    for path in paths:
+        end = output.index(b"\n", pos)
+        header = output[pos:end].split()
+        pos = end + 1
+        if len(header) == 3 and header[1] == b"blob":
+            size = int(header[2])
+            contents[path] = output[pos:pos + size]
+            pos += size + 1  # conteúdo + "\n"
+        else:
+            contents[path] = None  # "<objeto> missing": arquivo novo
+    return contents
+
+
+def affected_features(results, old_contents):
+    """
+    results: (caminho, features, stats, erro) dos arquivos alterados (ordem mantida).
+    Retorna (features novos/alterados, nº de features removidos). Removidos são os
+    blocos da base sem correspondente, descontados os que foram só alterados.
+
+    Um feature conta como alterado se o hash normalizado (core.hashing.feature_hash)
+    não aparece na versão base do mesmo arquivo: mexer só em espaços ou mover o
+    bloco não conta.
+    """
+    affected, removed = [], 0
+    for path, features, _, error in results:
+        if error:
+            continue
+        old = old_contents.get(path)
+        old_hashes = {}
+        if old is not None:
+            try:
+                for feature in iter_features_from_bytes(old, path):
+                    digest = feature_hash(feature)
+                    old_hashes[digest] = old_hashes.get(digest, 0) + 1
+            except UnicodeDecodeError:
+                old_hashes = {}
+        new = 0
+        for feature in features:
+            digest = feature_hash(feature)
+            if old_hashes.get(digest):
+                old_hashes[digest] -= 1
+            else:
+                affected.append(feature)
+                new += 1
+        removed += max(0, sum(old_hashes.values()) - new)
+    return affected, removed
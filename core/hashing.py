@@ -0,0 +1,40 @@
+"""
+Hashes normalizados de features e cenários.
+
+Usados pelo histórico de imports (core.ledger), pela detecção de duplicados e pelo
+modo delta; ficam aqui para que esses dois últimos não carreguem o SQLite.
+Mudar a normalização exige incrementar LEDGER_FORMAT em core.ledger.
+"""
+import hashlib
+
+
+def _normalize(line):
+    # Espaços repetidos/nas pontas não mudam o teste no Xray
+    return " ".join(line.split())
+
+
+def _digest(parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        part = _normalize(part)
+        if part:
+            h.update(part.encode("utf-8"))
+            h.update(b"\n")
+    return h.hexdigest()
+
+
+def scenario_hash(scenario, tags=""):
+    """Hash normalizado de um cenário (título, passos e tags), calculado sobre o modelo."""
+    return _digest([tags, scenario.title, *scenario.steps])
+
+
+def feature_hash(feature, project_key="", tags=""):
+    """
+    Hash normalizado de um feature do jeito que ele seria importado: projeto, título,
+    descrição e cenários. Linhas em branco e espaços extras são ignorados, assim como
+    os números de linha, então reformatar o .robot não força um novo import.
+    """
+    parts = [project_key, feature.title, *feature.description]
+    for scenario in feature.scenarios:
+        parts.extend((tags, scenario.title, *scenario.steps))
+    return _digest(parts)
@@ -0,0 +1,98 @@
+import sqlite3
+import threading
+import time
+
+from core.hashing import feature_hash, scenario_hash
+
+# Incrementar quando a normalização de core.hashing mudar (invalida o histórico em disco)
+LEDGER_FORMAT = 1
+
+
+class ImportLedger:
+    """
+    Histórico dos imports no Xray: hash de cada feature/cenário -> chaves das issues.
+
+    Fica num SQLite (ou só em memória, sem db_path). As entradas são separadas por
+    destino (a URL do Jira), para que importar em outra instância não pule nada.
+    """
+
+    def __init__(self, db_path=None):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != LEDGER_FORMAT:
+            self._db.execute("DROP TABLE IF EXISTS imports")
+            self._db.execute(f"PRAGMA user_version = {LEDGER_FORMAT}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS imports ("
+            " target TEXT, kind TEXT, hash TEXT, issue_keys TEXT, imported_at REAL,"
+            " PRIMARY KEY (target, kind, hash))"
+        )
+
+    def known_features(self, target, hashes):
+        """Retorna {hash: [chaves]} dos hashes de feature já importados em target."""
+        found = {}
+        hashes = list(hashes)
+        with self._lock:
+            for i in range(0, len(hashes), 500):  # limite de parâmetros do SQLite
+                chunk = hashes[i:i + 500]
+                rows = self._db.execute(
+                    "SELECT hash, issue_keys FROM imports WHERE target = ? AND kind = 'feature'"
+                    f" AND hash IN ({','.join('?' * len(chunk))})",
+                    (target, *chunk),
+                )
+                for digest, keys in rows:
+                    found[digest] = keys.split(",") if keys else []
+        return found
+
+    def record(self, target, features, keys, project_key="", tags=""):
+        """
+        Registra features importados juntos e as chaves devolvidas pelo Xray.
+        Quando o Xray devolve uma chave por cenário, cada cenário fica com a sua;
+        senão o feature guarda todas as chaves do import.
+        """
+        scenarios = [s for feature in features for s in feature.scenarios]
+        per_scenario = len(keys) == len(scenarios)
+        rows = []
+        now = time.time()
+        position = 0
+        for feature in features:
+            if per_scenario:
+                feature_keys = keys[position:position + len(feature.scenarios)]
+                for scenario, key in zip(feature.scenarios, feature_keys):
+                    rows.append((target, "scenario", scenario_hash(scenario, tags), key, now))
+                position += len(feature.scenarios)
+            else:
+                feature_keys = keys
+            rows.append((target, "feature", feature_hash(feature, project_key, tags),
+                         ",".join(feature_keys), now))
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+
+    def forget(self, target=None):
+        with self._lock:
+            if target is None:
+                self._db.execute("DELETE FROM imports")
+            else:
+                self._db.execute("DELETE FROM imports WHERE target = ?", (target,))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def split_changed(features, ledger, target, project_key="", tags=""):
+    """
+    Separa os features em (novos ou alterados, já importados sem mudança).
+    Os já importados vêm como (feature, chaves das issues).
+    """
+    hashes = [feature_hash(feature, project_key, tags) for feature in features]
+    known = ledger.known_features(target, set(hashes))
+    changed, unchanged = [], []
+    for feature, digest in zip(features, hashes):
+        if digest in known:
+            unchanged.append((feature, known[digest]))
+        else:
+            changed.append(feature)
+    return changed, unchanged
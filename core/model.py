@@ -0,0 +1,99 @@
+class Step:
+    """
+    Uma linha dentro de um cenário (Given/When/Then, And, tabelas, linhas em branco...).
+    Não é armazenada: Scenario guarda só os textos e gera Steps sob demanda.
+    """
+    __slots__ = ("text", "line")
+
+    def __init__(self, text, line):
+        self.text = text
+        self.line = line
+
+    def __repr__(self):
+        return f"Step({self.text!r}, line={self.line})"
+
+
+class Scenario:
+    """
+    Um 'Scenario:' (ou 'Scenario Outline:') e as linhas que vêm até o próximo cenário.
+
+    Os blocos de Feature são linhas comentadas consecutivas no .robot, então a linha
+    de cada passo é sempre `line + 1 + índice` e não precisa ser guardada.
+    """
+    __slots__ = ("title", "line", "steps")
+
+    def __init__(self, title, line, steps=None):
+        self.title = title
+        self.line = line
+        self.steps = steps if steps is not None else []
+
+    @property
+    def name(self):
+        return self.title.partition(":")[2].strip()
+
+    def iter_steps(self):
+        for offset, text in enumerate(self.steps, 1):
+            yield Step(text, self.line + offset)
+
+    def lines(self):
+        yield self.title
+        yield from self.steps
+
+    def __repr__(self):
+        return f"Scenario({self.title!r}, line={self.line}, steps={len(self.steps)})"
+
+
+class Feature:
+    """
+    Um bloco '# Feature' extraído de um .robot.
+
+    - title: a linha 'Feature: ...' sem o '#'
+    - description: linhas entre o título e o primeiro cenário
+    - scenarios: lista de Scenario
+    - source / line: arquivo de origem e linha (1-based) do título
+    """
+    __slots__ = ("title", "line", "description", "scenarios", "source", "__weakref__")
+
+    def __init__(self, title, line=0, description=None, scenarios=None, source=None):
+        self.title = title
+        self.line = line
+        self.description = description if description is not None else []
+        self.scenarios = scenarios if scenarios is not None else []
+        self.source = source
+
+    @property
+    def name(self):
+        return self.title.partition(":")[2].strip()
+
+    @property
+    def scenario_count(self):
+        return len(self.scenarios)
+
+    def lines(self):
+        """Gera as linhas do feature, na ordem em que aparecem no arquivo."""
+        yield self.title
+        yield from self.description
+        for scenario in self.scenarios:
+            yield from scenario.lines()
+
+    @property
+    def text(self):
+        """Texto do feature (sem o '#'), igual ao que o parser devolvia como string."""
+        return "\n".join(self.lines())
+
+    def to_data(self):
+        """Forma serializável (JSON) usada pelo cache de parsing."""
+        return [
+            self.title,
+            self.line,
+            self.description,
+            [[s.title, s.line, s.steps] for s in self.scenarios],
+        ]
+
+    @classmethod
+    def from_data(cls, data, source=None):
+        title, line, description, scenarios = data
+        return cls(title, line, description, [Scenario(*s) for s in scenarios], source)
+
+    def __repr__(self):
+        return f"Feature({self.title!r}, source={self.source!r}, line={self.line}, scenarios={len(self.scenarios)})"
@@ -1,62 +1,238 @@
-import re
+import io
+import os
+from collections import deque
+from itertools import chain, islice
+
+from core.archives import iter_archive_data, read_bytes
+from core.model import Feature, Scenario
+from core.timing import span
+from core.walker import iter_robot_files
+
+# Todo Feature começa numa linha "# Feature" (comparação sem maiúsculas)
+FEATURE_MARKER = b"# feature"
+
+def _iter_feature_blocks(lines, source=None, first_line=1):
+    """
+    Núcleo do parser: percorre as linhas de um .robot e gera um Feature (core.model)
+    para cada bloco '# Feature' comentado.
+    Cada Feature começa com '# Feature' e continua até a próxima Feature, a primeira
+    linha não comentada ou o fim do arquivo.
+    """
+    feature = None   # Feature em construção
+    target = None    # Lista que recebe as próximas linhas (descrição ou passos do cenário)
+
+    for line_number, line in enumerate(lines, first_line):
+        stripped = line.strip()
+
+        # Detecta início de um Feature
+        if stripped.lower().startswith("# feature"):
+            if feature is not None:
+                yield feature
+
+            feature = Feature(stripped.lstrip("#").strip(), line_number, source=source)
+            target = feature.description
+
+        # Dentro de um Feature
+        elif feature is not None:
+            if stripped.startswith("#"):
+                content = stripped.lstrip("#").strip()
+
+                # Cada cenário abre uma nova lista de passos
+                if content.lower().startswith("scenario"):
+                    scenario = Scenario(content, line_number)
+                    feature.scenarios.append(scenario)
+                    target = scenario.steps
+                else:
+                    target.append(content)
+
+            elif stripped == "":
+                target.append("")
+            else:
+                # Linha fora de comentário → fecha feature
+                yield feature
+                feature = None
+
+    # Se terminou ainda dentro de um Feature
+    if feature is not None:
+        yield feature
+
+
+def _feature_region(data):
+    """
+    Caminho rápido em bytes: procura o marcador '# feature' no conteúdo inteiro sem
+    decodificar nada. Se não houver marcador, retorna (None, 0) e o arquivo é
+    descartado sem laço por linha. Caso contrário, só o trecho a partir da linha do
+    primeiro marcador é decodificado (nada antes dela pode ser Feature).
+
+    Retorna (texto a partir dessa linha, número da linha).
+    """
+    pos = data.lower().find(FEATURE_MARKER)
+    if pos == -1:
+        return None, 0
+
+    # Início da linha do marcador (aceita \n, \r\n e \r, como o modo texto)
+    line_start = max(data.rfind(b"\n", 0, pos), data.rfind(b"\r", 0, pos)) + 1
+    line_number = 1 + (
+        data.count(b"\n", 0, line_start)
+        + data.count(b"\r", 0, line_start)
+        - data.count(b"\r\n", 0, line_start)
+    )
+    return data[line_start:].decode("utf-8"), line_number
+
+
+def iter_features_from_bytes(data, source=None):
+    """Como iter_features, para um conteúdo já lido (ex.: membro de um artefato)."""
+    text, first_line = _feature_region(data)
+    if text is None:
+        return
+    lines = io.StringIO(text, newline=None)  # mesmas quebras de linha do modo texto
+    yield from _iter_feature_blocks(lines, source, first_line)
+
+
+def iter_features(file_path):
+    """
+    Versão em streaming de parse_robot_file: gera cada Feature assim que o bloco
+    termina, sem guardar a lista de features. O arquivo (ou membro de artefato, ver
+    core.archives) é lido inteiro de uma vez.
+    Arquivos sem nenhum '# Feature' são rejeitados pelo caminho rápido em bytes.
+    """
+    yield from iter_features_from_bytes(read_bytes(file_path), file_path)
+
+
+def iter_tree(root, recursive=False):
+    """
+    Gera (caminho, feature) para todos os .robot de `root`, um feature por vez.
+    Arquivos que não podem ser lidos são ignorados.
+    """
+    for path in iter_robot_files(root, recursive):
+        try:
+            for feature in iter_features(path):
+                yield path, feature
+        except (OSError, UnicodeDecodeError):
+            continue
+
+
+def _stats(features):
+    return {
+        "features": len(features),
+        "scenarios": sum(len(feature.scenarios) for feature in features)
+    }
+
 
 def parse_robot_file(file_path):
     """
     Lê um arquivo .robot e extrai blocos de Feature que estão comentados.
     Cada Feature começa com '# Feature' e continua até a próxima Feature ou o fim do arquivo.
+    Aceita também um membro de artefato ("artefato.zip!/pasta/suite.robot").
     
     Retorna:
-    - features: lista de strings (cada feature completo)
+    - features: lista de Feature (core.model), com arquivo e linha de origem
     - stats: dicionário com contagem de features e cenários
     """
+    with span("parse_robot_file", "parser"):
+        features = list(iter_features(file_path))
+
+    return features, _stats(features)
 
-    features = []         # Lista final de features encontrados
-    current_feature = []  # Acumulador temporário do feature atual
-    inside_feature = False
 
-    feature_count = 0
-    scenario_count = 0
+def iter_parse_archive(archive, recursive=True, counts=None, ignore=None):
+    """
+    Parseia os .robot de um artefato .zip/.tar numa única passada, sem extrair.
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            stripped = line.strip()
+    Gera (caminho "artefato!/membro", features, stats, erro) como iter_parse_many.
+    Roda no próprio processo: o custo está em descomprimir, que é sequencial.
+    """
+    for path, data in iter_archive_data(archive, recursive, counts, ignore):
+        try:
+            with span("parse_robot_file", "parser"):
+                features = list(iter_features_from_bytes(data, path))
+            yield path, features, _stats(features), None
+        except Exception as e:
+            yield path, [], {"features": 0, "scenarios": 0}, str(e)
 
-            # Detecta início de um Feature
-            if stripped.lower().startswith("# feature"):
-                if current_feature:
-                    features.append("\n".join(current_feature))
-                    current_feature = []
 
-                inside_feature = True
-                feature_count += 1
-                current_feature.append(stripped.lstrip("#").strip())
+def _parse_chunk(paths):
+    """
+    Parseia um lote de arquivos (executado dentro de um processo do pool).
+    Erros de um arquivo não derrubam o lote: vão no 4º campo da tupla.
+    """
+    results = []
+    for path in paths:
+        try:
+            features, stats = parse_robot_file(path)
+            results.append((path, features, stats, None))
+        except Exception as e:
+            results.append((path, [], {"features": 0, "scenarios": 0}, str(e)))
+    return results
 
-            # Dentro de um Feature
-            elif inside_feature:
-                if stripped.startswith("#"):
-                    content = stripped.lstrip("#").strip()
-                    current_feature.append(content)
 
-                    # Conta cenários
-                    if content.lower().startswith("scenario"):
-                        scenario_count += 1
+def iter_parse_many(paths, workers=None, chunksize=32, start_method=None):
+    """
+    Parseia vários arquivos em paralelo, distribuindo lotes para um pool de processos.
 
-                elif stripped == "":
-                    current_feature.append("")
-                else:
-                    # Linha fora de comentário → fecha feature
-                    if current_feature:
-                        features.append("\n".join(current_feature))
-                        current_feature = []
-                    inside_feature = False
-
-        # Se terminou ainda dentro de um Feature
-        if current_feature:
-            features.append("\n".join(current_feature))
-
-    stats = {
-        "features": feature_count,
-        "scenarios": scenario_count
-    }
+    - paths: iterável de caminhos (pode ser um gerador; é consumido aos poucos)
+    - workers: nº de processos (padrão: os.cpu_count()); 1 parseia no próprio processo
+    - chunksize: quantos arquivos vão em cada tarefa do pool
+    - start_method: "spawn", "fork"... (use "spawn" a partir de processos com threads, ex.: GUI)
+
+    Gera tuplas (caminho, features, stats, erro) na mesma ordem dos caminhos de entrada.
+    Só mantém alguns lotes em voo por vez, então a memória não cresce com o total.
+    """
+    workers = workers or os.cpu_count() or 1
+    paths = iter(paths)
+
+    # Poucos arquivos (ou 1 worker): não compensa subir o pool
+    head = list(islice(paths, chunksize + 1))
+    if workers <= 1 or len(head) <= chunksize:
+        for path in chain(head, paths):
+            yield from _parse_chunk([path])
+        return
+    paths = chain(head, paths)
+
+    # Importados só aqui: custam dezenas de ms e o caminho serial não precisa deles
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    with span("pool.início", "parser"):
+        context = multiprocessing.get_context(start_method) if start_method else None
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        in_flight = deque()
+        exhausted = False
+        while True:
+            # Mantém ~2 lotes por worker na fila para ninguém ficar ocioso
+            while not exhausted and len(in_flight) < workers * 2:
+                chunk = list(islice(paths, chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                in_flight.append(executor.submit(_parse_chunk, chunk))
+
+            if not in_flight:
+                return
+            # Tempo em que o consumidor ficou esperando os processos
+            with span("pool.espera", "parser"):
+                results = in_flight.popleft().result()
+            yield from results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_many(paths, workers=None, chunksize=32, start_method=None):
+    """
+    Versão em lote de parse_robot_file: parseia todos os caminhos em paralelo.
+
+    Retorna:
+    - results: lista de (caminho, features, stats, erro), ordenada por caminho
+    - totals: dicionário com arquivos, features, cenários e erros somados
+    """
+    results = list(iter_parse_many(sorted(paths), workers, chunksize, start_method))
+
+    totals = {"files": len(results), "features": 0, "scenarios": 0, "errors": 0}
+    for _, _, stats, error in results:
+        totals["features"] += stats["features"]
+        totals["scenarios"] += stats["scenarios"]
+        if error:
+            totals["errors"] += 1
 
-    return features, stats
+    return results, totals
@@ -0,0 +1,82 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class PathIndex:
+    """
+    Índice para filtrar caminhos por substring (sem diferenciar maiúsculas).
+
+    Os caminhos em minúsculas são concatenados num único texto (um por linha) com a
+    tabela de deslocamentos de cada um. Uma consulta é uma sequência de str.find
+    nesse texto (busca em C, sem laço Python por caminho): o custo depende do número
+    de resultados, não do total. Adicionar é só um append; o texto é remontado na
+    próxima consulta. Cada caminho recebe um id estável (ordem de inserção).
+    """
+
+    BROAD_QUERY_LIMIT = 2000
+
+    def __init__(self):
+        self._paths = []     # id -> caminho em minúsculas (None = removido)
+        self._ids = {}       # caminho original -> id
+        self._blob = None    # "\n".join(self._paths), remontado sob demanda
+        self._starts = []    # deslocamento de cada id dentro de _blob
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, path):
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path_id = len(self._paths)
+            self._paths.append(path.lower())
+            self._ids[path] = path_id
+            self._blob = None
+        return path_id
+
+    def add_many(self, paths):
+        return [self.add(path) for path in paths]
+
+    def remove(self, path):
+        path_id = self._ids.pop(path, None)
+        if path_id is not None:
+            self._paths[path_id] = None
+            self._blob = None
+        return path_id
+
+    def id_of(self, path):
+        return self._ids.get(path)
+
+    def clear(self):
+        self._paths.clear()
+        self._ids.clear()
+        self._blob = None
+        self._starts = []
+
+    def _build(self):
+        paths = [p if p is not None else "" for p in self._paths]
+        self._blob = "\n".join(paths)
+        self._starts = [0]
+        self._starts.extend(accumulate(len(p) + 1 for p in paths))
+
+    def search(self, query):
+        """Ids (em ordem de inserção) dos caminhos que contêm `query`."""
+        query = query.lower()
+        if not query:
+            return [i for i, p in enumerate(self._paths) if p is not None]
+        if "\n" in query:
+            return []
+        if self._blob is None:
+            self._build()
+
+        blob, starts = self._blob, self._starts
+        found = []
+        pos = blob.find(query)
+        while pos != -1:
+            if len(found) >= self.BROAD_QUERY_LIMIT:
+                # Consulta muito ampla: a varredura direta sai mais barata que os bisects
+                return [i for i, p in enumerate(self._paths) if p is not None and query in p]
+            path_id = bisect_right(starts, pos) - 1
+            found.append(path_id)
+            # Pula para o próximo caminho: cada id aparece uma vez só
+            pos = blob.find(query, starts[path_id + 1])
+        return found
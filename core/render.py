@@ -0,0 +1,99 @@
+import os
+import weakref
+
+
+def _render_feature(feature, project_key, tags):
+    # Trabalha direto no modelo: os cenários já estão separados, não há o que re-escanear
+    lines = []
+    if project_key:
+        lines.append(project_key)
+    lines.append(feature.title)
+    lines.extend(feature.description)
+    for scenario in feature.scenarios:
+        if tags:
+            lines.append(tags)
+        lines.append(scenario.title)
+        lines.extend(scenario.steps)
+    return "\n".join(lines)
+
+
+def iter_project_and_tags(features, project_key="", tags=""):
+    """
+    Versão em streaming de apply_project_and_tags: renderiza um feature por vez.
+    """
+    for feature in features:
+        yield _render_feature(feature, project_key, tags)
+
+
+def apply_project_and_tags(features, project_key="", tags=""):
+    """
+    Prepara os features (core.model.Feature) para o Jira/Xray:
+    - a chave do projeto (ex.: @PROJ) vai na primeira linha de cada Feature
+    - as tags (ex.: @smoke @regressao) vão na linha anterior a cada Scenario
+
+    Retorna uma lista de strings; os features não são alterados.
+    """
+    return list(iter_project_and_tags(features, project_key, tags))
+
+
+def write_features(output_path, features, project_key="", tags=""):
+    """
+    Grava os features (qualquer iterável, inclusive um gerador) em output_path,
+    separados por linha em branco, sem montar o texto completo em memória.
+
+    A escrita vai para um arquivo temporário que só substitui o destino no final;
+    se não houver nenhum feature, o destino não é tocado.
+
+    Retorna o número de features gravados.
+    """
+    tmp_path = output_path + ".tmp"
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for text in iter_project_and_tags(features, project_key, tags):
+                if count:
+                    f.write("\n\n")
+                f.write(text)
+                count += 1
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if count:
+        os.replace(tmp_path, output_path)
+    else:
+        os.remove(tmp_path)
+    return count
+
+
+class RenderCache:
+    """
+    Memoriza o texto renderizado de cada Feature para (projeto, tags).
+
+    As entradas são presas ao próprio objeto Feature (referência fraca): quando um
+    arquivo é reparseado, os features antigos somem do cache sozinhos e só os novos
+    precisam ser renderizados. Mudar projeto/tags invalida feature por feature,
+    na medida em que forem pedidos (o preview só pede os que estão visíveis).
+    """
+
+    def __init__(self):
+        self._texts = weakref.WeakKeyDictionary()  # feature -> (projeto, tags, texto)
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, feature, project_key="", tags=""):
+        entry = self._texts.get(feature)
+        if entry is not None and entry[0] == project_key and entry[1] == tags:
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        text = _render_feature(feature, project_key, tags)
+        self._texts[feature] = (project_key, tags, text)
+        return text
+
+    def render_all(self, features, project_key="", tags=""):
+        return [self.render(feature, project_key, tags) for feature in features]
+
+    def clear(self):
+        self._texts.clear()
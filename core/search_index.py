@@ -0,0 +1,255 @@
+import re
+import unicodedata
+from bisect import bisect_left
+
+from core.model import Feature
+
+# Palavras, incluindo os diacríticos combinantes (texto em NFD), removidos ao dobrar
+_WORD = re.compile(r"[\w\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+")
+_FOLDED_MAX = 200_000
+_folded = {}  # palavra com acento -> termos sem acento (o vocabulário é pequeno)
+
+
+def _fold(text):
+    # Minúsculas e sem acentos: "Cenário" e "cenario" caem no mesmo termo
+    text = text.lower()
+    if text.isascii():
+        return text
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _fold_word(word):
+    terms = _folded.get(word)
+    if terms is None:
+        if len(_folded) >= _FOLDED_MAX:
+            _folded.clear()
+        terms = _folded[word] = tuple(_WORD.findall(_fold(word)))
+    return terms
+
+
+def tokenize(text):
+    # Separa antes de dobrar: só as palavras com acento passam pelo NFKD (com cache)
+    words = _WORD.findall(text.lower())
+    if text.isascii():
+        return words
+    terms = []
+    for word in words:
+        if word.isascii():
+            terms.append(word)
+        else:
+            terms.extend(_fold_word(word))
+    return terms
+
+
+def _entry_text(feature, scenario):
+    if scenario is None:
+        return "\n".join((feature.title, *feature.description))
+    return "\n".join((scenario.title, *scenario.steps))
+
+
+def file_terms(features):
+    """
+    Termos (sem repetição) de cada entrada dos features de um arquivo, na ordem em
+    que update_file cria as entradas. É a parte cara da indexação e só lê o modelo,
+    então pode rodar fora da thread da GUI (ex.: no ScanWorker).
+    """
+    terms = []
+    for feature in features:
+        terms.append(set(tokenize(_entry_text(feature, None))))
+        for scenario in feature.scenarios:
+            terms.append(set(tokenize(_entry_text(feature, scenario))))
+    return terms
+
+
+class Hit:
+    """Um resultado da busca: onde está (arquivo e linha) e o que casou."""
+    __slots__ = ("path", "line", "kind", "text", "feature", "scenario")
+
+    def __init__(self, path, line, kind, text, feature, scenario=None):
+        self.path = path
+        self.line = line
+        self.kind = kind          # "feature", "scenario" ou "step"
+        self.text = text
+        self.feature = feature
+        self.scenario = scenario
+
+    def __repr__(self):
+        return f"Hit({self.kind}, {self.path}:{self.line}, {self.text!r})"
+
+
+class FeatureIndex:
+    """
+    Índice invertido (termo -> entradas) sobre títulos de feature, títulos de cenário
+    e texto dos passos, montado à medida que os arquivos são parseados.
+
+    Há uma entrada por feature (título e descrição) e uma por cenário (título e
+    passos); a linha exata que casou só é localizada para os resultados exibidos.
+    Cada arquivo guarda a lista das suas entradas, então reparsear um arquivo troca
+    só as entradas dele. Na consulta, cada termo é exato exceto o último, que casa
+    por prefixo (o usuário ainda está digitando); os conjuntos são intersectados a
+    partir do menor.
+    """
+
+    def __init__(self):
+        self._entries = []   # id -> (caminho, feature, cenário ou None) (None = removido)
+        self._postings = {}  # termo -> set de ids
+        self._files = {}     # caminho -> lista de ids
+        self._vocab = None   # termos ordenados (para prefixo), remontado sob demanda
+        self._free = 0       # entradas removidas
+
+    def __len__(self):
+        return len(self._entries) - self._free
+
+    def _add_entry(self, ids, path, feature, scenario, terms):
+        entry_id = len(self._entries)
+        self._entries.append((path, feature, scenario))
+        ids.append(entry_id)
+        postings = self._postings
+        for term in terms:
+            bucket = postings.get(term)
+            if bucket is None:
+                postings[term] = {entry_id}
+                self._vocab = None
+            else:
+                bucket.add(entry_id)
+
+    def update_file(self, path, features, terms=None):
+        """
+        (Re)indexa os features de um arquivo, descartando as entradas antigas dele.
+        `terms` é o file_terms(features) já calculado (senão é calculado aqui).
+        """
+        self.remove_file(path)
+        if terms is None:
+            terms = file_terms(features)
+        terms = iter(terms)
+        ids = []
+        for feature in features:
+            self._add_entry(ids, path, feature, None, next(terms))
+            for scenario in feature.scenarios:
+                self._add_entry(ids, path, feature, scenario, next(terms))
+        if ids:
+            self._files[path] = ids
+
+    def remove_file(self, path):
+        ids = self._files.pop(path, None)
+        if not ids:
+            return
+        postings = self._postings
+        for entry_id in ids:
+            _, feature, scenario = self._entries[entry_id]
+            for term in set(tokenize(_entry_text(feature, scenario))):
+                bucket = postings.get(term)
+                if bucket is not None:
+                    bucket.discard(entry_id)
+                    if not bucket:
+                        del postings[term]
+                        self._vocab = None
+            self._entries[entry_id] = None
+        self._free += len(ids)
+
+    def clear(self):
+        self._entries = []
+        self._postings = {}
+        self._files = {}
+        self._vocab = None
+        self._free = 0
+
+    def _prefix_terms(self, prefix):
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        vocab = self._vocab
+        i = bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            yield vocab[i]
+            i += 1
+
+    def _parse_query(self, query):
+        """(termos exatos, prefixo final ou None)."""
+        terms = tokenize(query)
+        # Termo final por prefixo, a menos que a consulta termine em espaço
+        # (prefixo de 1 letra casaria com quase tudo)
+        if not terms or query[-1:].isspace() or len(terms[-1]) < 2:
+            return terms, None
+        return terms[:-1], terms[-1]
+
+    def _match(self, exact, prefix):
+        if not exact and prefix is None:
+            return []
+        sets = []
+        for term in exact:
+            bucket = self._postings.get(term)
+            if not bucket:
+                return []
+            sets.append(bucket)
+        if prefix is not None:
+            bucket = set()
+            for term in self._prefix_terms(prefix):
+                bucket |= self._postings[term]
+            if not bucket:
+                return []
+            sets.append(bucket)
+        sets.sort(key=len)
+        ids = set(sets[0])
+        for other in sets[1:]:
+            ids &= other
+            if not ids:
+                return []
+        return sorted(ids)  # ordem de inserção = ordem da varredura
+
+    @staticmethod
+    def _locate(feature, scenario, exact, prefix):
+        """Primeira linha da entrada que contém todos os termos (ou o maior número deles)."""
+        if scenario is None:
+            candidates = [(feature.line, "feature", feature.title)]
+            candidates += [(feature.line + i, "feature", text) for i, text in enumerate(feature.description, 1)]
+        else:
+            candidates = [(scenario.line, "scenario", scenario.title)]
+            candidates += [(step.line, "step", step.text) for step in scenario.iter_steps()]
+
+        best, best_score = candidates[0], -1
+        for candidate in candidates:
+            words = set(tokenize(candidate[2]))
+            score = sum(term in words for term in exact)
+            if prefix is not None and any(word.startswith(prefix) for word in words):
+                score += 1
+            if score > best_score:
+                best, best_score = candidate, score
+                if score == len(exact) + (prefix is not None):
+                    break
+        return best
+
+    def search(self, query, limit=200):
+        """Retorna (até `limit` Hits, total de resultados)."""
+        exact, prefix = self._parse_query(query)
+        ids = self._match(exact, prefix)
+        hits = []
+        for entry_id in ids[:limit]:
+            path, feature, scenario = self._entries[entry_id]
+            line, kind, text = self._locate(feature, scenario, exact, prefix)
+            hits.append(Hit(path, line, kind, text, feature, scenario))
+        return hits, len(ids)
+
+    def filter_features(self, query, features):
+        """
+        Versão filtrada de `features` (mesma ordem) só com o que casou: o feature
+        inteiro se o título/descrição casou, senão só os cenários que casaram.
+        """
+        whole, scenarios = set(), {}
+        for entry_id in self._match(*self._parse_query(query)):
+            _, feature, scenario = self._entries[entry_id]
+            if scenario is None:
+                whole.add(id(feature))
+            else:
+                scenarios.setdefault(id(feature), set()).add(id(scenario))
+
+        result = []
+        for feature in features:
+            if id(feature) in whole:
+                result.append(feature)
+            elif id(feature) in scenarios:
+                matched = scenarios[id(feature)]
+                result.append(Feature(
+                    feature.title, feature.line, feature.description,
+                    [s for s in feature.scenarios if id(s) in matched], feature.source,
+                ))
+        return result
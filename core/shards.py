@@ -0,0 +1,242 @@
+"""
+Saída dividida em vários .feature no lugar de um combined.feature único.
+
+Dois modos:
+- por arquivo: um .feature para cada .robot, espelhando as pastas de origem
+- por tamanho: partes de até `max_bytes`, com fronteiras definidas pelo conteúdo
+
+As partes são gravadas em paralelo (arquivo temporário + os.replace) e só as que
+mudaram são reescritas: um manifesto na pasta de saída guarda o hash de cada parte
+gravada. Partes que deixaram de existir são apagadas (só as que constam no
+manifesto; nada que o usuário tenha posto na pasta é tocado).
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.archives import split_member
+from core.render import RenderCache
+
+MODE_COMBINED = "combined"
+MODE_PER_FILE = "per-file"
+MODE_SIZE = "size"
+
+MANIFEST_NAME = ".features.json"
+MANIFEST_FORMAT = 1
+SEPARATOR = "\n\n"
+DEFAULT_SHARD_BYTES = 512 * 1024
+BOUNDARY_EVERY = 8  # 1 em cada N arquivos pode fechar uma parte (depois do mínimo)
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _path_key(source):
+    return int.from_bytes(hashlib.blake2b((source or "").encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _group_by_source(features):
+    """Agrupa features consecutivos do mesmo arquivo (a varredura já os entrega assim)."""
+    source, group = None, []
+    for feature in features:
+        if group and feature.source != source:
+            yield source, group
+            group = []
+        source = feature.source
+        group.append(feature)
+    if group:
+        yield source, group
+
+
+def _relative_name(source, root):
+    _, member = split_member(source or "")
+    if member is not None:
+        # Membro de artefato: o caminho dentro dele, sem sair da pasta de saída
+        relative = os.path.normpath(member.lstrip("/"))
+        return relative if not relative.startswith(os.pardir) else os.path.basename(relative)
+    if source and root:
+        relative = os.path.relpath(source, root)
+        if not relative.startswith(os.pardir):
+            return relative
+    return os.path.basename(source or "sem_origem")
+
+
+def iter_per_file(features, root, project_key="", tags="", cache=None):
+    """
+    (nome relativo, texto) por .robot de origem: pasta/suite.robot -> pasta/suite.feature
+    (para membros de artefato, o caminho dentro do artefato).
+    Aceita um gerador; só os features de um arquivo ficam em memória por vez.
+    """
+    render = (cache or RenderCache()).render
+    used = set()
+    for source, group in _group_by_source(features):
+        stem = base = os.path.splitext(_relative_name(source, root))[0]
+        suffix = 2
+        while stem in used:  # mesmo nome vindo de fora de root
+            stem = f"{base}_{suffix}"
+            suffix += 1
+        used.add(stem)
+        name = stem + ".feature"
+        yield name, SEPARATOR.join(render(f, project_key, tags) for f in group)
+
+
+def iter_sized(features, project_key="", tags="", cache=None, max_bytes=DEFAULT_SHARD_BYTES):
+    """
+    (nome, texto) de partes com até `max_bytes` (um arquivo maior que isso vai sozinho).
+
+    A fronteira entre partes não cai a cada max_bytes acumulados (editar um cenário
+    empurraria o conteúdo de todas as partes seguintes): passado um mínimo de
+    max_bytes/4, a parte fecha depois do primeiro .robot cujo hash do caminho é
+    múltiplo de BOUNDARY_EVERY. Uma edição só mexe na parte dela e, no máximo, na
+    fronteira seguinte. O nome vem do primeiro arquivo da parte, que também não se
+    desloca quando outras partes mudam.
+    """
+    render = (cache or RenderCache()).render
+    min_bytes = max_bytes // 4
+    parts, size, first = [], 0, None
+
+    def close():
+        return f"parte_{_digest(first.encode('utf-8'))[:10]}.feature", SEPARATOR.join(parts)
+
+    for source, group in _group_by_source(features):
+        text = SEPARATOR.join(render(f, project_key, tags) for f in group)
+        length = len(text.encode("utf-8")) + len(SEPARATOR)
+        if parts and size + length > max_bytes:
+            yield close()
+            parts, size = [], 0
+        if not parts:
+            first = source or ""
+        parts.append(text)
+        size += length
+        if size >= min_bytes and _path_key(source) % BOUNDARY_EVERY == 0:
+            yield close()
+            parts, size = [], 0
+    if parts:
+        yield close()
+
+
+class ShardResult:
+    __slots__ = ("output_dir", "written", "unchanged", "removed")
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.written = []     # nomes regravados
+        self.unchanged = []   # nomes que já estavam iguais no disco
+        self.removed = []     # nomes de execuções anteriores que não existem mais
+
+    @property
+    def total(self):
+        return len(self.written) + len(self.unchanged)
+
+    def __repr__(self):
+        return (f"ShardResult({self.output_dir!r}, written={len(self.written)}, "
+                f"unchanged={len(self.unchanged)}, removed={len(self.removed)})")
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("format") != MANIFEST_FORMAT:
+        return {}
+    return data.get("files", {})
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_shards(output_dir, shards, workers=4):
+    """
+    Grava as partes (iterável de (nome relativo, texto)) em output_dir.
+
+    Uma parte cujo hash, tamanho e mtime batem com o manifesto não é regravada.
+    Até `workers` gravações simultâneas; o iterável é consumido à medida que as
+    gravações terminam (no máximo 2×workers partes pendentes), então um gerador não
+    é materializado inteiro.
+    Retorna um ShardResult. Se nenhuma parte for produzida, nada é tocado.
+    """
+    old = _load_manifest(output_dir)
+    new = {}
+    result = ShardResult(output_dir)
+    slots = threading.BoundedSemaphore(workers * 2)
+    futures = []
+
+    def write(name, path, data, digest):
+        try:
+            size, mtime = _write_atomic(path, data)
+            new[name] = [digest, size, mtime]
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, text in shards:
+            if name in new:
+                raise ValueError(f"parte duplicada: {name}")
+            # Texto com \n gravado em bytes: mesmo conteúdo em qualquer sistema
+            data = text.encode("utf-8")
+            digest = _digest(data)
+            path = os.path.join(output_dir, name)
+            entry = old.get(name)
+            if entry and entry[0] == digest:
+                try:
+                    stat = os.stat(path)
+                    if [stat.st_size, stat.st_mtime_ns] == entry[1:]:
+                        new[name] = entry
+                        result.unchanged.append(name)
+                        continue
+                except OSError:
+                    pass
+            new[name] = None  # reservado; preenchido quando a gravação terminar
+            result.written.append(name)
+            slots.acquire()
+            futures.append(pool.submit(write, name, path, data, digest))
+        for future in futures:
+            future.result()  # propaga a primeira falha de gravação
+
+    if not new:
+        return result
+
+    # O manifesto é um arquivo comum em disco: um nome com ".." ou absoluto (ou um
+    # link para fora) não pode levar a apagar nada fora da pasta de saída
+    root = os.path.realpath(output_dir)
+    for name in old:
+        if name not in new:
+            path = os.path.realpath(os.path.join(root, name))
+            if not path.startswith(root + os.sep):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            result.removed.append(name)
+            # Pastas que ficaram vazias (modo por arquivo) somem junto
+            folder = os.path.dirname(path)
+            while folder.startswith(root + os.sep):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    break
+                folder = os.path.dirname(folder)
+
+    _write_atomic(
+        os.path.join(output_dir, MANIFEST_NAME),
+        json.dumps({"format": MANIFEST_FORMAT, "files": new}, ensure_ascii=False).encode("utf-8"),
+    )
+    return result
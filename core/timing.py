@@ -0,0 +1,143 @@
+"""
+Medição leve das fases (varredura, parsing, log, preview, gravação...).
+
+Desligado por padrão: span() devolve sempre o mesmo contexto vazio, então o custo
+nos pontos instrumentados é uma chamada de função e um teste de atributo.
+Ligado, cada span vira um evento (início, duração, thread) que pode ser resumido
+por nome ou exportado no formato do chrome://tracing / Perfetto.
+"""
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, time.perf_counter_ns(), self.cat, self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self._events = []  # (nome, categoria, início ns, duração ns, thread, args)
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        self._events = []
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name, cat="app", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def add(self, name, start_ns, end_ns, cat="app", args=None):
+        """Registra um intervalo já medido (perf_counter_ns)."""
+        if self.enabled:
+            # list.append é atômico: spans podem vir de qualquer thread
+            self._events.append((name, cat, start_ns, end_ns - start_ns, threading.get_ident(), args))
+
+    def timed_iter(self, iterable, name, cat="app"):
+        """
+        Repassa os itens de `iterable` somando só o tempo gasto para produzi-los
+        (não o tempo do consumidor). No fim registra um span com esse total.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        busy = 0
+        count = 0
+        first = time.perf_counter_ns()
+        try:
+            while True:
+                start = time.perf_counter_ns()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    busy += time.perf_counter_ns() - start
+                    break
+                busy += time.perf_counter_ns() - start
+                count += 1
+                yield item
+        finally:
+            wall = time.perf_counter_ns() - first
+            self.add(name, first, first + busy, cat, {"items": count, "wall_ms": round(wall / 1e6, 3)})
+
+    def summary(self):
+        """{nome: (ocorrências, total em segundos)}, na ordem em que apareceram."""
+        totals = {}
+        for name, _, _, duration, _, _ in list(self._events):
+            count, total = totals.get(name, (0, 0))
+            totals[name] = (count + 1, total + duration)
+        return {name: (count, total / 1e9) for name, (count, total) in totals.items()}
+
+    def format_summary(self, names=None, separator=" · "):
+        summary = self.summary()
+        parts = []
+        for name in names or summary:
+            if name in summary:
+                seconds = summary[name][1]
+                parts.append(f"{name} {seconds * 1000:.0f} ms" if seconds < 1 else f"{name} {seconds:.2f} s")
+        return separator.join(parts)
+
+    def export_chrome(self, path):
+        """Grava os eventos no formato Trace Event (abre em chrome://tracing ou ui.perfetto.dev)."""
+        import json  # só na exportação: json (e re) pesam no import deste módulo
+        pid = os.getpid()
+        events = [
+            {
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self._origin) / 1000, "dur": duration / 1000, "args": args or {},
+            }
+            for name, cat, start, duration, tid, args in list(self._events)
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def export_json(self, path):
+        """Grava o resumo por fase (ocorrências, total, média) em JSON."""
+        import json
+        data = {
+            name: {"count": count, "total_ms": round(seconds * 1000, 3),
+                   "mean_ms": round(seconds * 1000 / count, 3)}
+            for name, (count, seconds) in self.summary().items()
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return len(data)
+
+
+# Instância usada pelo app e pela CLI
+TRACER = Tracer()
+span = TRACER.span
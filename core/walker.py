@@ -0,0 +1,229 @@
+import os
+import re
+
+from core.archives import is_archive, iter_archive_robot_files
+
+# Pastas que nunca têm suítes e costumam ser enormes
+DEFAULT_IGNORES = (
+    ".git/", ".hg/", ".svn/", "node_modules/", "__pycache__/", ".venv/", "venv/",
+    ".tox/", ".idea/", ".vscode/", "results/",
+)
+
+IGNORE_FILE = ".gitignore"
+
+
+def _translate(pattern):
+    # Converte um glob do .gitignore em regex ("**" atravessa pastas, "*" não)
+    regex = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            regex.append("[^/]*")
+        elif c == "?":
+            regex.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex.append(re.escape(c))
+            else:
+                regex.append("[" + pattern[i + 1:end].replace("!", "^", 1) + "]")
+                i = end
+        else:
+            regex.append(re.escape(c))
+        i += 1
+    return re.compile("".join(regex) + r"\Z")
+
+
+class IgnoreRules:
+    """
+    Subconjunto do formato .gitignore: globs com *, ?, [...], **, negação com '!',
+    padrões só de pasta com '/' no fim e padrões ancorados quando contêm '/'.
+    Cada regra vale a partir da pasta (base) onde foi declarada; a última que casar vence.
+    """
+
+    def __init__(self, rules=()):
+        self._rules = list(rules)  # (base, regex, negada, só_pasta, ancorada)
+
+    def extended(self, lines, base=""):
+        rules = list(self._rules)
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if line:
+                rules.append((base, _translate(line), negate, dir_only, anchored))
+        return IgnoreRules(rules)
+
+    def ignored(self, rel_path, is_dir):
+        """rel_path: caminho relativo à raiz da varredura, com '/'."""
+        result = False
+        for base, regex, negate, dir_only, anchored in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                target = rel_path[len(base) + 1:]
+            else:
+                target = rel_path
+            if not anchored:
+                target = target.rsplit("/", 1)[-1]
+            if regex.match(target):
+                result = not negate
+        return result
+
+
+def _list_dir(path, read_ignore_file):
+    """
+    Lê uma pasta com os.scandir: (arquivos .robot, subpastas, linhas do .gitignore).
+    Subpastas vêm como (nome, é_symlink). Só os .robot são guardados (pré-filtro).
+    """
+    robot_files, subdirs, ignore_lines = [], [], None
+    with os.scandir(path) as entries:
+        for entry in entries:
+            name = entry.name
+            try:
+                if entry.is_dir():
+                    subdirs.append((name, entry.is_symlink()))
+                elif name.lower().endswith(".robot"):
+                    robot_files.append(name)
+                elif read_ignore_file and name == IGNORE_FILE:
+                    with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                        ignore_lines = f.readlines()
+            except OSError:
+                continue
+    robot_files.sort()
+    subdirs.sort()
+    return robot_files, subdirs, ignore_lines
+
+
+def folder_ignore_rules(path, rel, rules):
+    """
+    Regras de `path` (relativo à raiz: `rel`) a partir das da pasta-mãe, somando o
+    .gitignore dela, como a varredura faz. Útil para pastas que surgem depois.
+    """
+    try:
+        with open(os.path.join(path, IGNORE_FILE), "r", encoding="utf-8", errors="replace") as f:
+            return rules.extended(f.readlines(), rel)
+    except OSError:
+        return rules
+
+
+def iter_robot_files(folder, recursive=False, counts=None, ignore=DEFAULT_IGNORES,
+                     use_gitignore=True, follow_symlinks=True, workers=1, folders=None,
+                     folder_rules=None):
+    """
+    Gera os caminhos dos arquivos .robot de `folder`, em ordem determinística
+    (arquivos da pasta primeiro, depois as subpastas em ordem alfabética).
+
+    - recursive: desce nas subpastas
+    - counts: dicionário opcional atualizado durante a varredura com
+      "folders" (pastas visitadas), "files" (arquivos .robot) e "skipped"
+      (pastas/arquivos ignorados)
+    - ignore: padrões estilo .gitignore aplicados a partir da raiz
+    - use_gitignore: também respeita os .gitignore encontrados no caminho
+    - follow_symlinks: entra em pastas que são links (com proteção contra ciclos)
+    - workers: > 1 lista várias pastas em paralelo (útil em sistemas de arquivos de rede)
+    - folders: lista opcional que recebe cada pasta visitada (ex.: para monitorá-las)
+    - folder_rules: dicionário opcional preenchido com pasta visitada -> (caminho
+      relativo à raiz, IgnoreRules já com o .gitignore dela), para filtrar depois
+      o que aparecer nessas pastas do mesmo jeito
+
+    `folder` também pode ser um artefato .zip/.tar: os caminhos gerados são então
+    os membros .robot ("artefato.zip!/pasta/suite.robot"), ver core.archives.
+    """
+    if is_archive(folder):
+        yield from iter_archive_robot_files(folder, recursive, counts, ignore)
+        return
+
+    if counts is None:
+        counts = {}
+    for key in ("folders", "files", "skipped"):
+        counts.setdefault(key, 0)
+
+    executor = None
+    if recursive and workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    def listing(path):
+        if executor is not None:
+            return executor.submit(_list_dir, path, use_gitignore)
+        return path  # lido só quando for a vez da pasta
+
+    def result(pending):
+        if executor is not None:
+            return pending.result()
+        return _list_dir(pending, use_gitignore)
+
+    root_real = os.path.realpath(folder)
+    visited_links = set()
+    # Pilha de (caminho, relativo à raiz, caminho real, regras, listagem pendente)
+    stack = [(folder, "", root_real, IgnoreRules().extended(ignore), listing(folder))]
+    try:
+        while stack:
+            path, rel, real, rules, pending = stack.pop()
+            try:
+                robot_files, subdirs, ignore_lines = result(pending)
+            except OSError:
+                continue
+            counts["folders"] += 1
+            if folders is not None:
+                folders.append(path)
+            if ignore_lines:
+                rules = rules.extended(ignore_lines, rel)
+            if folder_rules is not None:
+                folder_rules[path] = (rel, rules)
+
+            for name in robot_files:
+                file_rel = f"{rel}/{name}" if rel else name
+                if rules.ignored(file_rel, False):
+                    counts["skipped"] += 1
+                    continue
+                counts["files"] += 1
+                yield os.path.join(path, name)
+
+            if not recursive:
+                continue
+
+            children = []
+            for name, is_link in subdirs:
+                child_rel = f"{rel}/{name}" if rel else name
+                if rules.ignored(child_rel, True):
+                    counts["skipped"] += 1
+                    continue
+                child = os.path.join(path, name)
+                child_real = os.path.join(real, name)
+                if is_link:
+                    if not follow_symlinks:
+                        continue
+                    # Link para um ancestral (ou já visitado) criaria um ciclo
+                    child_real = os.path.realpath(child)
+                    if (child_real in visited_links or real == child_real
+                            or real.startswith(child_real + os.sep)):
+                        counts["skipped"] += 1
+                        continue
+                    visited_links.add(child_real)
+                children.append((child, child_rel, child_real, rules, listing(child)))
+
+            # Inverte para que a pilha devolva as subpastas em ordem alfabética
+            stack.extend(reversed(children))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
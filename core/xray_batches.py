@@ -0,0 +1,145 @@
+"""
+Import em lotes: divide os features em arquivos .feature de tamanho limitado e os
+envia ao Xray em paralelo, com limite de concorrência e de requisições por minuto.
+Só os lotes que falharam são reenviados nas rodadas seguintes.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.xray_client import XrayError
+
+SEPARATOR = "\n\n"
+
+
+class Batch:
+    __slots__ = ("index", "features", "text")
+
+    def __init__(self, index, features, text):
+        self.index = index
+        self.features = features
+        self.text = text
+
+    @property
+    def filename(self):
+        return f"lote_{self.index + 1:04d}.feature"
+
+
+class BatchResult:
+    __slots__ = ("batch", "result", "error", "attempts")
+
+    def __init__(self, batch, result=None, error=None, attempts=1):
+        self.batch = batch
+        self.result = result    # ImportResult do cliente (None se nem houve resposta)
+        self.error = error      # mensagem da falha, se houve
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return self.error is None and self.result is not None and self.result.ok
+
+    @property
+    def retriable(self):
+        # Erros 4xx (fora 408/429) são do conteúdo do lote: reenviar não adianta
+        if self.ok:
+            return False
+        if self.result is None:
+            return True
+        return self.result.status in (408, 429) or self.result.status >= 500
+
+    @property
+    def keys(self):
+        return self.result.keys if self.result is not None else []
+
+
+def split_batches(features, render, max_bytes=512 * 1024, max_features=200):
+    """
+    Agrupa os features em lotes de até max_bytes (UTF-8) e max_features cada.
+    render(feature) devolve o texto do feature (com projeto/tags já aplicados).
+    Um feature maior que max_bytes vai sozinho no seu lote.
+    """
+    batches = []
+    current, parts, size = [], [], 0
+
+    def close():
+        batches.append(Batch(len(batches), current, SEPARATOR.join(parts)))
+
+    for feature in features:
+        text = render(feature)
+        length = len(text.encode("utf-8")) + len(SEPARATOR)
+        if current and (size + length > max_bytes or len(current) >= max_features):
+            close()
+            current, parts, size = [], [], 0
+        current.append(feature)
+        parts.append(text)
+        size += length
+    if current:
+        close()
+    return batches
+
+
+class RateLimiter:
+    """Espaça o início das requisições para no máximo per_minute por minuto (0 = sem limite)."""
+
+    def __init__(self, per_minute):
+        self._interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def upload_batches(client, batches, project_key=None, concurrency=4, per_minute=60,
+                   rounds=3, on_result=None, log=None, cancelled=None):
+    """
+    Envia os lotes e devolve {índice do lote: BatchResult}.
+
+    - concurrency: lotes enviados ao mesmo tempo
+    - per_minute: limite de requisições por minuto (throttling do Jira)
+    - rounds: rodadas de envio; cada rodada reenvia só os lotes que falharam por
+      erro temporário (rede, 408/429/5xx)
+    - on_result(BatchResult): chamado (na thread do envio) a cada lote concluído
+    - cancelled(): se devolver True, lotes ainda não iniciados são abandonados
+    """
+    limiter = RateLimiter(per_minute)
+    results = {}
+
+    def send(batch):
+        if cancelled is not None and cancelled():
+            return None
+        limiter.wait()
+        attempts = results[batch.index].attempts + 1 if batch.index in results else 1
+        try:
+            result = client.import_feature_text(batch.text, batch.filename, project_key, log=log)
+            error = None if result.ok else "; ".join(str(e) for e in result.errors) or f"HTTP {result.status}"
+            item = BatchResult(batch, result, error, attempts)
+        except XrayError as e:
+            item = BatchResult(batch, None, str(e), attempts)
+        except Exception as e:
+            item = BatchResult(batch, None, f"{type(e).__name__}: {e}", attempts)
+        if on_result is not None:
+            on_result(item)
+        return item
+
+    pending = list(batches)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for round_number in range(max(1, rounds)):
+            if not pending:
+                break
+            if round_number and log is not None:
+                log(f"[WARN] Reenviando {len(pending)} lote(s) com falha (rodada {round_number + 1})")
+            for item in executor.map(send, pending):
+                if item is not None:
+                    results[item.batch.index] = item
+            if cancelled is not None and cancelled():
+                break
+            pending = [b for b in pending if b.index in results and results[b.index].retriable]
+    return results
@@ -0,0 +1,245 @@
+"""
+Cliente HTTP do import de .feature do Xray, sem dependências externas.
+
+Mantém um pool de conexões keep-alive com o servidor do Jira/Xray, envia o
+multipart em streaming (o arquivo é lido do disco em blocos), repete com backoff
+exponencial em falhas temporárias e devolve as chaves das issues criadas.
+É síncrono: a GUI o chama a partir de uma thread do QThreadPool.
+"""
+import base64
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_IMPORT_PATH = "/rest/raven/2.0/import/feature"
+RETRY_STATUS = {429, 502, 503, 504}
+CHUNK_SIZE = 64 * 1024
+
+
+class XrayError(Exception):
+    def __init__(self, message, status=None, body=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class ImportResult:
+    __slots__ = ("status", "keys", "errors", "body", "attempts")
+
+    def __init__(self, status, keys, errors, body, attempts):
+        self.status = status
+        self.keys = keys
+        self.errors = errors
+        self.body = body
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300 and not self.errors
+
+
+def basic_auth(user, password):
+    token = base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+    return f"Basic {token}"
+
+
+def bearer_auth(token):
+    return f"Bearer {token}"
+
+
+def parse_import_response(body):
+    """
+    Extrai (chaves criadas/atualizadas, erros) da resposta do import.
+    Aceita o formato do Xray Server/DC (lista de issues) e o do Xray Cloud
+    ({"updatedOrCreatedTests": [...], "updatedOrCreatedPreconditions": [...], "errors": [...]}).
+    """
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        return [], []
+
+    keys, errors = [], []
+    if isinstance(data, list):
+        issues = data
+    elif isinstance(data, dict):
+        issues = data.get("updatedOrCreatedTests", []) + data.get("updatedOrCreatedPreconditions", [])
+        errors = list(data.get("errors") or [])
+        if "error" in data:
+            errors.append(data["error"])
+    else:
+        issues = []
+    for issue in issues:
+        if isinstance(issue, dict) and issue.get("key"):
+            keys.append(issue["key"])
+    return keys, errors
+
+
+class _ConnectionPool:
+    """Conexões keep-alive reaproveitadas entre requisições (até max_connections)."""
+
+    def __init__(self, scheme, host, port, timeout, max_connections):
+        self._factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        self._host, self._port, self._timeout = host, port, timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._factory(self._host, self._port, timeout=self._timeout)
+
+    def release(self, conn, reusable=True):
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class _Multipart:
+    """Corpo multipart/form-data com um único campo 'file', gerado em blocos."""
+
+    def __init__(self, filename, path=None, data=None):
+        self.boundary = uuid.uuid4().hex
+        self._path, self._data = path, data
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: text/plain; charset=utf-8\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        size = os.path.getsize(path) if path is not None else len(data)
+        self.length = len(self._head) + size + len(self._tail)
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def chunks(self, progress=None):
+        sent = 0
+
+        def step(chunk):
+            nonlocal sent
+            sent += len(chunk)
+            if progress is not None:
+                progress(sent, self.length)
+            return chunk
+
+        yield step(self._head)
+        if self._path is not None:
+            with open(self._path, "rb") as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield step(chunk)
+        else:
+            for i in range(0, len(self._data), CHUNK_SIZE):
+                yield step(self._data[i:i + CHUNK_SIZE])
+        yield step(self._tail)
+
+
+class XrayClient:
+    """
+    Cliente do endpoint de import de .feature.
+
+    - base_url: ex. "https://jira.empresa.com" (pode ter um prefixo de contexto)
+    - authorization: valor do header Authorization (ver basic_auth / bearer_auth)
+    - timeout: segundos por operação de socket
+    - retries: novas tentativas em erro de rede ou status 429/502/503/504
+    - backoff: espera inicial entre tentativas (dobra a cada uma; respeita Retry-After)
+    """
+
+    def __init__(self, base_url, authorization, timeout=60, retries=3, backoff=1.0,
+                 max_connections=4, import_path=DEFAULT_IMPORT_PATH):
+        parts = urlsplit(base_url.rstrip("/"))
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise XrayError(f"URL inválida: {base_url}")
+        self._prefix = parts.path
+        self._import_path = import_path
+        self._authorization = authorization
+        self.retries = retries
+        self.backoff = backoff
+        self._pool = _ConnectionPool(parts.scheme, parts.hostname, parts.port, timeout, max_connections)
+
+    def import_feature_file(self, path, project_key=None, progress=None, log=None):
+        """Envia um .feature do disco (em streaming)."""
+        body = _Multipart(os.path.basename(path), path=path)
+        return self._import(body, project_key, progress, log)
+
+    def import_feature_text(self, text, filename="import.feature", project_key=None,
+                            progress=None, log=None):
+        """Envia um conteúdo .feature já em memória (ex.: um lote de features)."""
+        body = _Multipart(filename, data=text.encode("utf-8"))
+        return self._import(body, project_key, progress, log)
+
+    def close(self):
+        self._pool.close()
+
+    def _import(self, body, project_key, progress, log):
+        url = self._prefix + self._import_path
+        if project_key:
+            url += "?" + urlencode({"projectKey": project_key})
+        headers = {
+            "Authorization": self._authorization,
+            "Content-Type": body.content_type,
+            "Content-Length": str(body.length),
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+        }
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                status, response_headers, response_body = self._send(url, headers, body, progress)
+            except (OSError, http.client.HTTPException) as e:
+                if attempt > self.retries:
+                    raise XrayError(f"Falha de conexão após {attempt} tentativa(s): {e}") from e
+                delay = self.backoff * 2 ** (attempt - 1)
+                if log is not None:
+                    log(f"[WARN] {e}; nova tentativa em {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            if status in RETRY_STATUS and attempt <= self.retries:
+                delay = self.backoff * 2 ** (attempt - 1)
+                retry_after = response_headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                if log is not None:
+                    log(f"[WARN] HTTP {status}; nova tentativa em {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            text = response_body.decode("utf-8", errors="replace")
+            keys, errors = parse_import_response(text)
+            if status >= 400 and not errors:
+                errors = [f"HTTP {status}"]
+            return ImportResult(status, keys, errors, text, attempt)
+
+    def _send(self, url, headers, body, progress):
+        conn = self._pool.acquire()
+        reusable = False
+        try:
+            conn.request("POST", url, body=body.chunks(progress), headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            reusable = not response.will_close
+            return response.status, response.headers, data
+        finally:
+            self._pool.release(conn, reusable)
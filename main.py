@@ -1,21 +1,47 @@
 import sys
 import os
-import subprocess
-import resources_rc
-import json
+import time
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QFileDialog, QListWidget, QTextEdit, QMessageBox,
+    QPushButton, QFileDialog, QTreeView, QHeaderView, QMessageBox,
     QSplitter, QLabel, QToolButton, QFrame, QLineEdit, QTabWidget,
-    QRadioButton, QButtonGroup, QGroupBox, QStackedWidget, QFileIconProvider
+    QProgressBar, QMenu, QComboBox, QInputDialog
+)
+from PySide6.QtCore import Qt, QSize, QThreadPool, QTimer
+from PySide6.QtGui import QAction, QIcon
+
+from core.archives import is_archive, source_folder, split_member
+from core.cache import ParseCache
+from core.render import RenderCache, write_features
+from core.search_index import FeatureIndex
+from core.shards import MODE_COMBINED, MODE_PER_FILE, MODE_SIZE, iter_per_file, iter_sized, write_shards
+from core.timing import TRACER, span
+from core.walker import folder_ignore_rules
+from ui.file_model import FileListModel
+from ui.folder_watcher import FolderWatcher
+from ui.log_sink import LogPanel
+from ui.preview import FeaturePreview
+from ui.scan_worker import ScanWorker
+from ui.search_panel import SearchPanel
+from ui.theme import stylesheet
+
+# Importados sob demanda (custam na abertura e só são usados depois):
+# resources_rc (ícones), subprocess (abrir o explorador), ui.xray_page (HTTP, json, SQLite)
+# e a detecção de duplicados e o modo delta (git)
+
+PARSE_CACHE_PATH = "parse_cache.sqlite"
+SPLIT_FOLDER = "features"        # pasta (dentro da selecionada) da saída dividida
+SHARD_MAX_BYTES = 512 * 1024
+DELTA_FILE_NAME = "combined_delta.feature"
+DEFAULT_DELTA_REF = "main"
+MAX_REPORTED_DUPLICATES = 50      # grupos listados no log
+XRAY_TAB_TITLE = "Criar Teste no Xray"
+# Fases exibidas no rodapé/log quando a medição está ligada (na ordem do pipeline)
+TIMING_PHASES = (
+    "varredura", "listagem", "parsing", "pool.espera", "índice", "ui.lotes",
+    "log", "preview", "monitor", "gravação",
 )
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QIcon
-
-from core.parser import parse_robot_file
-
-LOGIN_CONFIG_PATH = "login_config.json"
 
 class FeatureCreatorPage(QWidget):
     def __init__(self, parent):
@@ -36,6 +62,18 @@ class FeatureCreatorPage(QWidget):
         self.folder_button.clicked.connect(self.parent.select_folder)
         header.addWidget(self.folder_button)
 
+        # Artefato de CI (.zip/.tar.gz): os .robot são lidos sem extrair
+        self.archive_button = QPushButton("Abrir Artefato")
+        self.archive_button.setToolTip("Lê os .robot de um .zip/.tar(.gz) sem extrair para o disco")
+        self.archive_button.clicked.connect(self.parent.select_archive)
+        header.addWidget(self.archive_button)
+
+        # Modo delta: só os features alterados desde uma branch/commit (git local)
+        self.delta_button = QPushButton("Delta (git)")
+        self.delta_button.setToolTip("Gera um .feature só com os features alterados desde uma branch ou commit")
+        self.delta_button.clicked.connect(self.parent.generate_delta)
+        header.addWidget(self.delta_button)
+
         # "Checkbox" de subpastas → botão toggle (destacado quando ligado)
         self.subfolders_checkbox = QPushButton("Incluir subpastas")
         self.subfolders_checkbox.setObjectName("btnSubfolders")
@@ -47,6 +85,14 @@ class FeatureCreatorPage(QWidget):
         )
         header.addWidget(self.subfolders_checkbox)
 
+        # Modo monitoramento: reprocessa só os arquivos alterados
+        self.watch_checkbox = QPushButton("Monitorar pasta")
+        self.watch_checkbox.setObjectName("btnWatch")
+        self.watch_checkbox.setCheckable(True)
+        self.watch_checkbox.setToolTip("Atualiza automaticamente quando arquivos .robot mudarem")
+        self.watch_checkbox.toggled.connect(self.parent.toggle_watch)
+        header.addWidget(self.watch_checkbox)
+
         # --- Novos campos no header ---
         self.parent.project_input = QLineEdit()
         self.parent.project_input.setPlaceholderText("Projeto (@KEYDOTESTE)")
@@ -75,14 +121,28 @@ class FeatureCreatorPage(QWidget):
         left_layout.setContentsMargins(0, 0, 0, 0)
         left_layout.setSpacing(6)
 
-        self.parent.file_list = QListWidget()
-        self.parent.file_list.itemClicked.connect(self.parent.show_preview)
-        self.parent.file_list.setSelectionMode(QListWidget.SingleSelection)
+        self.parent.file_filter = QLineEdit()
+        self.parent.file_filter.setPlaceholderText("Filtrar arquivos...")
+        self.parent.file_filter.setClearButtonEnabled(True)
+        self.parent.file_filter.textChanged.connect(self.parent.file_model.set_filter)
+        left_layout.addWidget(self.parent.file_filter, 0)
+
+        # Lista de arquivos baseada em modelo: inserção em lote e colunas de contagem
+        self.parent.file_list = QTreeView()
+        self.parent.file_list.setModel(self.parent.file_model)
+        self.parent.file_list.setRootIsDecorated(False)
+        self.parent.file_list.setUniformRowHeights(True)
+        self.parent.file_list.setSelectionMode(QTreeView.SingleSelection)
+        self.parent.file_list.clicked.connect(self.parent.show_preview)
+        header_view = self.parent.file_list.header()
+        header_view.setStretchLastSection(False)
+        header_view.setSectionResizeMode(0, QHeaderView.Stretch)
+        header_view.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        header_view.setSectionResizeMode(2, QHeaderView.ResizeToContents)
         left_layout.addWidget(self.parent.file_list, 1)  # metade superior
 
-        self.parent.log_output = QTextEdit()
-        self.parent.log_output.setReadOnly(True)
-        self.parent.log_output.setPlaceholderText("Logs do sistema aparecerão aqui...")
+        # Log em lote (com histórico limitado e filtro de nível)
+        self.parent.log_output = LogPanel()
         left_layout.addWidget(self.parent.log_output, 1)  # metade inferior
 
         self.parent.splitter.addWidget(left_widget)
@@ -97,10 +157,17 @@ class FeatureCreatorPage(QWidget):
         right_layout = QVBoxLayout(right_widget)
         right_layout.setContentsMargins(0, 0, 0, 0)
         right_layout.setSpacing(6)
+
+        # Busca no índice invertido (features, cenários e passos)
+        self.parent.search_panel = SearchPanel(self.parent.search_index)
+        self.parent.search_panel.hit_activated.connect(self.parent._on_search_hit)
+        self.parent.search_panel.export_requested.connect(self.parent.generate_filtered_feature)
+        right_layout.addWidget(self.parent.search_panel, 0)
+
         right_layout.addWidget(self.parent.back_button, 0)
 
-        self.parent.preview = QTextEdit()
-        self.parent.preview.setReadOnly(True)
+        # Preview virtualizado: só os features próximos da área visível são carregados
+        self.parent.preview = FeaturePreview()
         right_layout.addWidget(self.parent.preview, 1)
 
         self.parent.splitter.addWidget(right_widget)
@@ -119,8 +186,55 @@ class FeatureCreatorPage(QWidget):
         self.parent.lblSummary.setObjectName("lblSummary")
         footer_layout.addWidget(self.parent.lblSummary)
 
+        # Tempos por fase da última execução (só com a medição ligada)
+        self.parent.lblTimings = QLabel()
+        self.parent.lblTimings.setObjectName("lblTimings")
+        self.parent.lblTimings.setVisible(False)
+        footer_layout.addWidget(self.parent.lblTimings)
+
         footer_layout.addStretch()
 
+        # --- Progresso da varredura (visível só durante o scan) ---
+        self.parent.scan_progress = QProgressBar()
+        self.parent.scan_progress.setRange(0, 0)  # modo ocupado: total desconhecido
+        self.parent.scan_progress.setMaximumWidth(160)
+        self.parent.scan_progress.setVisible(False)
+        footer_layout.addWidget(self.parent.scan_progress)
+
+        self.parent.cancel_scan_button = QPushButton("Cancelar")
+        self.parent.cancel_scan_button.setToolTip("Interrompe a varredura em andamento")
+        self.parent.cancel_scan_button.clicked.connect(self.parent.cancel_scan)
+        self.parent.cancel_scan_button.setVisible(False)
+        footer_layout.addWidget(self.parent.cancel_scan_button)
+
+        # Saída: combined.feature único, um .feature por .robot ou partes de tamanho limitado
+        self.parent.output_mode = QComboBox()
+        self.parent.output_mode.addItem("Um arquivo", MODE_COMBINED)
+        self.parent.output_mode.addItem("Um por .robot", MODE_PER_FILE)
+        self.parent.output_mode.addItem(f"Partes de {SHARD_MAX_BYTES // 1024} KB", MODE_SIZE)
+        self.parent.output_mode.setToolTip(
+            "Nos modos divididos, os arquivos vão para a pasta "
+            f"'{SPLIT_FOLDER}' e só os que mudaram são regravados"
+        )
+        footer_layout.addWidget(self.parent.output_mode)
+
+        # --- Duplicados (features/cenários copiados entre arquivos) ---
+        self.parent.duplicates_button = QToolButton()
+        self.parent.duplicates_button.setText("Duplicados")
+        self.parent.duplicates_button.setToolTip("Procura features e cenários copiados entre arquivos .robot")
+        self.parent.duplicates_button.setPopupMode(QToolButton.InstantPopup)
+        duplicates_menu = QMenu(self.parent.duplicates_button)
+        duplicates_menu.addAction("Procurar duplicados exatos", lambda: self.parent.find_duplicates(near=False))
+        duplicates_menu.addAction("Procurar também quase iguais", lambda: self.parent.find_duplicates(near=True))
+        duplicates_menu.addSeparator()
+        self.parent.collapse_action = QAction("Colapsar duplicados ao gerar", duplicates_menu, checkable=True)
+        self.parent.collapse_action.setToolTip(
+            "Grava/envia só a primeira ocorrência de cada grupo (exatos, ou os da última análise)"
+        )
+        duplicates_menu.addAction(self.parent.collapse_action)
+        self.parent.duplicates_button.setMenu(duplicates_menu)
+        footer_layout.addWidget(self.parent.duplicates_button)
+
         self.parent.generate_button = QPushButton("Gerar .feature")
         self.parent.generate_button.clicked.connect(self.parent.generate_feature)
         footer_layout.addWidget(self.parent.generate_button)
@@ -131,169 +245,27 @@ class FeatureCreatorPage(QWidget):
         self.parent.reset_button.clicked.connect(self.parent.reset_all)
         footer_layout.addWidget(self.parent.reset_button)
 
-        layout.addWidget(self.parent.footer, 0)
-        self.setLayout(layout)
-
-class XrayTestPage(QWidget):
-    def __init__(self, parent):
-        super().__init__()
-        self.parent = parent
-        self.init_ui()
-        self.load_login_config()  # Carrega ao iniciar
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-        layout.setSpacing(12)
-
-        # --- Login Group ---
-        login_group = QGroupBox("Login no Jira/Xray")
-        login_layout = QVBoxLayout(login_group)
-
-        self.radio_userpass = QRadioButton("Usuário e Senha")
-        self.radio_token = QRadioButton("Token do Jira")
-        self.radio_userpass.setChecked(True)
-        login_layout.addWidget(self.radio_userpass)
-        login_layout.addWidget(self.radio_token)
-
-        self.login_method_group = QButtonGroup()
-        self.login_method_group.addButton(self.radio_userpass)
-        self.login_method_group.addButton(self.radio_token)
-
-        # Campos de usuário/senha/token em um QStackedWidget
-        self.login_stack = QStackedWidget()
-
-        # Página 0: Usuário e Senha
-        userpass_widget = QWidget()
-        userpass_layout = QVBoxLayout(userpass_widget)
-        self.user_field = QLineEdit()
-        self.user_field.setPlaceholderText("Usuário Jira")
-        self.pass_field = QLineEdit()
-        self.pass_field.setPlaceholderText("Senha Jira")
-        self.pass_field.setEchoMode(QLineEdit.Password)
-        userpass_layout.addWidget(self.user_field)
-        userpass_layout.addWidget(self.pass_field)
-        self.login_stack.addWidget(userpass_widget)
-
-        # Página 1: Token
-        token_widget = QWidget()
-        token_layout = QVBoxLayout(token_widget)
-        self.token_field = QLineEdit()
-        self.token_field.setPlaceholderText("Token Jira")
-        token_layout.addWidget(self.token_field)
-        self.login_stack.addWidget(token_widget)
-
-        login_layout.addWidget(self.login_stack)
-
-        # Alterna páginas do stack conforme seleção
-        self.radio_userpass.toggled.connect(
-            lambda checked: self.login_stack.setCurrentIndex(0 if checked else 1)
-        )
-        self.radio_token.toggled.connect(
-            lambda checked: self.login_stack.setCurrentIndex(1 if checked else 0)
-        )
-        self.login_stack.setCurrentIndex(0)
-
-        layout.addWidget(login_group)
-
-        # --- Seleção de arquivo .feature ---
-        file_group = QGroupBox("Arquivo .feature para criar teste")
-        file_layout = QHBoxLayout(file_group)
-        self.feature_file_path = QLineEdit()
-        self.feature_file_path.setPlaceholderText("Selecione um arquivo .feature")
-        self.feature_file_path.setReadOnly(True)
-        file_layout.addWidget(self.feature_file_path)
-        self.select_file_btn = QPushButton("Selecionar Arquivo")
-        self.select_file_btn.clicked.connect(self.select_feature_file)
-        file_layout.addWidget(self.select_file_btn)
-        layout.addWidget(file_group)
-
-        # --- Botão de criar teste ---
-        self.create_test_btn = QPushButton("Criar Teste no Xray")
-        self.create_test_btn.clicked.connect(self.create_xray_test)
-        layout.addWidget(self.create_test_btn)
-
-        # --- Log de saída ---
-        self.xray_log = QTextEdit()
-        self.xray_log.setReadOnly(True)
-        self.xray_log.setPlaceholderText("Saída do comando aparecerá aqui...")
-        layout.addWidget(self.xray_log, 1)
+        # --- Medição de desempenho (fases, trace, cProfile) ---
+        self.parent.timing_button = QToolButton()
+        self.parent.timing_button.setText("Tempos")
+        self.parent.timing_button.setToolTip("Medição das fases e exportação de trace")
+        self.parent.timing_button.setPopupMode(QToolButton.InstantPopup)
+        timing_menu = QMenu(self.parent.timing_button)
+        self.parent.timing_action = QAction("Medir fases", timing_menu, checkable=True)
+        self.parent.timing_action.toggled.connect(self.parent.toggle_timing)
+        timing_menu.addAction(self.parent.timing_action)
+        timing_menu.addAction("Exportar trace (Chrome)...", lambda: self.parent.export_timings("chrome"))
+        timing_menu.addAction("Exportar resumo JSON...", lambda: self.parent.export_timings("json"))
+        timing_menu.addSeparator()
+        self.parent.profile_action = QAction("Perfilar sessão (cProfile)", timing_menu, checkable=True)
+        self.parent.profile_action.toggled.connect(self.parent.toggle_profiling)
+        timing_menu.addAction(self.parent.profile_action)
+        self.parent.timing_button.setMenu(timing_menu)
+        footer_layout.addWidget(self.parent.timing_button)
 
+        layout.addWidget(self.parent.footer, 0)
         self.setLayout(layout)
 
-    def select_feature_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Selecione o arquivo .feature", "", "Feature Files (*.feature)")
-        if file_path:
-            self.feature_file_path.setText(file_path)
-
-    def save_login_config(self):
-        config = {
-            "login_type": "userpass" if self.radio_userpass.isChecked() else "token",
-            "user": self.user_field.text() if self.radio_userpass.isChecked() else "",
-            "token": self.token_field.text() if self.radio_token.isChecked() else ""
-        }
-        try:
-            with open(LOGIN_CONFIG_PATH, "w", encoding="utf-8") as f:
-                json.dump(config, f)
-        except Exception as e:
-            # Opcional: logar erro
-            pass
-
-    def load_login_config(self):
-        try:
-            with open(LOGIN_CONFIG_PATH, "r", encoding="utf-8") as f:
-                config = json.load(f)
-            if config.get("login_type") == "userpass":
-                self.radio_userpass.setChecked(True)
-                self.user_field.setText(config.get("user", ""))
-                self.token_field.setText("")
-            else:
-                self.radio_token.setChecked(True)
-                self.token_field.setText(config.get("token", ""))
-                self.user_field.setText("")
-        except Exception:
-            pass  # Se não existir, ignora
-
-    def create_xray_test(self):
-        # Salva o login/tipo antes de executar
-        self.save_login_config()
-
-        # Validação
-        if not self.feature_file_path.text():
-            QMessageBox.warning(self, "Aviso", "Selecione um arquivo .feature para criar o teste.")
-            return
-
-        if self.radio_userpass.isChecked():
-            user = self.user_field.text().strip()
-            passwd = self.pass_field.text().strip()
-            if not user or not passwd:
-                QMessageBox.warning(self, "Aviso", "Preencha usuário e senha do Jira.")
-                return
-            auth = f"-u {user}:{passwd}"
-        else:
-            token = self.token_field.text().strip()
-            if not token:
-                QMessageBox.warning(self, "Aviso", "Preencha o token do Jira.")
-                return
-            auth = f"-H \"Authorization: Bearer {token}\""
-
-        # Comando curl de exemplo (ajuste conforme sua API do Xray)
-        feature_file = self.feature_file_path.text()
-        url = "https://seu-jira/rest/raven/2.0/import/feature"
-        if self.radio_userpass.isChecked():
-            cmd = f'curl -X POST {auth} -F "file=@{feature_file}" "{url}"'
-        else:
-            cmd = f'curl -X POST {auth} -F "file=@{feature_file}" "{url}"'
-
-        self.xray_log.append(f"[CMD] {cmd}")
-
-        try:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            self.xray_log.append(result.stdout)
-            if result.stderr:
-                self.xray_log.append(f"[ERRO] {result.stderr}")
-        except Exception as e:
-            self.xray_log.append(f"[EXCEPTION] {e}")
-
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -303,8 +275,40 @@ class MainWindow(QMainWindow):
         # ---------- Estado inicial ----------
         self.dark_mode = True
         self.include_subfolders = False
+        self._delta_ref = DEFAULT_DELTA_REF
+        self._last_output = None  # (caminho, mtime_ns, tamanho, projeto, tags, features) do último .feature gerado
         self.folder = None
         self.all_features = []
+        self.file_results = {}  # caminho -> (features, stats), na ordem da varredura
+        self.scanned_folders = []
+        self.folder_rules = {}  # pasta -> (relativo à raiz, IgnoreRules) da varredura, para o monitor
+        self.file_model = FileListModel(self)
+        self.search_index = FeatureIndex()  # atualizado a cada arquivo parseado
+        self._features_version = 0  # muda sempre que all_features muda (memo do preview)
+        self._scan_worker = None
+        self._scan_started_ns = 0
+        self._profiler = None  # cProfile.Profile da sessão, quando ligado
+        self._duplicate_worker = None
+        self._duplicates = None  # (versão dos features, quase iguais?, grupos) da última análise
+
+        # Preview: textos renderizados ficam em cache; None = visualização geral
+        self.render_cache = RenderCache()
+        self._preview_path = None
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(250)  # debounce enquanto o usuário digita
+        self._preview_timer.timeout.connect(self._refresh_preview)
+
+        # Monitoramento da pasta (desligado até o usuário ativar)
+        self.watch_enabled = False
+        self.folder_watcher = FolderWatcher(self)
+        self.folder_watcher.changed.connect(self._on_folder_changed)
+
+        # Cache de parsing (memória + disco): rescans só parseiam o que mudou
+        try:
+            self.parse_cache = ParseCache(PARSE_CACHE_PATH)
+        except Exception:
+            self.parse_cache = ParseCache()
 
         # Contadores
         self.folder_count = 0
@@ -316,17 +320,22 @@ class MainWindow(QMainWindow):
         self.project_key = ""
         self.tags = ""
 
+        # Tema aplicado antes de criar os widgets: cada um é polido uma vez só
+        self._applied_style = None
+        self.apply_theme()
+
         # --- Abas ---
         self.tabs = QTabWidget()
         self.tabs.setTabPosition(QTabWidget.North)
         self.tabs.setMovable(False)
 
-        # Páginas
+        # Páginas: a do Xray (HTTP, login salvo) só é montada na primeira vez que é aberta
         self.feature_creator_page = FeatureCreatorPage(self)
-        self.xray_test_page = XrayTestPage(self)
+        self._xray_test_page = None
 
         self.tabs.addTab(self.feature_creator_page, "Criar .feature")
-        self.tabs.addTab(self.xray_test_page, "Criar Teste no Xray")
+        self.tabs.addTab(QWidget(), XRAY_TAB_TITLE)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         # --- Botão de tema no topo direito das abas ---
         self.theme_button = QToolButton(self)
@@ -335,9 +344,10 @@ class MainWindow(QMainWindow):
         self.theme_button.setAutoRaise(True)
         self.theme_button.setToolButtonStyle(Qt.ToolButtonIconOnly)
         self.theme_button.setIconSize(QSize(20, 20))
-        self.theme_button.setIcon(QIcon(":/icons/sun.svg") if self.dark_mode else QIcon(":/icons/moon.svg"))
-        self.theme_button.setText("")
         self.theme_button.clicked.connect(self.toggle_theme)
+        self.theme_button.setMinimumSize(28, 28)  # mesmo tamanho antes e depois do ícone
+        # Ícone só depois da primeira pintura: resources_rc (SVGs embutidos) pesa na abertura
+        QTimer.singleShot(0, self._update_theme_icon)
         self.tabs.setCornerWidget(self.theme_button, Qt.TopRightCorner)
 
         # Layout principal da janela
@@ -348,10 +358,33 @@ class MainWindow(QMainWindow):
         container.setLayout(main_layout)
         self.setCentralWidget(container)
 
-        # Tema + sumário inicial
-        self.apply_theme()
+        # Sumário inicial
         self._update_summary()
 
+    # --------- Aba do Xray (montada sob demanda) ---------
+    @property
+    def xray_test_page(self):
+        if self._xray_test_page is None:
+            from ui.xray_page import XrayTestPage
+
+            self._xray_test_page = XrayTestPage(self)
+            index = self.tabs.count() - 1
+            current = self.tabs.currentIndex()
+            self.tabs.blockSignals(True)  # trocar o widget da aba não é troca de aba
+            try:
+                placeholder = self.tabs.widget(index)
+                self.tabs.removeTab(index)
+                self.tabs.insertTab(index, self._xray_test_page, XRAY_TAB_TITLE)
+                self.tabs.setCurrentIndex(current)
+            finally:
+                self.tabs.blockSignals(False)
+            placeholder.deleteLater()
+        return self._xray_test_page
+
+    def _on_tab_changed(self, index):
+        if index == self.tabs.count() - 1 and self._xray_test_page is None:
+            self.xray_test_page  # monta a página no lugar do placeholder
+
     # --------- Funções herdadas da página de criação de feature ---------
     def _update_summary(self):
         if hasattr(self, "lblSummary"):
@@ -360,125 +393,517 @@ class MainWindow(QMainWindow):
                 f"Features: {self.feature_count} • Cenários: {self.scenario_count}"
             )
 
+    # --------- Medição de desempenho ---------
+    def toggle_timing(self, enabled):
+        TRACER.enable(enabled)
+        TRACER.reset()
+        self.lblTimings.setVisible(enabled)
+        self.lblTimings.clear()
+        self.log_output.append(
+            "[INFO] Medição de fases ligada: os tempos aparecem no rodapé após cada execução."
+            if enabled else "[INFO] Medição de fases desligada."
+        )
+
+    def _show_timings(self, run):
+        text = TRACER.format_summary(TIMING_PHASES)
+        self.lblTimings.setText(text)
+        self.lblTimings.setToolTip(TRACER.format_summary(separator="\n"))
+        self.log_output.append(f"[INFO] Tempos ({run}): {text}")
+
+    def export_timings(self, kind):
+        if not TRACER.summary():
+            QMessageBox.information(self, "Tempos", "Nada medido ainda. Ligue 'Medir fases' e rode uma varredura.")
+            return
+        if kind == "chrome":
+            path, _ = QFileDialog.getSaveFileName(self, "Exportar trace", "trace.json", "Trace (*.json)")
+        else:
+            path, _ = QFileDialog.getSaveFileName(self, "Exportar resumo", "tempos.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            count = TRACER.export_chrome(path) if kind == "chrome" else TRACER.export_json(path)
+            self.log_output.append(f"[OK] {count} registro(s) de tempo exportados em {path}")
+        except OSError as e:
+            self.log_output.append(f"[ERRO] Falha ao exportar tempos: {e}")
+
+    def toggle_profiling(self, enabled):
+        import cProfile  # só quando o usuário pede
+
+        if enabled:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            self.log_output.append("[INFO] cProfile ligado (thread da interface). Desligue para salvar o perfil.")
+            return
+
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+        profiler.disable()
+
+        import io
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(15)
+        self.log_output.append("[INFO] cProfile (15 maiores tempos acumulados):\n" + out.getvalue().strip())
+
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar perfil", "sessao.prof", "Perfil cProfile (*.prof)")
+        if path:
+            profiler.dump_stats(path)
+            self.log_output.append(f"[OK] Perfil salvo em {path} (abra com pstats ou snakeviz)")
+
+    # --------- Duplicados ---------
+    def find_duplicates(self, near=False):
+        if not self.all_features:
+            QMessageBox.warning(self, "Aviso", "Nenhum feature carregado para analisar.")
+            return
+        if self._duplicate_worker is not None:
+            return
+        from ui.duplicate_worker import DuplicateWorker
+
+        version = self._features_version
+        worker = DuplicateWorker(self.all_features, near)
+        worker.signals.log.connect(self.log_output.append)
+        worker.signals.finished.connect(lambda result: self._on_duplicates_found(result, version, near))
+        self._duplicate_worker = worker
+        self.duplicates_button.setEnabled(False)
+        self.log_output.append(
+            "[INFO] Procurando duplicados exatos e quase iguais..." if near else "[INFO] Procurando duplicados..."
+        )
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_duplicates_found(self, result, version, near):
+        self._duplicate_worker = None
+        self.duplicates_button.setEnabled(True)
+        if result is None:
+            return
+        clusters, seconds = result
+        self._duplicates = (version, near, clusters)
+
+        if not clusters:
+            self.log_output.append(f"[OK] Nenhum duplicado encontrado ({seconds:.1f} s).")
+            return
+        copies = sum(len(cluster) - 1 for cluster in clusters)
+        self.log_output.append(
+            f"[WARN] {len(clusters)} grupo(s) de duplicados, {copies} cópia(s) a mais ({seconds:.1f} s):"
+        )
+        labels = {"feature": "Feature", "scenario": "Cenário"}
+        for cluster in clusters[:MAX_REPORTED_DUPLICATES]:
+            label = labels.get(cluster.kind) or f"Cenário parecido ({cluster.similarity:.0%})"
+            places = ", ".join(f"{self._display_path(m.source)}:{m.line}" for m in cluster.members)
+            self.log_output.append(f"    {label} ×{len(cluster)} \"{cluster.members[0].title}\": {places}")
+        if len(clusters) > MAX_REPORTED_DUPLICATES:
+            self.log_output.append(f"    ... e mais {len(clusters) - MAX_REPORTED_DUPLICATES} grupo(s)")
+        if not self.collapse_action.isChecked():
+            self.log_output.append("[INFO] Ligue 'Duplicados → Colapsar duplicados ao gerar' para gravar só uma cópia.")
+
+    def _display_path(self, path):
+        # Caminho curto para o log: relativo à pasta, ou o caminho dentro do artefato
+        if not path or not self.folder:
+            return path
+        _, member = split_member(path)
+        if member is not None:
+            return member
+        return os.path.relpath(path, self.folder)
+
+    def output_features(self):
+        """
+        Features a gravar/enviar: todos, ou sem as cópias com 'Colapsar duplicados'
+        ligado. Usa os grupos da última análise se os features não mudaram desde
+        então; senão procura só os exatos (rápido).
+        """
+        if not self.collapse_action.isChecked():
+            return self.all_features
+        from core.duplicates import collapse, find_exact
+
+        if self._duplicates is not None and self._duplicates[0] == self._features_version:
+            clusters = self._duplicates[2]
+        else:
+            clusters = find_exact(self.all_features)
+            self._duplicates = (self._features_version, False, clusters)
+        if not clusters:
+            return self.all_features
+
+        features = collapse(self.all_features, clusters)
+        before = sum(f.scenario_count for f in self.all_features)
+        after = sum(f.scenario_count for f in features)
+        self.log_output.append(
+            f"[INFO] Duplicados colapsados: {len(self.all_features)} → {len(features)} Feature(s), "
+            f"{before} → {after} Cenário(s)"
+        )
+        return features
+
     def toggle_subfolders(self, state: int):
         self.include_subfolders = (state == Qt.Checked)
         if hasattr(self, "log_output"):
             self.log_output.append(f"[INFO] Incluir subpastas: {self.include_subfolders}")
 
     def _apply_project_and_tags(self, features):
-        features_with_project_and_tags = []
-        for feature in features:
-            lines = feature.splitlines()
-            new_lines = []
-            if self.project_key:
-                new_lines.append(self.project_key)
-            for line in lines:
-                if line.strip().lower().startswith("scenario") and self.tags:
-                    new_lines.append(self.tags)
-                new_lines.append(line)
-            features_with_project_and_tags.append("\n".join(new_lines))
-        return features_with_project_and_tags
+        return self.render_cache.render_all(features, self.project_key, self.tags)
+
+    def _render_feature(self, feature):
+        return self.render_cache.render(feature, self.project_key, self.tags)
 
     def select_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Selecione a pasta com arquivos .robot")
         if folder:
-            self.file_list.clear()
-            self.folder = folder
-            self.all_features.clear()
-            self.back_button.setVisible(False)
-
-            self.folder_count = 0
-            self.file_count = 0
-            self.feature_count = 0
-            self.scenario_count = 0
-            self._update_summary()
-
-            self.log_output.append(f"[INFO] Pasta selecionada: {folder}")
+            self._open_source(folder)
 
-            if self.include_subfolders:
-                for root, dirs, files in os.walk(folder):
-                    self.folder_count += 1
-                    for file in files:
-                        self.file_count += 1
-                        if file.lower().endswith(".robot"):
-                            full_path = os.path.join(root, file)
-                            self._process_file(full_path)
-            else:
-                self.folder_count = 1
-                for file in os.listdir(folder):
-                    self.file_count += 1
-                    if file.lower().endswith(".robot"):
-                        full_path = os.path.join(folder, file)
-                        self._process_file(full_path)
-
-            if self.all_features:
-                preview_text = "\n\n---\n\n".join(self._apply_project_and_tags(self.all_features))
-            else:
-                preview_text = "Nenhum bloco de Feature encontrado nos arquivos."
-            self.preview.setPlainText(preview_text)
+    def select_archive(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Selecione o artefato com arquivos .robot", "",
+            "Artefatos (*.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.tbz2 *.tar.xz *.txz)"
+        )
+        if path:
+            self._open_source(path)
+
+    def _open_source(self, folder):
+        # `folder` é uma pasta ou um artefato (.zip/.tar); os membros viram "artefato!/caminho"
+        self.folder_watcher.stop()
+        self.file_model.clear()
+        self.folder = folder
+        self.all_features.clear()
+        self.file_results.clear()
+        self.search_index.clear()
+        self._features_version += 1
+        self._preview_path = None
+        self._last_output = None
+        self.back_button.setVisible(False)
+        self.preview.clear()
 
-            self.log_output.append("\n[RESUMO FINAL]")
-            self.log_output.append(f"- Total de pastas analisadas: {self.folder_count}")
-            self.log_output.append(f"- Total de arquivos .robot: {self.file_count}")
-            self.log_output.append(f"- Total de Features extraídas: {self.feature_count}")
-            self.log_output.append(f"- Total de Cenários extraídos: {self.scenario_count}\n")
+        self.folder_count = 0
+        self.file_count = 0
+        self.feature_count = 0
+        self.scenario_count = 0
+        self._update_summary()
 
+        label = "Artefato selecionado" if is_archive(folder) else "Pasta selecionada"
+        self.log_output.append(f"[INFO] {label}: {folder}")
+        self._start_scan(folder)
+
+    def _start_scan(self, folder):
+        # A varredura roda no pool de threads; os resultados chegam em lotes
+        self.parse_cache.reset_stats()
+        if TRACER.enabled:
+            TRACER.reset()  # os tempos exibidos são sempre da última execução
+        self._scan_started_ns = time.perf_counter_ns()
+        self._scan_worker = ScanWorker(folder, self.include_subfolders, self.parse_cache)
+        self._scan_worker.signals.batch.connect(self._on_scan_batch)
+        self._scan_worker.signals.finished.connect(self._on_scan_finished)
+
+        self._set_scanning(True)
+        QThreadPool.globalInstance().start(self._scan_worker)
+
+    def _set_scanning(self, scanning):
+        self.feature_creator_page.folder_button.setEnabled(not scanning)
+        self.feature_creator_page.archive_button.setEnabled(not scanning)
+        self.generate_button.setEnabled(not scanning)
+        self.scan_progress.setVisible(scanning)
+        self.cancel_scan_button.setVisible(scanning)
+
+    def cancel_scan(self):
+        if self._scan_worker is not None:
+            self._scan_worker.cancel()
+            self.log_output.append("[INFO] Cancelando varredura...")
+
+    def _is_current_scan(self):
+        # Ignora sinais de uma varredura que já foi cancelada/substituída
+        worker = self._scan_worker
+        return worker is not None and self.sender() is worker.signals
+
+    def _on_scan_batch(self, results, terms, folder_count, file_count):
+        if not self._is_current_scan():
+            return
+        with span("ui.lotes"):
+            self.folder_count = folder_count
+            self.file_count = file_count
+            for (full_path, features, stats, error), file_terms in zip(results, terms):
+                self._process_file(full_path, features, stats, error, file_terms)
+            # Uma única inserção no modelo por lote
+            self.file_model.add_files([(path, stats, error) for path, _, stats, error in results])
             self._update_summary()
 
-    def _process_file(self, full_path):
-        self.file_list.addItem(full_path)
-        try:
-            features, stats = parse_robot_file(full_path)
+    def _on_scan_finished(self, summary):
+        if not self._is_current_scan():
+            return
+        self._scan_worker = None
+        self.folder_count = summary["folders"]
+        self.file_count = summary["files"]
+        self.scanned_folders = summary["visited"]
+        self.folder_rules = summary["folder_rules"]
+        self._set_scanning(False)
+
+        if summary["error"]:
+            self.log_output.append(f"[ERRO] Falha ao varrer {self.folder}: {summary['error']}")
+        if summary["cancelled"]:
+            self.log_output.append("[WARN] Varredura cancelada; resultados parciais.")
+
+        self.show_overall_preview()
+        self.search_panel.refresh()
+
+        self.log_output.append("\n[RESUMO FINAL]")
+        self.log_output.append(f"- Total de pastas analisadas: {self.folder_count}")
+        self.log_output.append(f"- Total de arquivos .robot: {self.file_count}")
+        self.log_output.append(f"- Pastas/arquivos ignorados: {summary['skipped']}")
+        self.log_output.append(f"- Total de Features extraídas: {self.feature_count}")
+        self.log_output.append(f"- Total de Cenários extraídos: {self.scenario_count}")
+        self.log_output.append(
+            f"- Cache: {summary['cache_hits']} acerto(s), {summary['cache_misses']} falta(s)\n"
+        )
 
-            if features:
-                self.all_features.extend(features)
-                self.feature_count += stats["features"]
-                self.scenario_count += stats["scenarios"]
+        self._update_summary()
+        if self.watch_enabled:
+            self._start_watching()
+
+        if TRACER.enabled:
+            TRACER.add("varredura", self._scan_started_ns, time.perf_counter_ns())
+            self._show_timings("varredura")
+
+    # --------- Monitoramento incremental ---------
+    def toggle_watch(self, checked):
+        self.watch_enabled = checked
+        if checked:
+            if self.folder and self._scan_worker is None:
+                self._start_watching()
+        else:
+            self.folder_watcher.stop()
+            self.log_output.append("[INFO] Monitoramento desativado.")
 
-                self.log_output.append(
-                    f"[OK] {os.path.basename(full_path)} → "
-                    f"{stats['features']} Feature(s), {stats['scenarios']} Cenário(s)"
-                )
-            else:
-                self.log_output.append(f"[WARN] Nenhum Feature encontrado em {full_path}")
+    def _start_watching(self):
+        if is_archive(self.folder):
+            self.log_output.append("[INFO] Monitoramento não se aplica a artefatos; reabra o arquivo para atualizar.")
+            return
+        self.folder_watcher.watch(self.scanned_folders, list(self.file_results))
+        self.log_output.append(
+            f"[INFO] Monitorando {len(self.folder_watcher.directories())} pasta(s) em {self.folder}"
+        )
+
+    def _ignored_by_scan(self, path, is_dir):
+        # Mesmas regras (padrões + .gitignore) que a varredura aplicou na pasta-mãe
+        parent = self.folder_rules.get(os.path.dirname(path))
+        if parent is None:
+            return True  # fora das pastas varridas
+        rel, rules = parent
+        name = os.path.basename(path)
+        return rules.ignored(f"{rel}/{name}" if rel else name, is_dir)
+
+    def _robot_files_in(self, folder):
+        # Pasta nova: passa a ser observada e entra inteira no lote (com as subpastas),
+        # filtrada como a varredura faria, inclusive pelo .gitignore dela
+        found = []
+        parent_rel, parent_rules = self.folder_rules[os.path.dirname(folder)]
+        name = os.path.basename(folder)
+        rel = f"{parent_rel}/{name}" if parent_rel else name
+        self.folder_rules[folder] = (rel, folder_ignore_rules(folder, rel, parent_rules))
+        self.folder_watcher.add_directory(folder)
+        try:
+            entries = sorted(os.scandir(folder), key=lambda e: e.name)
+        except OSError:
+            return found
+        for entry in entries:
+            path = os.path.join(folder, entry.name)
+            if entry.is_file() and entry.name.lower().endswith(".robot"):
+                if not self._ignored_by_scan(path, False):
+                    found.append(path)
+            elif entry.is_dir() and not self._ignored_by_scan(path, True):
+                found.extend(self._robot_files_in(path))
+        return found
+
+    def _on_folder_changed(self, paths):
+        if self.folder is None or self._scan_worker is not None:
+            return
+        with span("monitor"):
+            self._apply_folder_changes(paths)
+
+    def _apply_folder_changes(self, paths):
+
+        # 1) O watcher já compara as listagens: chegam só .robot novos, alterados ou
+        #    removidos, e subpastas novas; o que a varredura ignoraria fica de fora
+        changed = set()
+        for path in paths:
+            if not os.path.isdir(path):
+                if path in self.file_results or not self._ignored_by_scan(path, False):
+                    changed.add(path)
+            elif self.include_subfolders and not self._ignored_by_scan(path, True):
+                changed.update(self._robot_files_in(path))
+
+        # 2) Reparseia só esses arquivos e corrige as entradas no lugar
+        updated, removed = [], []
+        for path in sorted(changed):
+            old = self.file_results.get(path)
+            if not os.path.isfile(path):
+                if old is not None:
+                    del self.file_results[path]
+                    self.parse_cache.discard(path)
+                    removed.append(path)
+                continue
+            try:
+                features, stats = self.parse_cache.parse(path)
+            except Exception as e:
+                self.log_output.append(f"[ERRO] Falha ao parsear {path}: {e}")
+                features, stats = [], {"features": 0, "scenarios": 0}
+            if old is None:
+                self.file_model.add_files([(path, stats, None)])
+                self.file_count += 1
+            elif [f.to_data() for f in old[0]] == [f.to_data() for f in features]:
+                continue
+            self.file_results[path] = (features, stats)
+            self.file_model.update_file(path, stats)
+            updated.append(path)
+
+        # Editores que salvam via rename fazem o watcher "perder" o arquivo
+        self.folder_watcher.add_files([p for p in changed if p in self.file_results])
+
+        if not updated and not removed:
+            return
+
+        for path in removed:
+            self.file_model.remove_file(path)
+            self.search_index.remove_file(path)
+            self.file_count -= 1
+            self.log_output.append(f"[INFO] Removido: {path}")
+        for path in updated:
+            features, stats = self.file_results[path]
+            self.search_index.update_file(path, features)
+            self.log_output.append(
+                f"[OK] Atualizado: {os.path.basename(path)} → "
+                f"{stats['features']} Feature(s), {stats['scenarios']} Cenário(s)"
+            )
 
+        self._rebuild_features()
+        self._update_summary()
+        self.search_panel.refresh()
+
+        # Atualiza o preview que estiver aberto
+        if self._preview_path is None or self._preview_path in removed:
+            # Arquivo do preview apagado: volta para a visão geral (limpa a seleção)
+            self.show_overall_preview()
+        elif self._preview_path in updated:
+            self._show_file_preview(self._preview_path)
+
+    def _rebuild_features(self):
+        self._features_version += 1
+        self.all_features = [f for features, _ in self.file_results.values() for f in features]
+        self.feature_count = sum(stats["features"] for _, stats in self.file_results.values())
+        self.scenario_count = sum(stats["scenarios"] for _, stats in self.file_results.values())
+
+    def _process_file(self, full_path, features, stats, error, terms=None):
+        self.file_results[full_path] = (features, stats)
+        # Termos já tokenizados pelo ScanWorker: aqui só entram nas listas do índice
+        self.search_index.update_file(full_path, features, terms)
+        if error:
+            self.log_output.append(f"[ERRO] Falha ao parsear {full_path}: {error}")
+        elif features:
+            self.all_features.extend(features)
+            self._features_version += 1
+            self.feature_count += stats["features"]
+            self.scenario_count += stats["scenarios"]
+
+            self.log_output.append(
+                f"[OK] {os.path.basename(full_path)} → "
+                f"{stats['features']} Feature(s), {stats['scenarios']} Cenário(s)"
+            )
+        else:
+            self.log_output.append(f"[WARN] Nenhum Feature encontrado em {full_path}")
+
+    def _on_search_hit(self, hit):
+        # Abre o arquivo do resultado e leva o preview até a linha encontrada
+        row = self.file_model.row_of(hit.path)
+        if row < 0 and self.file_filter.text():
+            self.file_filter.clear()
+            row = self.file_model.row_of(hit.path)
+        if row >= 0:
+            self.file_list.setCurrentIndex(self.file_model.index(row, 0))
+        self._show_file_preview(hit.path)
+
+        features = self.file_results.get(hit.path, ([], None))[0]
+        position = next((i for i, f in enumerate(features) if f.line == hit.feature.line), None)
+        if position is not None:
+            self.preview.jump_to(position, hit.text)
+        self.log_output.append(f"[INFO] Busca: {hit.path}:{hit.line}")
+
+    def generate_filtered_feature(self, query):
+        features = self.search_index.filter_features(query, self.all_features)
+        if not features:
+            QMessageBox.warning(self, "Aviso", "Nenhum feature corresponde à busca.")
+            return
+        default = os.path.join(source_folder(self.folder or ""), "combined_filtrado.feature")
+        output_path, _ = QFileDialog.getSaveFileName(self, "Salvar .feature filtrado", default, "Feature Files (*.feature)")
+        if not output_path:
+            return
+        try:
+            count = write_features(output_path, features, self.project_key, self.tags)
+            scenarios = sum(f.scenario_count for f in features)
+            self.log_output.append(
+                f"[OK] .feature filtrado por \"{query.strip()}\": {count} Feature(s), {scenarios} Cenário(s) em {output_path}"
+            )
         except Exception as e:
-            self.log_output.append(f"[ERRO] Falha ao parsear {full_path}: {e}")
+            QMessageBox.critical(self, "Erro", f"Falha ao salvar arquivo: {e}")
+            self.log_output.append(f"[ERRO] Falha ao salvar arquivo: {e}")
 
-    def show_preview(self, item):
-        file_path = item.text()
+    def show_preview(self, index):
+        self._show_file_preview(self.file_model.path_at(index.row()))
+
+    def _show_file_preview(self, file_path):
+        self._preview_path = file_path
         try:
-            features, _ = parse_robot_file(file_path)
+            features, _ = self.parse_cache.parse(file_path)
             if features:
-                preview_text = "\n\n---\n\n".join(self._apply_project_and_tags(features))
+                self.preview.set_features(
+                    features, self._render_feature, nav_key=("file", file_path, self._features_version)
+                )
             else:
-                preview_text = "Nenhum bloco de Feature encontrado neste arquivo."
+                self.preview.setPlainText("Nenhum bloco de Feature encontrado neste arquivo.")
         except Exception as e:
-            preview_text = f"[ERRO] Falha ao parsear {file_path}: {e}"
-        self.preview.setPlainText(preview_text)
+            self.preview.setPlainText(f"[ERRO] Falha ao parsear {file_path}: {e}")
         self.back_button.setVisible(True)
 
     def show_overall_preview(self):
+        self._preview_path = None
         self.file_list.clearSelection()
         if self.all_features:
-            preview_text = "\n\n---\n\n".join(self._apply_project_and_tags(self.all_features))
+            # Só a janela visível é renderizada (e só o que não está no cache)
+            self.preview.set_features(
+                self.all_features, self._render_feature, nav_key=("all", self._features_version)
+            )
         else:
-            preview_text = "Nenhum bloco de Feature encontrado nos arquivos."
-        self.preview.setPlainText(preview_text)
+            self.preview.setPlainText("Nenhum bloco de Feature encontrado nos arquivos.")
         self.back_button.setVisible(False)
 
+    def _refresh_preview(self):
+        if self.folder is None or self._scan_worker is not None:
+            return
+        if self._preview_path is None:
+            self.show_overall_preview()
+        else:
+            self._show_file_preview(self._preview_path)
+
     def _on_project_changed(self, text):
         self.project_key = text.strip()
+        self._preview_timer.start()
 
     def _on_tags_changed(self, text):
         self.tags = text.strip()
+        self._preview_timer.start()
 
     def reset_all(self):
-        self.file_list.clear()
+        if self._scan_worker is not None:
+            self._scan_worker.cancel()
+            self._scan_worker = None
+            self._set_scanning(False)
+        self.folder_watcher.stop()
+        self.file_model.clear()
+        self.file_filter.clear()
         self.preview.clear()
         self.log_output.clear()
         self.folder = None
         self.all_features.clear()
+        self.search_index.clear()
+        self.search_panel.clear()
+        self.file_results.clear()
+        self._features_version += 1
+        self._preview_path = None
+        self._duplicates = None
+        self.render_cache.clear()
         self.project_input.clear()
         self.tags_input.clear()
         self.project_key = ""
@@ -511,221 +936,237 @@ class MainWindow(QMainWindow):
                 self.log_output.append("[INFO] Geração de arquivo cancelada pelo usuário.")
                 return
 
-        output_path = os.path.join(self.folder, "combined.feature")
-        try:
-            features_with_project_and_tags = self._apply_project_and_tags(self.all_features)
+        features = self.output_features()
+        mode = self.output_mode.currentData()
+        if mode != MODE_COMBINED:
+            self._generate_split(mode, features)
+            return
 
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write("\n\n".join(features_with_project_and_tags))
+        output_path = os.path.join(source_folder(self.folder), "combined.feature")
+        try:
+            # Grava em streaming: um feature por vez, sem montar o texto completo
+            with span("gravação"):
+                write_features(output_path, features, self.project_key, self.tags)
+            self._remember_output(output_path, features)
+            if TRACER.enabled:
+                self._show_timings("geração")
 
             QMessageBox.information(self, "Sucesso", f"Arquivo salvo em:\n{output_path}")
             self.log_output.append(f"[OK] Arquivo .feature gerado em {output_path}")
 
-            # Abre no explorador
-            if sys.platform == "win32":
-                # Garante que o path está com barras invertidas
-                output_path_win = os.path.normpath(output_path)
-                subprocess.Popen(f'explorer /select,"{output_path_win}"')
-            elif sys.platform == "darwin":
-                subprocess.Popen(["open", "-R", output_path])
-            else:
-                subprocess.Popen(["xdg-open", os.path.dirname(output_path)])
+            self._reveal(output_path)
 
-            # --- Integração com a página Xray ---
-            reply = QMessageBox.question(
-                self,
-                "Criar Teste no Xray",
-                "Deseja criar os testes no Jira Xray usando este arquivo agora?",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.Yes
-            )
-            if reply == QMessageBox.Yes:
-                # Troca para a aba Xray
-                self.tabs.setCurrentWidget(self.xray_test_page)
-                # Preenche o campo do arquivo .feature na página Xray
-                self.xray_test_page.feature_file_path.setText(output_path)
-                # Carrega login salvo
-                self.xray_test_page.load_login_config()
-                # Checa se já há login/token salvo
-                login_type = None
-                user_ok = False
-                token_ok = False
-                try:
-                    with open(LOGIN_CONFIG_PATH, "r", encoding="utf-8") as f:
-                        config = json.load(f)
-                    login_type = config.get("login_type")
-                    if login_type == "userpass":
-                        user_ok = bool(config.get("user"))
-                    elif login_type == "token":
-                        token_ok = bool(config.get("token"))
-                except Exception:
-                    pass
-
-                if (login_type == "userpass" and user_ok) or (login_type == "token" and token_ok):
-                    # Executa automaticamente a criação do teste
-                    self.xray_test_page.create_xray_test()
-                # Senão, só deixa o arquivo preenchido e espera o usuário
+            self._offer_xray_import(output_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Falha ao salvar arquivo: {e}")
+            self.log_output.append(f"[ERRO] Falha ao salvar arquivo: {e}")
+
+    def _remember_output(self, output_path, features):
+        # O import do arquivo no Xray consulta o histórico com estes features
+        st = os.stat(output_path)
+        self._last_output = (output_path, st.st_mtime_ns, st.st_size, self.project_key, self.tags, list(features))
+
+    def generated_features(self, path):
+        """
+        Features gravados em `path` pelo último "Gerar .feature"/"Delta (git)", ou None
+        se o arquivo não foi gerado aqui, mudou desde então ou se Projeto/Tags do
+        formulário não são mais os usados na gravação (o histórico é chaveado por eles).
+        """
+        if self._last_output is None:
+            return None
+        output_path, mtime_ns, size, project_key, tags, features = self._last_output
+        if (project_key, tags) != (self.project_key, self.tags):
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if os.path.normcase(os.path.abspath(path)) != os.path.normcase(os.path.abspath(output_path)):
+            return None
+        return features if (st.st_mtime_ns, st.st_size) == (mtime_ns, size) else None
+
+    def _offer_xray_import(self, output_path):
+        # --- Integração com a página Xray ---
+        reply = QMessageBox.question(
+            self,
+            "Criar Teste no Xray",
+            "Deseja criar os testes no Jira Xray usando este arquivo agora?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        if reply == QMessageBox.Yes:
+            # Troca para a aba Xray
+            self.tabs.setCurrentWidget(self.xray_test_page)
+            # Preenche o campo do arquivo .feature na página Xray
+            self.xray_test_page.feature_file_path.setText(output_path)
+            # Carrega login salvo
+            self.xray_test_page.load_login_config(keep_url=True)
+            if self.xray_test_page.has_saved_login():
+                # Executa automaticamente a criação do teste
+                self.xray_test_page.create_xray_test()
+            # Senão, só deixa o arquivo preenchido e espera o usuário
+
+    def generate_delta(self):
+        """
+        .feature só com os features novos/alterados desde `ref` (merge-base com a
+        branch atual). Só os .robot que o git aponta como alterados são parseados.
+        """
+        from core.git_delta import GitError, affected_features, base_contents, changed_robot_files
+
+        folder = self.folder
+        if not folder or is_archive(folder):
+            folder = QFileDialog.getExistingDirectory(self, "Selecione a pasta (repositório git) com arquivos .robot")
+            if not folder:
+                return
+        ref, ok = QInputDialog.getText(
+            self, "Delta (git)", "Comparar com (branch, tag ou commit):", text=self._delta_ref
+        )
+        ref = ref.strip()
+        if not ok or not ref:
+            return
+        self._delta_ref = ref
 
+        try:
+            with span("delta"):
+                delta = changed_robot_files(folder, ref, self.include_subfolders)
+                results = []
+                for path in delta.changed:
+                    try:
+                        features, stats = self.parse_cache.parse(path)
+                        results.append((path, features, stats, None))
+                    except Exception as e:
+                        self.log_output.append(f"[ERRO] Falha ao parsear {path}: {e}")
+                gone = [(os.path.join(delta.root, *path.split("/")), [], None, None) for path in delta.deleted]
+                old_contents = base_contents(delta, [path for path, *_ in results + gone])
+                features, removed = affected_features(results + gone, old_contents)
+        except GitError as e:
+            QMessageBox.critical(self, "Erro", f"Falha ao consultar o git:\n{e}")
+            self.log_output.append(f"[ERRO] git: {e}")
+            return
+
+        self.log_output.append(
+            f"[INFO] Delta desde {ref} ({delta.base[:10]}): {len(delta.changed)} .robot alterado(s), "
+            f"{len(delta.deleted)} removido(s)"
+        )
+        for path in delta.changed:
+            self.log_output.append(f"[INFO]   alterado: {delta.relative(path)}")
+        for path in delta.deleted:
+            self.log_output.append(f"[INFO]   removido: {path}")
+        if removed:
+            self.log_output.append(f"[INFO] {removed} Feature(s) da base não existem mais")
+        if not features:
+            QMessageBox.information(self, "Delta (git)", f"Nenhum feature alterado desde {ref}.")
+            self.log_output.append(f"[INFO] Nenhum feature alterado desde {ref}.")
+            return
+
+        output_path = os.path.join(folder, DELTA_FILE_NAME)
+        try:
+            with span("gravação"):
+                count = write_features(output_path, features, self.project_key, self.tags)
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Falha ao salvar arquivo: {e}")
             self.log_output.append(f"[ERRO] Falha ao salvar arquivo: {e}")
+            return
+        self._remember_output(output_path, features)
+        if TRACER.enabled:
+            self._show_timings("delta")
+
+        scenarios = sum(f.scenario_count for f in features)
+        message = f"{count} Feature(s) alterado(s), {scenarios} Cenário(s) em {output_path}"
+        self.log_output.append(f"[OK] Delta: {message}")
+        QMessageBox.information(self, "Sucesso", message)
+        self._offer_xray_import(output_path)
+
+    def _generate_split(self, mode, features):
+        output_dir = os.path.join(source_folder(self.folder), SPLIT_FOLDER)
+        if mode == MODE_PER_FILE:
+            shards = iter_per_file(features, self.folder, self.project_key, self.tags, self.render_cache)
+        else:
+            shards = iter_sized(
+                features, self.project_key, self.tags, self.render_cache, max_bytes=SHARD_MAX_BYTES
+            )
+        try:
+            with span("gravação"):
+                result = write_shards(output_dir, shards)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Falha ao salvar arquivos: {e}")
+            self.log_output.append(f"[ERRO] Falha ao salvar arquivos: {e}")
+            return
+        if TRACER.enabled:
+            self._show_timings("geração")
+
+        removed = f", {len(result.removed)} removido(s)" if result.removed else ""
+        message = (f"{result.total} arquivo(s) .feature em {output_dir}: "
+                   f"{len(result.written)} gravado(s), {len(result.unchanged)} sem mudança{removed}")
+        self.log_output.append(f"[OK] {message}")
+        QMessageBox.information(self, "Sucesso", message)
+        try:
+            self._reveal(output_dir)
+        except Exception as e:
+            self.log_output.append(f"[WARN] Não foi possível abrir a pasta: {e}")
+
+        # Com a saída dividida, o caminho para o Xray é o envio em lotes
+        reply = QMessageBox.question(
+            self,
+            "Criar Teste no Xray",
+            "Deseja enviar as features ao Jira Xray em lotes agora?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        if reply == QMessageBox.Yes:
+            self.tabs.setCurrentWidget(self.xray_test_page)
+            self.xray_test_page.load_login_config(keep_url=True)
+            if self.xray_test_page.has_saved_login():
+                self.xray_test_page.create_xray_batches()
+
+    def _reveal(self, output_path):
+        # Abre no explorador
+        import subprocess
+
+        if sys.platform == "win32":
+            # Garante que o path está com barras invertidas
+            output_path_win = os.path.normpath(output_path)
+            subprocess.Popen(f'explorer /select,"{output_path_win}"')
+        elif sys.platform == "darwin":
+            subprocess.Popen(["open", "-R", output_path])
+        else:
+            subprocess.Popen(["xdg-open", os.path.dirname(output_path)])
 
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
         self.apply_theme()
-        self._update_theme_icon()
 
     def _update_theme_icon(self):
         if isinstance(self.theme_button, QToolButton):
+            import resources_rc  # noqa: F401 (registra os ícones no primeiro uso)
+
             self.theme_button.setIcon(QIcon(":/icons/sun.svg") if self.dark_mode else QIcon(":/icons/moon.svg"))
             self.theme_button.setText("")
 
     def apply_theme(self):
-        app = QApplication.instance()
-        app.setStyleSheet("")  # Limpa o estilo anterior
-
-        if self.dark_mode:
-            style = """
-                QMainWindow, QWidget { background-color: #121212; color: #ffffff; }
-                QLabel { color: #ffffff; }
-
-                QPushButton {
-                    background-color: #333333;
-                    color: #ffffff;
-                    border-radius: 6px;
-                    padding: 6px 10px;
-                    border: 1px solid #4a4a4a;
-                }
-                QPushButton:hover { background-color: #444444; }
-
-                QListWidget, QTextEdit, QLineEdit {
-                    background-color: #1e1e1e;
-                    color: #ffffff;
-                    border: 1px solid #2a2a2a;
-                }
-
-                QPushButton#btnSubfolders {
-                    background: #2c2c2c;
-                    border: 1px solid #4a4a4a;
-                    color: #ffffff;
-                }
-                QPushButton#btnSubfolders:hover { background: #3a3a3a; }
-                QPushButton#btnSubfolders:checked {
-                    background: #2d7d46;
-                    color: #ffffff;
-                    border-color: #2d7d46;
-                }
-                QPushButton#btnSubfolders:checked:hover { background: #2f8b4f; }
-
-                QToolButton#btnTheme {
-                    border: none;
-                    padding: 4px;
-                    margin: 2px;
-                    border-radius: 6px;
-                }
-                QToolButton#btnTheme:hover { background: rgba(255,255,255,0.08); }
-
-                QFrame#footerBar {
-                    background-color: #121212;
-                    border-top: 1px solid #2a2a2a;
-                }
-                QLabel#lblSummary { color: #aaaaaa; }
-
-                QSplitter#mainSplitter::handle {
-                    background-color: #1b1b1b;
-                    border: none;
-                    margin: 0;
-                }
-                QSplitter#mainSplitter::handle:horizontal {
-                    width: 8px;
-                    border-left: 1px solid rgba(255,255,255,0.06);
-                    background-clip: padding;
-                }
-                QSplitter#mainSplitter::handle:horizontal:hover {
-                    background-color: #252525;
-                    border-left-color: rgba(255,255,255,0.14);
-                }
-                QSplitter#mainSplitter::handle:horizontal:pressed {
-                    background-color: #2a2a2a;
-                    border-left-color: rgba(255,255,255,0.18);
-                }
-            """
-        else:
-            style = """
-                QMainWindow, QWidget { background-color: #f7f7f7; color: #222222; }
-                QLabel { color: #222222; }
-
-                QPushButton {
-                    background-color: #ffffff;
-                    color: #222222;
-                    border-radius: 6px;
-                    padding: 6px 10px;
-                    border: 1px solid #bdbdbd;
-                }
-                QPushButton:hover { background-color: #f0f0f0; }
-
-                QListWidget, QTextEdit, QLineEdit {
-                    background-color: #ffffff;
-                    color: #222222;
-                    border: 1px solid #dcdcdc;
-                }
-
-                QPushButton#btnSubfolders {
-                    background: #f6f6f6;
-                    border: 1px solid #bdbdbd;
-                    color: #333333;
-                }
-                QPushButton#btnSubfolders:hover { background: #eeeeee; }
-                QPushButton#btnSubfolders:checked {
-                    background: #2d7d46;
-                    color: #ffffff;
-                    border-color: #2d7d46;
-                }
-                QPushButton#btnSubfolders:checked:hover { background: #2f8b4f; }
-
-                QToolButton#btnTheme {
-                    border: none;
-                    padding: 4px;
-                    margin: 2px;
-                    border-radius: 6px;
-                }
-                QToolButton#btnTheme:hover { background: rgba(0,0,0,0.08); }
-
-                QFrame#footerBar {
-                    background-color: #f7f7f7;
-                    border-top: 1px solid #dcdcdc;
-                }
-                QLabel#lblSummary { color: #555555; }
-
-                QSplitter#mainSplitter::handle {
-                    background-color: rgba(0,0,0,0.04);
-                    border: none;
-                    margin: 0;
-                }
-                QSplitter#mainSplitter::handle:horizontal {
-                    width: 8px;
-                    border-left: 1px solid #dcdcdc;
-                    background-clip: padding;
-                }
-                QSplitter#mainSplitter::handle:horizontal:hover {
-                    background-color: rgba(0,0,0,0.08);
-                    border-left-color: #c8c8c8;
-                }
-                QSplitter#mainSplitter::handle:horizontal:pressed {
-                    background-color: rgba(0,0,0,0.10);
-                    border-left-color: #bdbdbd;
-                }
-            """
-
-        app.setStyleSheet(style)
-        self._update_theme_icon()
+        style = stylesheet(self.dark_mode)
+        if style == self._applied_style:
+            return
+        QApplication.instance().setStyleSheet(style)
+        self._applied_style = style
+        if hasattr(self, "theme_button"):
+            self._update_theme_icon()
         if hasattr(self, "splitter"):
             self.splitter.update()
+        if hasattr(self, "preview"):
+            self.preview.set_dark(self.dark_mode)
 
 def main():
+    started = time.perf_counter()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    if "--startup-time" in sys.argv:
+        # Medição de abertura (ver bench/startup.py): sai assim que o loop de eventos fica livre
+        def report():
+            print(f"startup_ms={(time.perf_counter() - started) * 1000:.1f}")
+            app.quit()
+        QTimer.singleShot(0, report)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
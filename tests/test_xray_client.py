@@ -0,0 +1,117 @@
+"""
+Testes do core.xray_client contra um servidor HTTP local (127.0.0.1, porta livre)
+que faz o papel do Jira/Xray.
+
+    python -m pytest tests        (ou: python -m unittest discover tests)
+"""
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from core import xray_client
+from core.xray_client import XrayClient, basic_auth, parse_import_response
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server.requests.append({
+            "path": self.path,
+            "client": self.client_address,
+            "authorization": self.headers["Authorization"],
+            "body": body,
+        })
+        status, headers, payload = server.responses.pop(0) if server.responses else (200, {}, "[]")
+        data = payload.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class XrayClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        self.server.requests = []
+        self.server.responses = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address
+        self.client = XrayClient(f"http://{host}:{port}/jira", basic_auth("u", "p"), timeout=5, backoff=0.01)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retry_on_503_and_429_honours_retry_after(self):
+        self.server.responses = [
+            (503, {"Retry-After": "2"}, ""),
+            (429, {"Retry-After": "1"}, ""),
+            (200, {}, json.dumps([{"key": "PROJ-1"}, {"key": "PROJ-2"}])),
+        ]
+        with mock.patch.object(xray_client.time, "sleep") as sleep:
+            result = self.client.import_feature_text("Feature: X\n", project_key="PROJ")
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(result.keys, ["PROJ-1", "PROJ-2"])
+        # O maior entre o backoff (0.01, 0.02) e o Retry-After
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [2, 1])
+        self.assertEqual(len(self.server.requests), 3)
+        first = self.server.requests[0]
+        self.assertEqual(first["path"], "/jira/rest/raven/2.0/import/feature?projectKey=PROJ")
+        self.assertEqual(first["authorization"], basic_auth("u", "p"))
+        self.assertIn(b"Feature: X", first["body"])
+
+    def test_gives_up_after_retries(self):
+        self.server.responses = [(503, {}, "")] * (self.client.retries + 1)
+        with mock.patch.object(xray_client.time, "sleep"):
+            result = self.client.import_feature_text("Feature: X\n")
+        self.assertFalse(result.ok)
+        self.assertEqual(result.status, 503)
+        self.assertEqual(result.attempts, self.client.retries + 1)
+        self.assertEqual(result.errors, ["HTTP 503"])
+
+    def test_keep_alive_connection_is_reused(self):
+        for _ in range(3):
+            self.assertTrue(self.client.import_feature_text("Feature: X\n").ok)
+        clients = {request["client"] for request in self.server.requests}
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(len(clients), 1)  # mesma porta de origem = mesma conexão TCP
+
+
+class ParseImportResponseTest(unittest.TestCase):
+    def test_server_list(self):
+        body = json.dumps([{"id": "1", "key": "PROJ-1"}, {"id": "2", "key": "PROJ-2"}, {"id": "3"}])
+        self.assertEqual(parse_import_response(body), (["PROJ-1", "PROJ-2"], []))
+
+    def test_cloud_object(self):
+        body = json.dumps({
+            "updatedOrCreatedTests": [{"key": "PROJ-3"}],
+            "updatedOrCreatedPreconditions": [{"key": "PROJ-4"}],
+            "errors": ["cenário sem passos"],
+        })
+        self.assertEqual(parse_import_response(body), (["PROJ-3", "PROJ-4"], ["cenário sem passos"]))
+
+    def test_single_error(self):
+        self.assertEqual(parse_import_response(json.dumps({"error": "sem permissão"})), ([], ["sem permissão"]))
+
+    def test_invalid_or_empty_body(self):
+        self.assertEqual(parse_import_response("<html>erro</html>"), ([], []))
+        self.assertEqual(parse_import_response(""), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
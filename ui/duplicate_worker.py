@@ -0,0 +1,35 @@
+import time
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.duplicates import DEFAULT_THRESHOLD, find_duplicates
+
+
+class DuplicateSignals(QObject):
+    """Sinais do DuplicateWorker (criado na thread da GUI; entregas enfileiradas)."""
+    finished = Signal(object)  # (lista de DuplicateCluster, segundos), ou None em caso de falha
+    log = Signal(str)
+
+
+class DuplicateWorker(QRunnable):
+    """
+    Procura duplicados fora da thread da GUI: a passada de quase iguais leva alguns
+    segundos com ~100 mil cenários.
+    """
+
+    def __init__(self, features, near=False, threshold=DEFAULT_THRESHOLD):
+        super().__init__()
+        self.features = list(features)  # a lista da janela pode mudar durante a análise
+        self.near = near
+        self.threshold = threshold
+        self.signals = DuplicateSignals()
+
+    def run(self):
+        result = None
+        try:
+            start = time.perf_counter()
+            clusters = find_duplicates(self.features, near=self.near, threshold=self.threshold)
+            result = (clusters, time.perf_counter() - start)
+        except Exception as e:
+            self.signals.log.emit(f"[EXCEPTION] Falha ao procurar duplicados: {e}")
+        self.signals.finished.emit(result)
@@ -0,0 +1,118 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from core.path_index import PathIndex
+
+
+class FileListModel(QAbstractTableModel):
+    """
+    Modelo da lista de arquivos (caminho, nº de features, nº de cenários).
+
+    Guarda só tuplas simples por arquivo e insere linhas em lote (um
+    beginInsertRows por lote da varredura). O filtro por substring usa o PathIndex,
+    então filtrar 100k caminhos não passa por um QSortFilterProxyModel.
+    """
+
+    COLUMNS = ("Arquivo", "Features", "Cenários")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []       # id -> [caminho, features, cenários, erro] (None = removido)
+        self._visible = []    # ids exibidos, na ordem
+        self._filter = ""
+        self._index = PathIndex()
+
+    # --------- Interface do Qt ---------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        path, features, scenarios, error = self._rows[self._visible[index.row()]]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return path
+            return features if column == 1 else scenarios
+        if role == Qt.ToolTipRole:
+            return f"[ERRO] {error}" if error else path
+        if role == Qt.TextAlignmentRole and column > 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    # --------- Operações usadas pela janela ---------
+    def path_at(self, row):
+        return self._rows[self._visible[row]][0]
+
+    def row_of(self, path):
+        """Linha visível do caminho, ou -1 se não estiver na lista/filtro."""
+        path_id = self._index.id_of(path)
+        if path_id is None:
+            return -1
+        try:
+            return self._visible.index(path_id)
+        except ValueError:
+            return -1
+
+    def add_files(self, entries):
+        """entries: lista de (caminho, stats, erro). Insere tudo com uma única notificação."""
+        new_visible = []
+        for path, stats, error in entries:
+            path_id = self._index.id_of(path)
+            if path_id is not None:
+                self.update_file(path, stats, error)
+                continue
+            path_id = self._index.add(path)
+            self._rows.append([path, stats["features"], stats["scenarios"], error])
+            if not self._filter or self._filter in path.lower():
+                new_visible.append(path_id)
+
+        if new_visible:
+            first = len(self._visible)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_visible) - 1)
+            self._visible.extend(new_visible)
+            self.endInsertRows()
+
+    def update_file(self, path, stats, error=None):
+        path_id = self._index.id_of(path)
+        if path_id is None:
+            return
+        self._rows[path_id][1:] = [stats["features"], stats["scenarios"], error]
+        row = self.row_of(path)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def remove_file(self, path):
+        row = self.row_of(path)
+        path_id = self._index.remove(path)
+        if path_id is None:
+            return
+        self._rows[path_id] = None
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._visible[row]
+            self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self._visible = []
+        self._index.clear()
+        self.endResetModel()
+
+    def set_filter(self, text):
+        self._filter = text.strip().lower()
+        self.beginResetModel()
+        self._visible = self._index.search(self._filter)
+        self.endResetModel()
+
+    def total_count(self):
+        return len(self._index)
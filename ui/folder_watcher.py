@@ -0,0 +1,145 @@
+import os
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+
+def _listing(folder):
+    """({caminho: (mtime_ns, tamanho)} dos .robot, {caminhos das subpastas}) de uma pasta."""
+    files, subfolders = {}, set()
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subfolders.add(entry.path)
+                    elif entry.name.lower().endswith(".robot") and entry.is_file():
+                        st = entry.stat()
+                        files[entry.path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subfolders
+
+
+class FolderWatcher(QObject):
+    """
+    Observa a pasta selecionada (e subpastas) e os .robot dentro dela.
+
+    O sistema só observa pastas (e até MAX_FILE_WATCHES arquivos): cada observação
+    custa um watch do inotify, cujo limite padrão em muitas distros é 8192. Quando
+    uma pasta muda, a listagem dela é comparada com a anterior (mtime e tamanho) e
+    só os .robot novos, alterados ou removidos são reportados, além das subpastas
+    novas. Os arquivos observados diretamente cobrem as gravações no lugar, que não
+    mexem na pasta; a maioria dos editores salva via arquivo temporário + rename,
+    o que a comparação das pastas já pega.
+
+    Os eventos são acumulados e entregues de uma vez pelo sinal `changed` depois de
+    DEBOUNCE_MS sem novidades, para que vários saves seguidos (ou um checkout
+    inteiro) virem uma única atualização.
+    """
+
+    changed = Signal(set)  # .robot novos/alterados/removidos e subpastas novas
+
+    DEBOUNCE_MS = 300
+    MAX_FILE_WATCHES = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._queue_directory)
+        self._watcher.fileChanged.connect(self._queue_file)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._flush)
+
+        # Conjuntos mantidos aqui: consultar o QFileSystemWatcher a cada mudança é O(N)
+        self._dirs = set()
+        self._files = set()
+        self._listings = {}         # pasta -> última _listing
+        self._pending_dirs = set()
+        self._pending_files = set()
+
+    def watch(self, folders, files):
+        """
+        Começa a observar as pastas (as mesmas visitadas pela varredura, já sem as
+        ignoradas) e até MAX_FILE_WATCHES arquivos da lista.
+        """
+        self.stop()
+        for folder in folders:
+            self.add_directory(folder)
+        self.add_files(files)
+
+    def add_directory(self, path):
+        if path in self._dirs or not os.path.isdir(path):
+            return
+        if self._watcher.addPath(path):
+            self._dirs.add(path)
+            self._listings[path] = _listing(path)
+
+    def add_files(self, paths):
+        room = self.MAX_FILE_WATCHES - len(self._files)
+        paths = [p for p in paths if p not in self._files and os.path.isfile(p)][:max(0, room)]
+        if paths:
+            failed = set(self._watcher.addPaths(paths))
+            self._files.update(p for p in paths if p not in failed)
+
+    def remove_paths(self, paths):
+        paths = [p for p in paths if p in self._files or p in self._dirs]
+        if paths:
+            self._watcher.removePaths(paths)
+            for path in paths:
+                self._files.discard(path)
+                self._dirs.discard(path)
+                self._listings.pop(path, None)
+
+    def directories(self):
+        return list(self._dirs)
+
+    def is_watching(self):
+        return bool(self._dirs)
+
+    def stop(self):
+        self._timer.stop()
+        self._pending_dirs.clear()
+        self._pending_files.clear()
+        watched = list(self._files | self._dirs)
+        if watched:
+            self._watcher.removePaths(watched)
+        self._files.clear()
+        self._dirs.clear()
+        self._listings.clear()
+
+    def _queue_directory(self, path):
+        self._pending_dirs.add(path)
+        self._timer.start()  # reinicia a contagem a cada evento
+
+    def _queue_file(self, path):
+        self._pending_files.add(path)
+        self._timer.start()
+
+    def _flush(self):
+        changed = set(self._pending_files)
+        for path in self._pending_files:
+            if not os.path.exists(path):
+                self._files.discard(path)  # o Qt já parou de observar
+        self._pending_files.clear()
+
+        for folder in self._pending_dirs:
+            old_files, old_dirs = self._listings.get(folder, ({}, set()))
+            if os.path.isdir(folder):
+                files, subfolders = _listing(folder)
+                self._listings[folder] = (files, subfolders)
+            else:
+                files, subfolders = {}, set()
+                self._dirs.discard(folder)
+                self._listings.pop(folder, None)
+            changed.update(path for path, stamp in files.items() if old_files.get(path) != stamp)
+            changed.update(path for path in old_files if path not in files)
+            changed.update(subfolders - old_dirs - self._dirs)
+        self._pending_dirs.clear()
+
+        if changed:
+            self.changed.emit(changed)
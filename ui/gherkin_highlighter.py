@@ -0,0 +1,181 @@
+"""
+Realce de sintaxe Gherkin para o preview.
+
+O QSyntaxHighlighter chama highlightBlock para todos os blocos a cada setPlainText
+(centenas de milhares de chamadas Python num texto grande). Aqui o realce é sob
+demanda e não usa QSyntaxHighlighter: só os blocos que aparecem na área visível
+(mais uma pequena margem) recebem formatos, aplicados direto no QTextLayout de cada
+bloco à medida que a rolagem os revela. Cada linha Gherkin se realça sozinha (sem
+estado entre blocos), então a ordem não importa e realçar um bloco nunca obriga a
+refazer os seguintes.
+"""
+import re
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextLayout
+
+_FEATURE = re.compile(r"\s*(Feature|Funcionalidade|Característica|Background|Contexto|Rule|Regra)\s*:")
+_SCENARIO = re.compile(
+    r"\s*(Scenario Outline|Scenario Template|Scenario|Example|Esquema do Cenário|Esquema do Cenario"
+    r"|Cenário|Cenario|Examples|Scenarios|Exemplos|Cenários|Cenarios)\s*:"
+)
+_STEP = re.compile(r"\s*(Given|When|Then|And|But|Dado|Dada|Dados|Dadas|Quando|Então|Entao|E|Mas|\*)(?=\s)")
+_TAGS = re.compile(r"\s*@\S+(?:\s+@\S+)*\s*$")
+_TAG = re.compile(r"@\S+")
+_COMMENT = re.compile(r"\s*#")
+_STRING = re.compile(r"\"[^\"]*\"|'[^']*'")
+_PLACEHOLDER = re.compile(r"<[^<>\s][^<>]*>")
+_TABLE = re.compile(r"\s*\|")
+
+# (cor no tema escuro, cor no tema claro, negrito)
+_STYLES = {
+    "feature": ("#c586c0", "#8b1c8b", True),
+    "scenario": ("#569cd6", "#0b57a4", True),
+    "step": ("#4ec9b0", "#1a7f64", True),
+    "project": ("#dcdcaa", "#8a6d00", True),
+    "tag": ("#d7ba7d", "#a35d00", False),
+    "string": ("#ce9178", "#a31515", False),
+    "placeholder": ("#9cdcfe", "#0451a5", False),
+    "table": ("#b5cea8", "#4b6b1f", False),
+    "comment": ("#6a9955", "#6a737d", False),
+}
+_formats = {}  # tema escuro? -> {nome: QTextCharFormat}, montados uma vez por tema
+
+
+def _theme_formats(dark):
+    if dark not in _formats:
+        formats = {}
+        for name, (dark_color, light_color, bold) in _STYLES.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(dark_color if dark else light_color))
+            if bold:
+                fmt.setFontWeight(QFont.Bold)
+            formats[name] = fmt
+        _formats[dark] = formats
+    return _formats[dark]
+
+
+class GherkinHighlighter(QObject):
+    """
+    Realça o documento de um QPlainTextEdit só nos blocos visíveis.
+
+    Os blocos já realçados desde o último texto ficam num conjunto (o preview é só
+    leitura e troca o texto inteiro de uma vez, então os números não se deslocam).
+    """
+
+    MARGIN = 20  # blocos além da área visível realçados junto (rolagem curta não mostra texto cru)
+
+    def __init__(self, editor, dark=True):
+        super().__init__(editor)
+        self._editor = editor
+        self._formats = _theme_formats(dark)
+        self._done = set()
+        self._applying = False  # markContentsDirty também emite contentsChange
+
+        # Várias rolagens/redimensionamentos seguidos viram uma passada só
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._highlight_visible)
+        editor.updateRequest.connect(self._schedule)
+        editor.document().contentsChange.connect(self._on_contents_change)
+
+    def set_dark(self, dark):
+        formats = _theme_formats(dark)
+        if formats is self._formats:
+            return
+        self._formats = formats
+        # Os blocos fora da tela ficam com as cores antigas até aparecerem de novo
+        self._done.clear()
+        self._schedule()
+
+    def _on_contents_change(self, position, removed, added):
+        if not self._applying:
+            self._done.clear()
+            self._schedule()
+
+    def _schedule(self, *args):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _highlight_visible(self):
+        editor = self._editor
+        block = editor.firstVisibleBlock()
+        if not block.isValid():
+            return
+        bottom = editor.viewport().rect().bottom()
+        offset = editor.contentOffset()
+
+        # Margem também acima da área visível (rolagem para cima)
+        for _ in range(self.MARGIN):
+            if not block.previous().isValid():
+                break
+            block = block.previous()
+
+        extra = self.MARGIN
+        document = editor.document()
+        while block.isValid() and extra:
+            if editor.blockBoundingGeometry(block).translated(offset).top() > bottom:
+                extra -= 1
+            number = block.blockNumber()
+            if number not in self._done:
+                self._done.add(number)
+                block.layout().setFormats(self._block_formats(block))
+                # Mesmo caminho do QSyntaxHighlighter para o bloco ser redesenhado
+                self._applying = True
+                try:
+                    document.markContentsDirty(block.position(), block.length())
+                finally:
+                    self._applying = False
+            block = block.next()
+
+    def _block_formats(self, block):
+        """Lista de QTextLayout.FormatRange da linha (os posteriores prevalecem)."""
+        text = block.text()
+        ranges = []
+        if not text:
+            return ranges
+        formats = self._formats
+
+        def add(start, length, name):
+            fmt = QTextLayout.FormatRange()
+            fmt.start = start
+            fmt.length = length
+            fmt.format = formats[name]
+            ranges.append(fmt)
+
+        if _COMMENT.match(text):
+            add(0, len(text), "comment")
+            return ranges
+
+        if _TAGS.match(text):
+            # Linha só de @tags: antes de um Feature é a chave do projeto
+            following = block.next()
+            if following.isValid() and _FEATURE.match(following.text()):
+                add(0, len(text), "project")
+            else:
+                for match in _TAG.finditer(text):
+                    add(match.start(), match.end() - match.start(), "tag")
+            return ranges
+
+        match = _FEATURE.match(text) or _SCENARIO.match(text)
+        if match:
+            kind = "feature" if match.re is _FEATURE else "scenario"
+            add(match.start(1), match.end() - match.start(1), kind)
+            start = match.end()
+        else:
+            match = _STEP.match(text)
+            if match:
+                add(match.start(1), match.end(1) - match.start(1), "step")
+                start = match.end()
+            elif _TABLE.match(text):
+                add(0, len(text), "table")
+                start = 0
+            else:
+                return ranges
+
+        for match in _STRING.finditer(text, start):
+            add(match.start(), match.end() - match.start(), "string")
+        for match in _PLACEHOLDER.finditer(text, start):
+            add(match.start(), match.end() - match.start(), "placeholder")
+        return ranges
@@ -0,0 +1,142 @@
+from collections import deque
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import (
+    QComboBox, QFileDialog, QHBoxLayout, QPlainTextEdit, QPushButton, QVBoxLayout, QWidget
+)
+
+from core.timing import span
+
+# Níveis reconhecidos pelo prefixo da mensagem ("[OK] ...") em ordem de severidade
+LEVELS = ("INFO", "OK", "WARN", "ERRO")
+_SEVERITY = {level: i for i, level in enumerate(LEVELS)}
+_SEVERITY["EXCEPTION"] = _SEVERITY["ERRO"]
+_SEVERITY["CMD"] = _SEVERITY["INFO"]
+
+
+def _level_of(text):
+    if text.startswith("["):
+        tag = text[1:text.find("]")]
+        if tag in _SEVERITY:
+            return _SEVERITY[tag]
+    return _SEVERITY["INFO"]
+
+
+class LogPanel(QWidget):
+    """
+    Painel de log com escrita em lote.
+
+    `append()` só enfileira a mensagem; um timer descarrega a fila no editor a cada
+    FLUSH_MS com um único appendPlainText, então logar um arquivo por vez não força
+    um relayout por linha. O histórico é um buffer circular (max_lines) e o editor
+    também descarta as linhas mais antigas. O filtro de nível reexibe o histórico;
+    opcionalmente o log completo vai para um arquivo em vez do widget.
+    """
+
+    FLUSH_MS = 100
+
+    def __init__(self, max_lines=5000, parent=None):
+        super().__init__(parent)
+        self._queue = []
+        self._history = deque(maxlen=max_lines)  # (severidade, linha)
+        self._min_level = 0
+        self._log_file = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        controls = QHBoxLayout()
+        controls.setContentsMargins(0, 0, 0, 0)
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(["Todos", "OK e acima", "WARN e acima", "Só ERRO"])
+        self.level_combo.setToolTip("Nível mínimo exibido")
+        self.level_combo.currentIndexChanged.connect(self.set_min_level)
+        controls.addWidget(self.level_combo)
+        controls.addStretch()
+        self.file_button = QPushButton("Log em arquivo")
+        self.file_button.setCheckable(True)
+        self.file_button.setToolTip("Grava o log completo num arquivo em vez de exibir aqui")
+        self.file_button.toggled.connect(self._on_file_toggled)
+        controls.addWidget(self.file_button)
+        layout.addLayout(controls)
+
+        self.editor = QPlainTextEdit()
+        self.editor.setReadOnly(True)
+        self.editor.setMaximumBlockCount(max_lines)
+        self.editor.setPlaceholderText("Logs do sistema aparecerão aqui...")
+        layout.addWidget(self.editor, 1)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.FLUSH_MS)
+        self._timer.timeout.connect(self.flush)
+
+    # --------- API compatível com QTextEdit.append/clear ---------
+    def append(self, text):
+        level = _level_of(text)
+        for line in text.split("\n"):
+            self._queue.append((level, line))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def clear(self):
+        self._queue.clear()
+        self._history.clear()
+        self.editor.clear()
+
+    def toPlainText(self):
+        self.flush()
+        return self.editor.toPlainText()
+
+    # --------- Lote / filtro / arquivo ---------
+    def flush(self):
+        self._timer.stop()
+        if not self._queue:
+            return
+        batch, self._queue = self._queue, []
+
+        with span("log"):
+            if self._log_file is not None:
+                self._log_file.write("\n".join(line for _, line in batch) + "\n")
+                self._log_file.flush()
+                return
+
+            self._history.extend(batch)
+            visible = [line for level, line in batch if level >= self._min_level]
+            if visible:
+                self.editor.appendPlainText("\n".join(visible))
+
+    def set_min_level(self, level):
+        self.flush()
+        self._min_level = level
+        self.editor.setPlainText(
+            "\n".join(line for lvl, line in self._history if lvl >= level)
+        )
+        self.editor.moveCursor(QTextCursor.End)
+
+    def log_to_file(self, path):
+        """Passa a gravar o log em `path` (append). Com path=None volta para o widget."""
+        self.flush()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        if path:
+            self._log_file = open(path, "a", encoding="utf-8")
+            self.editor.appendPlainText(f"[INFO] Log sendo gravado em {path}")
+        else:
+            self.editor.appendPlainText("[INFO] Log voltou a ser exibido aqui.")
+
+    def _on_file_toggled(self, checked):
+        if not checked:
+            self.log_to_file(None)
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar log em", "hogsqueal.log", "Log (*.log *.txt)")
+        if not path:
+            self.file_button.setChecked(False)
+            return
+        try:
+            self.log_to_file(path)
+        except OSError as e:
+            self.file_button.setChecked(False)
+            self.editor.appendPlainText(f"[ERRO] Não foi possível abrir {path}: {e}")
@@ -0,0 +1,213 @@
+import os
+from bisect import bisect_right
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QPlainTextEdit, QVBoxLayout, QWidget
+
+from core.timing import span
+from ui.gherkin_highlighter import GherkinHighlighter
+
+
+class _FeatureTitlesModel(QAbstractListModel):
+    """Títulos para o combo de navegação, gerados só quando o Qt pede a linha."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._features = []
+
+    def set_features(self, features):
+        self.beginResetModel()
+        self._features = features
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._features)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        feature = self._features[index.row()]
+        return f"{index.row() + 1}. {feature.title}  ({os.path.basename(feature.source or '')}:{feature.line})"
+
+
+class FeaturePreview(QWidget):
+    """
+    Preview "virtualizado" do .feature combinado.
+
+    Em vez de jogar o texto inteiro no editor, só uma janela de WINDOW features é
+    renderizada e carregada por vez. Quando a rolagem chega perto da borda, a janela
+    é recentrada em volta do feature visível; o combo "Ir para feature" pula direto
+    para qualquer feature. Assim o custo de abrir/rolar não depende do tamanho total.
+    O realce Gherkin segue a mesma ideia: só as linhas visíveis são formatadas.
+    """
+
+    WINDOW = 300      # features carregados no editor ao mesmo tempo
+    EDGE_BLOCKS = 3   # a quantas linhas da borda a janela é deslocada
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._features = []
+        self._render = None
+        self._separator = "\n"
+        self._nav_key = None
+        self._start = 0
+        self._end = 0
+        self._offsets = []      # nº do bloco onde cada feature da janela começa
+        self._loading = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        nav = QHBoxLayout()
+        nav.setContentsMargins(0, 0, 0, 0)
+        self.jump_combo = QComboBox()
+        self.jump_combo.setToolTip("Ir para feature")
+        self.jump_combo.setModel(_FeatureTitlesModel(self.jump_combo))
+        # Sem isso o combo mede todos os itens (lento com dezenas de milhares)
+        self.jump_combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.jump_combo.setMinimumContentsLength(30)
+        self.jump_combo.view().setUniformItemSizes(True)
+        self.jump_combo.activated.connect(self.jump_to)
+        nav.addWidget(self.jump_combo, 1)
+        self.range_label = QLabel()
+        self.range_label.setObjectName("lblPreviewRange")
+        nav.addWidget(self.range_label)
+        layout.addLayout(nav)
+
+        self.editor = QPlainTextEdit()
+        self.editor.setReadOnly(True)
+        self.editor.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        layout.addWidget(self.editor, 1)
+        self.highlighter = GherkinHighlighter(self.editor)
+
+        self._set_nav_visible(False)
+
+    # --------- API parecida com a do QTextEdit usado antes ---------
+    def setPlainText(self, text):
+        """Mostra um texto simples (mensagens, erros) fora do modo virtualizado."""
+        self._features = []
+        self._render = None
+        self._nav_key = None
+        self._offsets = []
+        self.jump_combo.model().set_features([])
+        self._set_nav_visible(False)
+        self.editor.setPlainText(text)
+
+    def set_dark(self, dark):
+        self.highlighter.set_dark(dark)
+
+    def clear(self):
+        self.setPlainText("")
+
+    def toPlainText(self):
+        return self.editor.toPlainText()
+
+    # --------- Modo virtualizado ---------
+    def set_features(self, features, render, separator="\n\n---\n\n", nav_key=None):
+        """
+        Exibe `features` usando `render(feature) -> str` só para a janela visível.
+
+        nav_key identifica a lista atual: enquanto não mudar, o combo de navegação
+        não é reconstruído (ex.: ao trocar só projeto/tags).
+        """
+        same_list = nav_key is not None and nav_key == self._nav_key and self._render is not None
+        anchor = self.current_index() if same_list else None
+
+        self._features = features
+        self._render = render
+        self._separator = separator
+
+        if not same_list:
+            self.jump_combo.model().set_features(features)
+            self._nav_key = nav_key
+        self._set_nav_visible(len(features) > 1)
+
+        # Mesma lista (ex.: mudou só projeto/tags): mantém a posição de leitura
+        self._load_window(self._start if same_list else 0, anchor=anchor)
+
+    def jump_to(self, index, line_text=None):
+        """
+        Leva o feature `index` ao topo. Com line_text, seleciona também a primeira
+        linha desse feature com esse texto (ex.: o passo encontrado pela busca).
+        """
+        if not 0 <= index < len(self._features):
+            return
+        self._load_window(index - self.WINDOW // 4, anchor=index)
+        if line_text is not None:
+            self._select_line(index, line_text)
+
+    def _select_line(self, index, line_text):
+        first = self._offsets[index - self._start]
+        last = self._offsets[index - self._start + 1] if index + 1 < self._end else None
+        wanted = line_text.strip()
+        block = self.editor.document().findBlockByNumber(first)
+        while block.isValid() and (last is None or block.blockNumber() < last):
+            if block.text().strip() == wanted:
+                cursor = QTextCursor(block)
+                cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+                self.editor.setTextCursor(cursor)
+                self.editor.ensureCursorVisible()
+                return
+            block = block.next()
+
+    def current_index(self):
+        """Índice (na lista completa) do feature no topo da área visível."""
+        if not self._offsets:
+            return 0
+        block = self.editor.cursorForPosition(self.editor.viewport().rect().topLeft()).blockNumber()
+        return self._start + max(0, bisect_right(self._offsets, block) - 1)
+
+    def _set_nav_visible(self, visible):
+        self.jump_combo.setVisible(visible)
+        self.range_label.setVisible(visible)
+
+    def _load_window(self, start, anchor=None):
+        total = len(self._features)
+        start = max(0, min(start, total - self.WINDOW))
+        end = min(total, start + self.WINDOW)
+
+        with span("preview"):
+            parts = []
+            offsets = []
+            block = 0
+            separator_blocks = self._separator.count("\n")
+            for feature in self._features[start:end]:
+                text = self._render(feature)
+                offsets.append(block)
+                parts.append(text)
+                block += text.count("\n") + separator_blocks
+
+            self._loading = True
+            try:
+                self._start, self._end, self._offsets = start, end, offsets
+                self.editor.setPlainText(self._separator.join(parts))
+                if anchor is not None and start <= anchor < end:
+                    self._scroll_to_block(offsets[anchor - start])
+            finally:
+                self._loading = False
+
+        if total:
+            self.range_label.setText(f"Features {start + 1}–{end} de {total}")
+            if anchor is not None:
+                self.jump_combo.setCurrentIndex(anchor)
+
+    def _scroll_to_block(self, block_number):
+        # Vai ao fim e volta: ao rolar para cima o Qt deixa o bloco no topo da área visível
+        self.editor.moveCursor(QTextCursor.End)
+        self.editor.ensureCursorVisible()
+        block = self.editor.document().findBlockByNumber(block_number)
+        self.editor.setTextCursor(QTextCursor(block))
+        self.editor.ensureCursorVisible()
+
+    def _on_scrolled(self, value):
+        if self._loading or not self._offsets:
+            return
+        bar = self.editor.verticalScrollBar()
+        near_end = value >= bar.maximum() - self.EDGE_BLOCKS and self._end < len(self._features)
+        near_start = value <= self.EDGE_BLOCKS and self._start > 0
+        if near_end or near_start:
+            # Recentra a janela em volta do feature visível, mantendo-o na mesma posição
+            top = self.current_index()
+            self._load_window(top - self.WINDOW // 2, anchor=top)
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.archives import is_archive
+from core.cache import iter_parse_cached
+from core.parser import iter_parse_archive
+from core.search_index import file_terms
+from core.timing import TRACER, span
+from core.walker import iter_robot_files
+
+
+class ScanSignals(QObject):
+    """
+    Sinais emitidos pelo ScanWorker (a partir da thread do pool).
+    O objeto é criado na thread da GUI, então as conexões chegam enfileiradas nela.
+    """
+    batch = Signal(list, list, int, int)  # resultados, termos de busca de cada um, pastas e arquivos vistos
+    finished = Signal(dict)         # resumo final da varredura
+
+
+class ScanWorker(QRunnable):
+    """
+    Varre a pasta e parseia os .robot fora da thread da GUI, usando o pool de
+    processos de core.parser.iter_parse_many para aproveitar todos os núcleos.
+    Arquivos que não mudaram desde a última varredura vêm direto do ParseCache.
+    Um artefato .zip/.tar é lido numa única passada, sem extrair (core.archives);
+    os resultados vão para o cache, então o preview de um membro não relê o artefato.
+
+    Os resultados são enviados em lotes à medida que ficam prontos, como tuplas
+    (caminho, features, stats, erro), junto com os termos do índice de busca de
+    cada arquivo (core.search_index.file_terms): tokenizar aqui deixa para a GUI
+    só a junção nas listas do índice. O primeiro resultado sai imediatamente; os
+    seguintes são agrupados para não inundar a fila de eventos.
+    """
+
+    FLUSH_INTERVAL = 0.1  # segundos entre lotes
+    FLUSH_SIZE = 200      # ou a cada N arquivos, o que vier primeiro
+
+    def __init__(self, folder, include_subfolders, cache, workers=None):
+        super().__init__()
+        self.cache = cache
+        self.folder = folder
+        self.include_subfolders = include_subfolders
+        self.workers = workers
+        self.signals = ScanSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def _iter_archive(self, results):
+        for result in results:
+            path, features, stats, error = result
+            if error is None:
+                self.cache.store(path, features, stats)
+            yield result
+
+    def run(self):
+        counts = {"folders": 0, "files": 0, "skipped": 0}
+        folders = []
+        folder_rules = {}
+        pending = []
+        pending_terms = []
+        last_flush = 0.0
+        error = None
+
+        # Processos com "spawn": fazer fork de um processo com threads do Qt não é seguro
+        # "listagem" = tempo dentro do walker; "parsing" = espera pelos resultados
+        # (inclui a listagem, já que o parser puxa os caminhos sob demanda)
+        if is_archive(self.folder):
+            results = TRACER.timed_iter(
+                self._iter_archive(iter_parse_archive(self.folder, self.include_subfolders, counts)), "parsing"
+            )
+        else:
+            paths = TRACER.timed_iter(
+                iter_robot_files(self.folder, self.include_subfolders, counts, folders=folders,
+                                 folder_rules=folder_rules),
+                "listagem",
+            )
+            results = TRACER.timed_iter(
+                iter_parse_cached(paths, self.cache, workers=self.workers, start_method="spawn"), "parsing"
+            )
+        try:
+            for result in results:
+                if self.is_cancelled():
+                    break
+                pending.append(result)
+                with span("índice"):
+                    pending_terms.append(file_terms(result[1]))
+
+                now = time.monotonic()
+                if len(pending) >= self.FLUSH_SIZE or now - last_flush >= self.FLUSH_INTERVAL:
+                    self.signals.batch.emit(pending, pending_terms, counts["folders"], counts["files"])
+                    pending, pending_terms = [], []
+                    last_flush = now
+        except Exception as e:
+            error = str(e)
+        finally:
+            results.close()  # encerra o pool e descarta lotes pendentes
+            try:
+                with span("cache"):
+                    self.cache.flush()
+            except Exception as e:
+                error = error or f"cache: {e}"
+
+        if pending:
+            self.signals.batch.emit(pending, pending_terms, counts["folders"], counts["files"])
+
+        self.signals.finished.emit({
+            "cancelled": self.is_cancelled(),
+            "folders": counts["folders"],
+            "files": counts["files"],
+            "skipped": counts["skipped"],
+            "visited": folders,
+            "folder_rules": folder_rules,
+            "error": error,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        })
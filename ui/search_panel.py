@@ -0,0 +1,103 @@
+import os
+import time
+
+from PySide6.QtCore import QTimer, Signal
+from PySide6.QtWidgets import (
+    QHBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem, QPushButton, QVBoxLayout, QWidget
+)
+
+
+class SearchPanel(QWidget):
+    """
+    Caixa de busca sobre o FeatureIndex: mostra os resultados (arquivo:linha e o
+    texto que casou) e avisa a janela quando um deles é escolhido.
+    """
+
+    hit_activated = Signal(object)    # Hit escolhido
+    export_requested = Signal(str)    # consulta para gerar o .feature filtrado
+
+    LIMIT = 200
+    DEBOUNCE_MS = 80
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        row = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar em features, cenários e passos...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(lambda: self._timer.start())
+        self.search_input.returnPressed.connect(self._activate_first)
+        row.addWidget(self.search_input, 1)
+
+        self.export_button = QPushButton("Gerar .feature filtrado")
+        self.export_button.setToolTip("Gera um .feature só com os features/cenários encontrados")
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(lambda: self.export_requested.emit(self.search_input.text()))
+        row.addWidget(self.export_button)
+        layout.addLayout(row)
+
+        self.status_label = QLabel()
+        self.status_label.setVisible(False)
+        layout.addWidget(self.status_label)
+
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        self.results.setMaximumHeight(180)
+        self.results.setVisible(False)
+        self.results.itemActivated.connect(self._on_item_activated)
+        self.results.itemClicked.connect(self._on_item_activated)
+        layout.addWidget(self.results)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self.refresh)
+        self._hits = []
+
+    def refresh(self):
+        """Refaz a busca atual (ex.: depois que arquivos foram reparseados)."""
+        query = self.search_input.text()
+        self.results.clear()
+        if not query.strip():
+            self._hits = []
+            self.results.setVisible(False)
+            self.status_label.setVisible(False)
+            self.export_button.setEnabled(False)
+            return
+
+        start = time.perf_counter()
+        self._hits, total = self.index.search(query, self.LIMIT)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        for hit in self._hits:
+            item = QListWidgetItem(f"{os.path.basename(hit.path)}:{hit.line}  {hit.text.strip()}")
+            item.setToolTip(f"{hit.path}:{hit.line}")
+            self.results.addItem(item)
+
+        shown = f" (exibindo {len(self._hits)})" if total > len(self._hits) else ""
+        self.status_label.setText(f"{total} resultado(s){shown} em {elapsed_ms:.1f} ms")
+        self.status_label.setVisible(True)
+        self.results.setVisible(bool(self._hits))
+        self.export_button.setEnabled(bool(total))
+
+    def clear(self):
+        self.search_input.clear()
+        self.refresh()
+
+    def _activate_first(self):
+        self._timer.stop()
+        self.refresh()
+        if self._hits:
+            self.results.setCurrentRow(0)
+            self.hit_activated.emit(self._hits[0])
+
+    def _on_item_activated(self, item):
+        row = self.results.row(item)
+        if 0 <= row < len(self._hits):
+            self.hit_activated.emit(self._hits[row])
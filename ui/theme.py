@@ -0,0 +1,158 @@
+"""
+Folhas de estilo dos temas escuro e claro.
+
+São constantes montadas uma vez no import; a janela aplica a folha só quando o
+tema muda (cada setStyleSheet faz o Qt re-polir todos os widgets).
+"""
+
+DARK = """
+QMainWindow, QWidget { background-color: #121212; color: #ffffff; }
+QLabel { color: #ffffff; }
+
+QPushButton {
+    background-color: #333333;
+    color: #ffffff;
+    border-radius: 6px;
+    padding: 6px 10px;
+    border: 1px solid #4a4a4a;
+}
+QPushButton:hover { background-color: #444444; }
+
+QListWidget, QTreeView, QTextEdit, QPlainTextEdit, QLineEdit, QComboBox, QSpinBox {
+    background-color: #1e1e1e;
+    color: #ffffff;
+    border: 1px solid #2a2a2a;
+}
+QHeaderView::section {
+    background-color: #1b1b1b;
+    color: #aaaaaa;
+    border: none;
+    border-bottom: 1px solid #2a2a2a;
+    padding: 4px 6px;
+}
+
+QPushButton#btnSubfolders, QPushButton#btnWatch {
+    background: #2c2c2c;
+    border: 1px solid #4a4a4a;
+    color: #ffffff;
+}
+QPushButton#btnSubfolders:hover, QPushButton#btnWatch:hover { background: #3a3a3a; }
+QPushButton#btnSubfolders:checked, QPushButton#btnWatch:checked {
+    background: #2d7d46;
+    color: #ffffff;
+    border-color: #2d7d46;
+}
+QPushButton#btnSubfolders:checked:hover, QPushButton#btnWatch:checked:hover { background: #2f8b4f; }
+
+QToolButton#btnTheme {
+    border: none;
+    padding: 4px;
+    margin: 2px;
+    border-radius: 6px;
+}
+QToolButton#btnTheme:hover { background: rgba(255,255,255,0.08); }
+
+QFrame#footerBar {
+    background-color: #121212;
+    border-top: 1px solid #2a2a2a;
+}
+QLabel#lblSummary { color: #aaaaaa; }
+QLabel#lblTimings { color: #8fb8de; }
+
+QSplitter#mainSplitter::handle {
+    background-color: #1b1b1b;
+    border: none;
+    margin: 0;
+}
+QSplitter#mainSplitter::handle:horizontal {
+    width: 8px;
+    border-left: 1px solid rgba(255,255,255,0.06);
+    background-clip: padding;
+}
+QSplitter#mainSplitter::handle:horizontal:hover {
+    background-color: #252525;
+    border-left-color: rgba(255,255,255,0.14);
+}
+QSplitter#mainSplitter::handle:horizontal:pressed {
+    background-color: #2a2a2a;
+    border-left-color: rgba(255,255,255,0.18);
+}
+"""
+
+LIGHT = """
+QMainWindow, QWidget { background-color: #f7f7f7; color: #222222; }
+QLabel { color: #222222; }
+
+QPushButton {
+    background-color: #ffffff;
+    color: #222222;
+    border-radius: 6px;
+    padding: 6px 10px;
+    border: 1px solid #bdbdbd;
+}
+QPushButton:hover { background-color: #f0f0f0; }
+
+QListWidget, QTreeView, QTextEdit, QPlainTextEdit, QLineEdit, QComboBox, QSpinBox {
+    background-color: #ffffff;
+    color: #222222;
+    border: 1px solid #dcdcdc;
+}
+QHeaderView::section {
+    background-color: #f0f0f0;
+    color: #555555;
+    border: none;
+    border-bottom: 1px solid #dcdcdc;
+    padding: 4px 6px;
+}
+
+QPushButton#btnSubfolders, QPushButton#btnWatch {
+    background: #f6f6f6;
+    border: 1px solid #bdbdbd;
+    color: #333333;
+}
+QPushButton#btnSubfolders:hover, QPushButton#btnWatch:hover { background: #eeeeee; }
+QPushButton#btnSubfolders:checked, QPushButton#btnWatch:checked {
+    background: #2d7d46;
+    color: #ffffff;
+    border-color: #2d7d46;
+}
+QPushButton#btnSubfolders:checked:hover, QPushButton#btnWatch:checked:hover { background: #2f8b4f; }
+
+QToolButton#btnTheme {
+    border: none;
+    padding: 4px;
+    margin: 2px;
+    border-radius: 6px;
+}
+QToolButton#btnTheme:hover { background: rgba(0,0,0,0.08); }
+
+QFrame#footerBar {
+    background-color: #f7f7f7;
+    border-top: 1px solid #dcdcdc;
+}
+QLabel#lblSummary { color: #555555; }
+QLabel#lblTimings { color: #2f6690; }
+
+QSplitter#mainSplitter::handle {
+    background-color: rgba(0,0,0,0.04);
+    border: none;
+    margin: 0;
+}
+QSplitter#mainSplitter::handle:horizontal {
+    width: 8px;
+    border-left: 1px solid #dcdcdc;
+    background-clip: padding;
+}
+QSplitter#mainSplitter::handle:horizontal:hover {
+    background-color: rgba(0,0,0,0.08);
+    border-left-color: #c8c8c8;
+}
+QSplitter#mainSplitter::handle:horizontal:pressed {
+    background-color: rgba(0,0,0,0.10);
+    border-left-color: #bdbdbd;
+}
+"""
+
+
+def stylesheet(dark):
+    return DARK if dark else LIGHT
@@ -0,0 +1,443 @@
+import json
+
+from PySide6.QtCore import QThreadPool
+from PySide6.QtWidgets import (
+    QButtonGroup, QCheckBox, QFileDialog, QGroupBox, QHBoxLayout, QLineEdit, QMessageBox,
+    QProgressBar, QPushButton, QRadioButton, QSpinBox, QStackedWidget, QTextEdit, QVBoxLayout, QWidget
+)
+
+from core.ledger import ImportLedger, split_changed
+from core.xray_batches import split_batches
+from core.xray_client import XrayClient, XrayError, basic_auth, bearer_auth
+from ui.xray_worker import XrayBatchWorker, XrayImportWorker
+
+LOGIN_CONFIG_PATH = "login_config.json"
+IMPORT_LEDGER_PATH = "xray_ledger.sqlite"  # histórico de imports, ao lado do login_config.json
+MAX_UPLOAD_CONCURRENCY = 16
+
+
+def _normalize_url(url):
+    return url.strip().rstrip("/").lower()
+
+
+class XrayTestPage(QWidget):
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent
+        self._client = None      # XrayClient reaproveitado (pool de conexões keep-alive)
+        self._client_key = None  # (url, autorização) usados para criá-lo
+        self._batch_worker = None
+        self._batch_total = 0
+        self._batch_context = None  # (URL, projeto, tags) do envio em lotes em andamento
+        self._import_context = None  # (URL, features, projeto, tags) do envio único de um arquivo gerado
+        self._ledger = None         # ImportLedger, aberto no primeiro envio em lotes
+        self.init_ui()
+        self.load_login_config()  # Carrega ao iniciar
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(12)
+
+        # --- Login Group ---
+        login_group = QGroupBox("Login no Jira/Xray")
+        login_layout = QVBoxLayout(login_group)
+
+        self.url_field = QLineEdit()
+        self.url_field.setPlaceholderText("URL do Jira (ex.: https://jira.empresa.com)")
+        login_layout.addWidget(self.url_field)
+
+        self.radio_userpass = QRadioButton("Usuário e Senha")
+        self.radio_token = QRadioButton("Token do Jira")
+        self.radio_userpass.setChecked(True)
+        login_layout.addWidget(self.radio_userpass)
+        login_layout.addWidget(self.radio_token)
+
+        self.login_method_group = QButtonGroup()
+        self.login_method_group.addButton(self.radio_userpass)
+        self.login_method_group.addButton(self.radio_token)
+
+        # Campos de usuário/senha/token em um QStackedWidget
+        self.login_stack = QStackedWidget()
+
+        # Página 0: Usuário e Senha
+        userpass_widget = QWidget()
+        userpass_layout = QVBoxLayout(userpass_widget)
+        self.user_field = QLineEdit()
+        self.user_field.setPlaceholderText("Usuário Jira")
+        self.pass_field = QLineEdit()
+        self.pass_field.setPlaceholderText("Senha Jira")
+        self.pass_field.setEchoMode(QLineEdit.Password)
+        userpass_layout.addWidget(self.user_field)
+        userpass_layout.addWidget(self.pass_field)
+        self.login_stack.addWidget(userpass_widget)
+
+        # Página 1: Token
+        token_widget = QWidget()
+        token_layout = QVBoxLayout(token_widget)
+        self.token_field = QLineEdit()
+        self.token_field.setPlaceholderText("Token Jira")
+        token_layout.addWidget(self.token_field)
+        self.login_stack.addWidget(token_widget)
+
+        login_layout.addWidget(self.login_stack)
+
+        # Alterna páginas do stack conforme seleção
+        self.radio_userpass.toggled.connect(
+            lambda checked: self.login_stack.setCurrentIndex(0 if checked else 1)
+        )
+        self.radio_token.toggled.connect(
+            lambda checked: self.login_stack.setCurrentIndex(1 if checked else 0)
+        )
+        self.login_stack.setCurrentIndex(0)
+
+        layout.addWidget(login_group)
+
+        # --- Seleção de arquivo .feature ---
+        file_group = QGroupBox("Arquivo .feature para criar teste")
+        file_layout = QHBoxLayout(file_group)
+        self.feature_file_path = QLineEdit()
+        self.feature_file_path.setPlaceholderText("Selecione um arquivo .feature")
+        self.feature_file_path.setReadOnly(True)
+        file_layout.addWidget(self.feature_file_path)
+        self.select_file_btn = QPushButton("Selecionar Arquivo")
+        self.select_file_btn.clicked.connect(self.select_feature_file)
+        file_layout.addWidget(self.select_file_btn)
+        layout.addWidget(file_group)
+
+        # --- Envio em lotes (features da varredura atual) ---
+        batch_group = QGroupBox("Envio em lotes")
+        batch_layout = QVBoxLayout(batch_group)
+        options_row = QHBoxLayout()
+        self.batch_checkbox = QCheckBox("Enviar as features da varredura em lotes")
+        self.batch_checkbox.toggled.connect(lambda checked: file_group.setEnabled(not checked))
+        options_row.addWidget(self.batch_checkbox)
+        self.skip_unchanged_checkbox = QCheckBox("Pular features já importadas sem mudanças")
+        self.skip_unchanged_checkbox.setChecked(True)
+        options_row.addWidget(self.skip_unchanged_checkbox)
+        options_row.addStretch(1)
+        batch_layout.addLayout(options_row)
+        limits_row = QHBoxLayout()
+        limits_row.addStretch(1)
+        self.batch_size_spin = QSpinBox()
+        self.batch_size_spin.setRange(16, 10240)
+        self.batch_size_spin.setValue(512)
+        self.batch_size_spin.setSuffix(" KB/lote")
+        limits_row.addWidget(self.batch_size_spin)
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, MAX_UPLOAD_CONCURRENCY)
+        self.concurrency_spin.setValue(4)
+        self.concurrency_spin.setSuffix(" em paralelo")
+        limits_row.addWidget(self.concurrency_spin)
+        self.rate_spin = QSpinBox()
+        self.rate_spin.setRange(0, 600)
+        self.rate_spin.setValue(60)
+        self.rate_spin.setSpecialValueText("sem limite")
+        self.rate_spin.setSuffix(" req/min")
+        limits_row.addWidget(self.rate_spin)
+        batch_layout.addLayout(limits_row)
+        layout.addWidget(batch_group)
+
+        # --- Botão de criar teste ---
+        self.create_test_btn = QPushButton("Criar Teste no Xray")
+        self.create_test_btn.clicked.connect(self.create_xray_test)
+        layout.addWidget(self.create_test_btn)
+
+        progress_row = QHBoxLayout()
+        self.upload_progress = QProgressBar()
+        self.upload_progress.setVisible(False)
+        progress_row.addWidget(self.upload_progress, 1)
+        self.cancel_upload_btn = QPushButton("Cancelar")
+        self.cancel_upload_btn.setVisible(False)
+        self.cancel_upload_btn.clicked.connect(self.cancel_upload)
+        progress_row.addWidget(self.cancel_upload_btn)
+        layout.addLayout(progress_row)
+
+        # --- Log de saída ---
+        self.xray_log = QTextEdit()
+        self.xray_log.setReadOnly(True)
+        self.xray_log.setPlaceholderText("Saída do import aparecerá aqui...")
+        layout.addWidget(self.xray_log, 1)
+
+        self.setLayout(layout)
+
+    def select_feature_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Selecione o arquivo .feature", "", "Feature Files (*.feature)")
+        if file_path:
+            self.feature_file_path.setText(file_path)
+
+    def save_login_config(self):
+        config = {
+            "login_type": "userpass" if self.radio_userpass.isChecked() else "token",
+            "base_url": self.url_field.text().strip(),
+            "user": self.user_field.text() if self.radio_userpass.isChecked() else "",
+            "token": self.token_field.text() if self.radio_token.isChecked() else ""
+        }
+        try:
+            with open(LOGIN_CONFIG_PATH, "w", encoding="utf-8") as f:
+                json.dump(config, f)
+        except Exception as e:
+            # Opcional: logar erro
+            pass
+
+    def load_login_config(self, keep_url=False):
+        # keep_url: não troca uma URL já digitada pela salva (pode ser outro servidor)
+        try:
+            with open(LOGIN_CONFIG_PATH, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            if not (keep_url and self.url_field.text().strip()):
+                self.url_field.setText(config.get("base_url", ""))
+            if config.get("login_type") == "userpass":
+                self.radio_userpass.setChecked(True)
+                self.user_field.setText(config.get("user", ""))
+                self.token_field.setText("")
+            else:
+                self.radio_token.setChecked(True)
+                self.token_field.setText(config.get("token", ""))
+                self.user_field.setText("")
+        except Exception:
+            pass  # Se não existir, ignora
+
+    def has_saved_login(self, base_url=None):
+        """
+        Se há login/token salvo suficiente para importar sem pedir nada ao usuário.
+        O login só vale para o servidor em que foi salvo: base_url (padrão: a URL do
+        formulário) precisa ser a mesma do login_config.json.
+        """
+        try:
+            with open(LOGIN_CONFIG_PATH, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except Exception:
+            return False
+        if base_url is None:
+            base_url = self.url_field.text()
+        saved_url = config.get("base_url") or ""
+        if not saved_url or _normalize_url(saved_url) != _normalize_url(base_url):
+            return False
+        login_type = config.get("login_type")
+        if login_type == "userpass":
+            return bool(config.get("user"))
+        if login_type == "token":
+            return bool(config.get("token"))
+        return False
+
+    def create_xray_test(self):
+        # Salva o login/tipo antes de executar
+        self.save_login_config()
+
+        if self.batch_checkbox.isChecked():
+            self.create_xray_batches()
+            return
+
+        # Validação
+        if not self.feature_file_path.text():
+            QMessageBox.warning(self, "Aviso", "Selecione um arquivo .feature para criar o teste.")
+            return
+
+        feature_file = self.feature_file_path.text()
+        self._import_context = None
+        text = None
+        # Arquivo gerado pela aba de features (com o Projeto/Tags atuais): consulta o
+        # histórico e registra o que foi importado, mas continua um envio único
+        generated = self.parent.generated_features(feature_file)
+        if generated is not None and self.skip_unchanged_checkbox.isChecked():
+            target = self.url_field.text().strip().rstrip("/")
+            project_key, tags = self.parent.project_key, self.parent.tags
+            changed, unchanged = split_changed(generated, self._get_ledger(), target, project_key, tags)
+            self._log_unchanged(unchanged)
+            if not changed:
+                self.xray_log.append("[OK] Nada a enviar: todas as features já estão no Xray.")
+                return
+            if unchanged:
+                # Só parte do arquivo mudou: envia esses features, renderizados como na gravação
+                text = "\n\n".join(self.parent._render_feature(feature) for feature in changed)
+            self._import_context = (target, changed, project_key, tags)
+        elif self.skip_unchanged_checkbox.isChecked():
+            self.xray_log.append(
+                "[INFO] Arquivo não gerado nesta sessão (ou alterado depois, ou com outro Projeto/Tags): "
+                "enviado inteiro, sem consultar o histórico."
+            )
+
+        client = self._client_from_form()
+        if client is None:
+            self._import_context = None
+            return
+
+        sending = feature_file if text is None else f"{len(self._import_context[1])} feature(s) alterados de {feature_file}"
+        self.xray_log.append(f"[INFO] Enviando {sending} para {self.url_field.text().strip()}...")
+
+        worker = XrayImportWorker(client, feature_file, text=text)
+        worker.signals.progress.connect(self._on_upload_progress)
+        worker.signals.log.connect(self.xray_log.append)
+        worker.signals.finished.connect(self._on_import_finished)
+        self.create_test_btn.setEnabled(False)
+        self.upload_progress.setValue(0)
+        self.upload_progress.setVisible(True)
+        QThreadPool.globalInstance().start(worker)
+
+    def create_xray_batches(self, features=None):
+        # Envia as features da varredura atual (sem as cópias, se o colapso estiver ligado), em lotes
+        if features is None:
+            features = self.parent.output_features()
+        if not features:
+            QMessageBox.warning(self, "Aviso", "Nenhuma feature carregada. Selecione uma pasta na aba de features.")
+            return
+
+        client = self._client_from_form()
+        if client is None:
+            return
+
+        # Histórico de imports: features idênticos ao último envio para esta URL não são reenviados
+        target = self.url_field.text().strip().rstrip("/")
+        project_key, tags = self.parent.project_key, self.parent.tags
+        self._batch_context = (target, project_key, tags)
+        if self.skip_unchanged_checkbox.isChecked():
+            features, unchanged = split_changed(features, self._get_ledger(), target, project_key, tags)
+            self._log_unchanged(unchanged)
+            if not features:
+                self.xray_log.append("[OK] Nada a enviar: todas as features já estão no Xray.")
+                return
+
+        batches = split_batches(
+            features, self.parent._render_feature,
+            max_bytes=self.batch_size_spin.value() * 1024,
+        )
+        rate = f"até {self.rate_spin.value()} req/min" if self.rate_spin.value() else "sem limite de req/min"
+        self.xray_log.append(
+            f"[INFO] {len(features)} features em {len(batches)} lote(s); "
+            f"{self.concurrency_spin.value()} em paralelo, {rate}"
+        )
+
+        worker = XrayBatchWorker(
+            client, batches,
+            concurrency=self.concurrency_spin.value(), per_minute=self.rate_spin.value(),
+        )
+        worker.signals.batch_done.connect(self._on_batch_done)
+        worker.signals.log.connect(self.xray_log.append)
+        worker.signals.finished.connect(self._on_batches_finished)
+        self._batch_total = len(batches)
+        self._batch_worker = worker
+        self.create_test_btn.setEnabled(False)
+        self.cancel_upload_btn.setVisible(True)
+        self.upload_progress.setMaximum(len(batches))
+        self.upload_progress.setValue(0)
+        self.upload_progress.setVisible(True)
+        QThreadPool.globalInstance().start(worker)
+
+    def _log_unchanged(self, unchanged):
+        if unchanged:
+            self.xray_log.append(f"[INFO] {len(unchanged)} feature(s) sem mudança desde o último import (pulados):")
+            for feature, keys in unchanged[:20]:
+                self.xray_log.append(f"    {feature.name} → {', '.join(keys) or '-'}")
+            if len(unchanged) > 20:
+                self.xray_log.append(f"    ... e mais {len(unchanged) - 20}")
+
+    def _get_ledger(self):
+        if self._ledger is None:
+            try:
+                self._ledger = ImportLedger(IMPORT_LEDGER_PATH)
+            except Exception:
+                self._ledger = ImportLedger()
+        return self._ledger
+
+    def cancel_upload(self):
+        if self._batch_worker is not None:
+            self._batch_worker.cancel()
+            self.xray_log.append("[WARN] Cancelando: lotes ainda não enviados serão abandonados.")
+
+    def _client_from_form(self):
+        """Valida URL/login e devolve o XrayClient (ou None, após avisar o usuário)."""
+        base_url = self.url_field.text().strip()
+        if not base_url:
+            QMessageBox.warning(self, "Aviso", "Preencha a URL do Jira.")
+            return None
+
+        if self.radio_userpass.isChecked():
+            user = self.user_field.text().strip()
+            passwd = self.pass_field.text().strip()
+            if not user or not passwd:
+                QMessageBox.warning(self, "Aviso", "Preencha usuário e senha do Jira.")
+                return None
+            authorization = basic_auth(user, passwd)
+        else:
+            token = self.token_field.text().strip()
+            if not token:
+                QMessageBox.warning(self, "Aviso", "Preencha o token do Jira.")
+                return None
+            authorization = bearer_auth(token)
+
+        try:
+            return self._get_client(base_url, authorization)
+        except XrayError as e:
+            QMessageBox.warning(self, "Aviso", str(e))
+            return None
+
+    def _get_client(self, base_url, authorization):
+        # Reaproveita o cliente (e as conexões abertas) enquanto URL e login não mudarem
+        key = (base_url, authorization)
+        if self._client is None or self._client_key != key:
+            if self._client is not None:
+                self._client.close()
+            self._client = XrayClient(base_url, authorization, max_connections=MAX_UPLOAD_CONCURRENCY)
+            self._client_key = key
+        return self._client
+
+    def _on_upload_progress(self, sent, total):
+        self.upload_progress.setMaximum(max(total, 1))
+        self.upload_progress.setValue(sent)
+        if sent == total:
+            self.xray_log.append(f"[INFO] {total / 1024:.1f} KB enviados, aguardando resposta do Xray...")
+
+    def _on_import_finished(self, result):
+        self.create_test_btn.setEnabled(True)
+        self.upload_progress.setVisible(False)
+        context, self._import_context = self._import_context, None
+        if result is None:
+            return
+        retries = f" após {result.attempts} tentativas" if result.attempts > 1 else ""
+        if result.ok:
+            keys = ", ".join(result.keys) if result.keys else "nenhuma"
+            self.xray_log.append(f"[OK] Import concluído (HTTP {result.status}){retries}. Issues: {keys}")
+            if context is not None:
+                target, features, project_key, tags = context
+                try:
+                    self._get_ledger().record(target, features, result.keys, project_key, tags)
+                except Exception as e:
+                    self.xray_log.append(f"[WARN] Não foi possível registrar o import no histórico: {e}")
+        else:
+            for error in result.errors:
+                self.xray_log.append(f"[ERRO] {error}")
+            if result.body:
+                self.xray_log.append(result.body[:2000])
+
+    def _on_batch_done(self, item):
+        batch = item.batch
+        label = f"Lote {batch.index + 1}/{self._batch_total} ({len(batch.features)} features)"
+        if item.ok:
+            self.upload_progress.setValue(self.upload_progress.value() + 1)
+            target, project_key, tags = self._batch_context
+            try:
+                self._get_ledger().record(target, batch.features, item.keys, project_key, tags)
+            except Exception as e:
+                self.xray_log.append(f"[WARN] Não foi possível registrar o lote no histórico: {e}")
+            keys = ", ".join(item.keys) if item.keys else "nenhuma issue"
+            self.xray_log.append(f"[OK] {label}: {keys}")
+        else:
+            self.xray_log.append(f"[ERRO] {label}, tentativa {item.attempts}: {item.error}")
+
+    def _on_batches_finished(self, results):
+        self._batch_worker = None
+        self.create_test_btn.setEnabled(True)
+        self.cancel_upload_btn.setVisible(False)
+        self.upload_progress.setVisible(False)
+
+        ok = [r for r in results.values() if r.ok]
+        failed = sorted((r for r in results.values() if not r.ok), key=lambda r: r.batch.index)
+        not_sent = self._batch_total - len(results)
+        keys = sum(len(r.keys) for r in ok)
+        self.xray_log.append(
+            f"[INFO] Lotes: {len(ok)} ok, {len(failed)} com falha, {not_sent} não enviados; {keys} issues criadas/atualizadas"
+        )
+        for r in failed:
+            titles = ", ".join(f.name for f in r.batch.features[:5])
+            more = f" (+{len(r.batch.features) - 5})" if len(r.batch.features) > 5 else ""
+            self.xray_log.append(f"[ERRO] Lote {r.batch.index + 1}: {r.error} — {titles}{more}")
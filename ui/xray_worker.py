@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.xray_batches import upload_batches
+from core.xray_client import XrayError
+
+
+class XraySignals(QObject):
+    """Sinais do XrayImportWorker (criado na thread da GUI; entregas enfileiradas)."""
+    progress = Signal(int, int)  # bytes enviados, total
+    log = Signal(str)
+    finished = Signal(object)    # ImportResult, ou None em caso de falha
+
+
+class XrayImportWorker(QRunnable):
+    """
+    Envia um .feature ao Xray fora da thread da GUI usando o XrayClient.
+    Com `text`, envia esse conteúdo no lugar do arquivo (com o nome dele).
+    O progresso é repassado no máximo a cada PROGRESS_INTERVAL segundos.
+    """
+
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, client, feature_path, project_key=None, text=None):
+        super().__init__()
+        self.client = client
+        self.feature_path = feature_path
+        self.project_key = project_key
+        self.text = text
+        self.signals = XraySignals()
+        self._last_progress = 0.0
+
+    def _on_progress(self, sent, total):
+        now = time.monotonic()
+        if sent == total or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.signals.progress.emit(sent, total)
+
+    def run(self):
+        result = None
+        try:
+            if self.text is None:
+                result = self.client.import_feature_file(
+                    self.feature_path, self.project_key,
+                    progress=self._on_progress, log=self.signals.log.emit,
+                )
+            else:
+                result = self.client.import_feature_text(
+                    self.text, os.path.basename(self.feature_path), self.project_key,
+                    progress=self._on_progress, log=self.signals.log.emit,
+                )
+        except XrayError as e:
+            self.signals.log.emit(f"[ERRO] {e}")
+        except Exception as e:
+            self.signals.log.emit(f"[EXCEPTION] {e}")
+        self.signals.finished.emit(result)
+
+
+class XrayBatchSignals(QObject):
+    batch_done = Signal(object)  # BatchResult de cada lote (inclusive reenvios)
+    log = Signal(str)
+    finished = Signal(object)    # {índice do lote: BatchResult}
+
+
+class XrayBatchWorker(QRunnable):
+    """Envia os lotes de core.xray_batches em paralelo, fora da thread da GUI."""
+
+    def __init__(self, client, batches, project_key=None, concurrency=4, per_minute=60, rounds=3):
+        super().__init__()
+        self.client = client
+        self.batches = batches
+        self.project_key = project_key
+        self.concurrency = concurrency
+        self.per_minute = per_minute
+        self.rounds = rounds
+        self.signals = XrayBatchSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        results = {}
+        try:
+            results = upload_batches(
+                self.client, self.batches, self.project_key,
+                concurrency=self.concurrency, per_minute=self.per_minute, rounds=self.rounds,
+                on_result=self.signals.batch_done.emit, log=self.signals.log.emit,
+                cancelled=self._cancel_event.is_set,
+            )
+        except Exception as e:
+            self.signals.log.emit(f"[EXCEPTION] {e}")
+        self.signals.finished.emit(results)